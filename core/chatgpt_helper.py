@@ -18,37 +18,188 @@
 #         return f"Error: {str(e)}"
 
 
-import os
-import requests
+import time
+
+from asgiref.sync import sync_to_async
 from dotenv import load_dotenv
 
+from llm.analytics import from_completion, from_shared, from_store
+from llm.cache import get_cached_answer, make_key, store_answer
+from llm.client import LLMError, LLMStatusError, LLMUnavailable, get_client
+from llm.hedging import ahedged_chat, hedged_chat
+from llm.models import AnswerUsage
+from llm.routing import plan, route
+from llm.similarity import find_best_answer, find_similar_answer
+from llm.singleflight import acoalesce, coalesce
+
 load_dotenv()  # Make sure environment variables are loaded
 
-def get_answer_from_chatgpt(question):
-    api_key = os.getenv("GROQ_API_KEY")
+# The model and max_tokens come from settings.LLM_ROUTING (llm.routing)
+SYSTEM_PROMPT = "You are an assistant that answers questions about electrical machines."
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+def _stored_answer(question, planned):
+    """``(answer, usage)`` from the cache or a similar question, or ``None``."""
+    cached = get_cached_answer(question, planned.model, planned.max_tokens, SYSTEM_PROMPT)
+    if cached is not None:
+        return cached.answer_text, from_store(cached.model, AnswerUsage.CACHED)
+    similar = find_similar_answer("qa_entries", question)
+    if similar is not None:
+        return similar, from_store("", AnswerUsage.SIMILAR)
+    return None
+
+def _degraded_answer(question, routed):
+    """``(answer, usage)`` to serve while the LLM is unavailable, or ``None``."""
+    cached = get_cached_answer(question, routed.model, routed.max_tokens, SYSTEM_PROMPT)
+    answer = cached.answer_text if cached is not None else find_best_answer("qa_entries", question)
+    if answer is None:
+        return None
+    return answer, from_store(routed.model, AnswerUsage.DEGRADED)
+
+def _shared_answer(result):
+    """An answer coalesced with an identical question's call."""
+    answer, usage = result
+    return answer, from_shared(usage)
 
-    data = {
-        "model": "llama3-8b-8192",  # Groq's LLaMA 3 model
+def _payload(question, routed):
+    return {
+        "model": routed.model,
         "messages": [
-            {"role": "system", "content": "You are an assistant that answers questions about electrical machines."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": question}
-        ]
+        ],
+        "max_tokens": routed.max_tokens,
     }
 
+def _answer(response, model, seconds):
+    """``(answer, usage)`` of a chat completion response."""
+    if response.status_code != 200:
+        raise LLMStatusError(response.status_code, response.text)
     try:
-        response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers=headers,
-            json=data
+        body = response.json()
+        answer = body["choices"][0]["message"]["content"].strip()
+    except (ValueError, KeyError, IndexError) as e:
+        raise LLMError(f"Unexpected response from the LLM API: {e}") from e
+    return answer, from_completion(body, model, seconds)
+
+def get_answer_from_chatgpt(question, use_cache=True):
+    """Return ``(answer, usage)`` for ``question``.
+
+    ``usage`` holds the ``AnswerUsage`` fields to save with the answer.
+
+    Raises ``LLMError`` (``LLMThrottled`` when rate limited past the queue
+    deadline) instead of returning an error message, so failures never end
+    up saved as answers. While the model's circuit breaker is open, the
+    closest stored answer is returned instead, or ``LLMUnavailable`` raised
+    if there is none (see ``core.jobs.queue_entry``).
+    """
+    planned = plan(question)
+    if use_cache:
+        stored = _stored_answer(question, planned)
+        if stored is not None:
+            return stored
+    routed = route(question, planned=planned)
+    # Identical questions already in flight share one upstream call
+    try:
+        return coalesce(
+            make_key(question, routed.model, routed.max_tokens, SYSTEM_PROMPT),
+            lambda: _fetch_answer(question, routed),
+            shared=_shared_answer,
         )
-        if response.status_code == 200:
-            return response.json()["choices"][0]["message"]["content"].strip()
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-    except Exception as e:
-        return f"Error: {str(e)}"
+    except LLMUnavailable:
+        degraded = _degraded_answer(question, routed)
+        if degraded is None:
+            raise
+        return degraded
+
+def _fetch_answer(question, routed):
+    started = time.perf_counter()
+    response = hedged_chat(get_client(), _payload(question, routed))
+    answer, usage = _answer(response, routed.model, time.perf_counter() - started)
+    # Under the model that answered, which a hedge may have changed
+    store_answer(question, usage["model"], routed.max_tokens, SYSTEM_PROMPT, answer,
+                 source="chatgpt")
+    return answer, usage
+
+async def aget_answer_from_chatgpt(question, use_cache=True):
+    """Async variant of ``get_answer_from_chatgpt`` for the ASGI views."""
+    planned = plan(question)
+    if use_cache:
+        stored = await sync_to_async(_stored_answer)(question, planned)
+        if stored is not None:
+            return stored
+    routed = route(question, planned=planned)
+    try:
+        return await acoalesce(
+            make_key(question, routed.model, routed.max_tokens, SYSTEM_PROMPT),
+            lambda: _afetch_answer(question, routed),
+            shared=_shared_answer,
+        )
+    except LLMUnavailable:
+        degraded = await sync_to_async(_degraded_answer)(question, routed)
+        if degraded is None:
+            raise
+        return degraded
+
+async def _afetch_answer(question, routed):
+    started = time.perf_counter()
+    response = await ahedged_chat(get_client(), _payload(question, routed))
+    answer, usage = _answer(response, routed.model, time.perf_counter() - started)
+    await sync_to_async(store_answer)(
+        question, usage["model"], routed.max_tokens, SYSTEM_PROMPT, answer,
+        source="chatgpt",
+    )
+    return answer, usage
+
+def stream_answer_from_chatgpt(question, use_cache=True, usage=None):
+    """Yield the answer in chunks as Groq generates it.
+
+    Once the generator is exhausted, the ``usage`` dict (if given) holds
+    the ``AnswerUsage`` fields to save with the answer. Raises
+    ``LLMError`` when Groq cannot be reached or rejects the request.
+    Closing the generator early (e.g. the browser went away) closes the
+    upstream connection. Streams are not hedged; while the circuit
+    breaker is open they fall back like ``get_answer_from_chatgpt``.
+    """
+    planned = plan(question)
+    if use_cache:
+        stored = _stored_answer(question, planned)
+        if stored is not None:
+            if usage is not None:
+                usage.update(stored[1])
+            yield stored[0]
+            return
+    routed = route(question, planned=planned)
+
+    parts = []
+    last = {}
+    stats = {}
+    chunks = get_client().stream_chat(_payload(question, routed), stats)
+    try:
+        for chunk in chunks:
+            last = chunk
+            if not chunk.get("choices"):
+                continue
+            delta = chunk["choices"][0]["delta"].get("content")
+            if delta:
+                parts.append(delta)
+                yield delta
+    except LLMUnavailable:
+        # Raised before the first chunk, so nothing was yielded yet
+        degraded = _degraded_answer(question, routed)
+        if degraded is None:
+            raise
+        if usage is not None:
+            usage.update(degraded[1])
+        yield degraded[0]
+        return
+    finally:
+        chunks.close()
+
+    if usage is not None:
+        usage.update(from_completion(
+            last, routed.model, stats.get("seconds"), stats.get("ttft_seconds")
+        ))
+    answer = "".join(parts).strip()
+    if answer:
+        store_answer(question, last.get("model") or routed.model, routed.max_tokens,
+                     SYSTEM_PROMPT, answer, source="chatgpt")
@@ -0,0 +1,55 @@
+from llm.client import LLMUnavailable
+from llm.jobs import RetryLater, aenqueue, enqueue
+from llm.models import AnswerUsage
+
+from .chatgpt_helper import get_answer_from_chatgpt
+from .models import QAEntry
+
+# Saved as the answer until the LLM is back and ``manage.py run_worker``
+# replaces it
+QUEUED_ANSWER = (
+    "VoltieAI is unavailable right now, so your question has been queued. "
+    "Its answer will appear in your history shortly."
+)
+
+
+def _queued_entry(user, question_text):
+    return QAEntry(
+        user=user,
+        question_text=question_text,
+        answer_text=QUEUED_ANSWER,
+        plugin_source="chatgpt",
+        outcome=AnswerUsage.QUEUED,
+    )
+
+
+def queue_entry(user, question_text):
+    """Save ``question_text`` with a placeholder answer and queue the real one."""
+    entry = _queued_entry(user, question_text)
+    entry.save()
+    enqueue("answer_entry", {"entry_id": entry.pk}, key=f"qa_entry:{entry.pk}")
+    return entry
+
+
+async def aqueue_entry(user, question_text):
+    entry = _queued_entry(user, question_text)
+    await entry.asave()
+    await aenqueue("answer_entry", {"entry_id": entry.pk}, key=f"qa_entry:{entry.pk}")
+    return entry
+
+
+def answer_entry_job(job):
+    """Replace a queued entry's placeholder with the LLM's answer."""
+    entry = QAEntry.objects.filter(
+        pk=job.payload["entry_id"], outcome=AnswerUsage.QUEUED
+    ).first()
+    if entry is None:
+        return  # deleted, or answered by an earlier attempt
+    try:
+        answer, usage = get_answer_from_chatgpt(entry.question_text)
+    except LLMUnavailable as e:
+        raise RetryLater(e.retry_after or 30, str(e))
+    entry.answer_text = answer
+    for field, value in usage.items():
+        setattr(entry, field, value)
+    entry.save(update_fields=["answer_text", *usage])
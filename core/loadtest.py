@@ -0,0 +1,13 @@
+"""The ``manage.py load_test`` scenario (``LOAD_TEST_SCENARIO``)."""
+
+
+def scenario(vu):
+    """Log in once, then check the dashboard, ask now and then, and search."""
+    if not vu.logged_in and not vu.login():
+        return False
+    vu.get("dashboard", "/")
+    if vu.iteration % 3 == 0:
+        _, question = vu.question()
+        vu.post("ask", "/ask/", {"question_text": question},
+                headers={"X-Requested-With": "XMLHttpRequest"})
+    vu.get("search", "/search/?q=induction+motor")
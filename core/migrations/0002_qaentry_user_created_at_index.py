@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='qaentry',
+            index=models.Index(fields=['user', '-created_at'], name='core_qaentr_user_id_c0e5f4_idx'),
+        ),
+    ]
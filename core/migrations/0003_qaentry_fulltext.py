@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# (index name, column); MySQL only: other databases use the llm inverted index
+FULLTEXT_INDEXES = [
+    ("core_qaentry_question_ft", "question_text"),
+    ("core_qaentry_answer_ft", "answer_text"),
+]
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for name, column in FULLTEXT_INDEXES:
+        # InnoDB builds one FULLTEXT index per ALTER
+        schema_editor.execute(f"ALTER TABLE core_qaentry ADD FULLTEXT INDEX {name} ({column})")
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for name, column in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE core_qaentry DROP INDEX {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_qaentry_user_created_at_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
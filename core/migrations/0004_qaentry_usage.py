@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_qaentry_fulltext'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qaentry',
+            name='completion_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qaentry',
+            name='latency_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qaentry',
+            name='model',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='qaentry',
+            name='outcome',
+            field=models.CharField(blank=True, choices=[('generated', 'Generated'), ('truncated', 'Generated, cut off at max_tokens'), ('cached', 'Answer cache'), ('similar', 'Similar question')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='qaentry',
+            name='prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='qaentry',
+            name='ttft_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='qaentry',
+            index=models.Index(fields=['created_at'], name='core_qaentr_created_626efc_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_qaentry_outcome_degraded_queued'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='qaentry',
+            name='outcome',
+            field=models.CharField(blank=True, choices=[('generated', 'Generated'), ('truncated', 'Generated, cut off at max_tokens'), ('cached', 'Answer cache'), ('similar', 'Similar question'), ('degraded', 'Closest stored answer, LLM unavailable'), ('queued', 'Queued until the LLM is available'), ('coalesced', "Shared an identical question's LLM call")], max_length=20),
+        ),
+    ]
@@ -1,12 +1,22 @@
 from django.db import models
 from django.contrib.auth.models import User
+from llm.models import AnswerUsage
 
-class QAEntry(models.Model):
+class QAEntry(AnswerUsage, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     question_text = models.TextField()
     answer_text = models.TextField()
     plugin_source = models.CharField(max_length=100, default="chatgpt")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Dashboard history: keyset pages of a user's newest entries,
+            # in (created_at, id) order, without a filesort
+            models.Index(fields=["user", "-created_at", "-id"]),
+            # Analytics: entries of the last N days
+            models.Index(fields=["created_at"]),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.question_text[:50]}"
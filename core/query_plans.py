@@ -0,0 +1,8 @@
+"""Hot queries verified by ``manage.py check_query_plans``."""
+
+from .views import HISTORY_PER_PAGE, history_entries
+
+
+def dashboard_history():
+    # Same shape as dashboard_view; the plan doesn't depend on the user id
+    return history_entries(1).order_by("-created_at", "-pk")[:HISTORY_PER_PAGE + 1]
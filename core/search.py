@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from llm.search import SearchField, SearchSource, index_documents, reindex
+
+from .models import QAEntry
+
+
+class QAEntrySearch(SearchSource):
+    """A user's own dashboard questions and answers."""
+
+    fields = [
+        SearchField(QAEntry, "question_text", weight=2.0, partition="user_id"),
+        SearchField(QAEntry, "answer_text", partition="user_id"),
+    ]
+
+
+@receiver(post_save, sender=QAEntry)
+@receiver(post_delete, sender=QAEntry)
+def reindex_entry(sender, instance, **kwargs):
+    reindex("qa_entries", instance.pk)
+
+
+def index_created(entries):
+    """Index entries saved with ``bulk_create``, which sends no signals.
+
+    On MySQL, where ``bulk_create`` returns no ids, the FULLTEXT indexes
+    need no postings anyway.
+    """
+    doc_ids = [entry.pk for entry in entries if entry.pk is not None]
+    if doc_ids:
+        index_documents("qa_entries", doc_ids)
@@ -0,0 +1,20 @@
+"""Writes ``manage.py seed_data`` rows (``SEED_DATA_WRITER``)."""
+
+from llm.seeding import preserve_timestamps
+
+from .models import QAEntry
+
+
+def write_entries(entries):
+    with preserve_timestamps(QAEntry):
+        QAEntry.objects.bulk_create([
+            QAEntry(
+                user_id=entry.user_id,
+                question_text=entry.question,
+                answer_text=entry.answer,
+                plugin_source="seed",
+                created_at=entry.created_at,
+            )
+            for entry in entries
+        ])
+    return {"qa entries": len(entries)}
@@ -0,0 +1,27 @@
+from llm.models import AnswerUsage
+
+from .models import QAEntry
+
+
+class QAEntrySource:
+    """Answered dashboard questions for the near-duplicate index.
+
+    Entries still waiting for the worker are indexed too, but only matched
+    once their placeholder has been replaced by the real answer.
+    """
+
+    def rows_after(self, last_id, limit):
+        return (
+            QAEntry.objects.filter(pk__gt=last_id)
+            .exclude(answer_text__startswith="Error:")
+            .order_by("pk")
+            .values_list("pk", "question_text")[:limit]
+        )
+
+    def answer_for(self, pk):
+        return (
+            QAEntry.objects.filter(pk=pk)
+            .exclude(outcome=AnswerUsage.QUEUED)
+            .values_list("answer_text", flat=True)
+            .first()
+        )
@@ -1,23 +1,136 @@
+// Dashboard history: answer previews expand on demand, and older entries
+// load as the user scrolls up
+const setUpHistory = (historyDiv) => {
+  const sentinel = document.getElementById("history-more");
+  let loading = false;
+
+  const bubble = (role, label, text) => {
+    const div = document.createElement("div");
+    div.className = `chat-bubble ${role}`;
+    const strong = document.createElement("strong");
+    strong.textContent = `${label}: `;
+    const body = document.createElement("span");
+    body.className = "answer";
+    body.textContent = text;
+    div.append(strong, body);
+    return div;
+  };
+
+  // Older entries go before the sentinel, i.e. above the loaded ones
+  const appendEntry = (entry) => {
+    const answer = bubble("bot", "VoltieAI", entry.answer_preview);
+    if (entry.answer_truncated) {
+      const more = document.createElement("a");
+      more.href = "#";
+      more.className = "show-answer";
+      more.dataset.url = `${historyDiv.dataset.url}${entry.id}/answer/`;
+      more.textContent = "Show full answer";
+      answer.append(more);
+    }
+    sentinel.before(answer, bubble("user", "You", entry.question));
+  };
+
+  const loadMore = async () => {
+    const cursor = historyDiv.dataset.next;
+    if (loading || !cursor) return;
+    loading = true;
+    try {
+      const resp = await fetch(`${historyDiv.dataset.url}?cursor=${encodeURIComponent(cursor)}`);
+      if (!resp.ok) return;
+      const data = await resp.json();
+      data.entries.forEach(appendEntry);
+      historyDiv.dataset.next = data.next || "";
+    } finally {
+      loading = false;
+    }
+  };
+
+  if (sentinel) {
+    new IntersectionObserver((seen) => {
+      if (seen.some((entry) => entry.isIntersecting)) loadMore();
+    }, { root: historyDiv }).observe(sentinel);
+  }
+
+  historyDiv.addEventListener("click", async (e) => {
+    const link = e.target.closest(".show-answer");
+    if (!link) return;
+    e.preventDefault();
+    link.textContent = "Loading...";
+    try {
+      const resp = await fetch(link.dataset.url);
+      if (!resp.ok) throw new Error(resp.status);
+      const data = await resp.json();
+      link.parentElement.querySelector(".answer").textContent = data.answer;
+      link.remove();
+    } catch (err) {
+      link.textContent = "Show full answer";
+    }
+  });
+};
+
 document.addEventListener("DOMContentLoaded", () => {
+  const historyElement = document.getElementById("history");
+  if (historyElement && historyElement.dataset.url) setUpHistory(historyElement);
+
   const form = document.getElementById("question-form");
+  if (!form) return;
   const historyDiv = document.getElementById("history");
   const askBtn = document.getElementById("ask-btn");
   const spinner = document.getElementById("spinner");
   const btnText = document.getElementById("btn-text");
 
+  // history is a column-reverse flexbox: the first child is shown at the bottom
+  const addBubble = (role, label, text) => {
+    const bubble = document.createElement("div");
+    bubble.className = `chat-bubble ${role}`;
+    bubble.style.whiteSpace = "pre-wrap";
+    const strong = document.createElement("strong");
+    strong.textContent = `${label}: `;
+    const body = document.createElement("span");
+    body.textContent = text;
+    bubble.append(strong, body);
+    historyDiv.prepend(bubble);
+    return body;
+  };
+
+  // Parse "event: x\ndata: {...}\n\n" blocks out of the streamed body
+  const readEvents = async function* (resp) {
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = "message";
+        let data = "";
+        for (const line of block.split("\n")) {
+          if (line.startsWith("event:")) event = line.slice(6).trim();
+          else if (line.startsWith("data:")) data += line.slice(5).trim();
+        }
+        yield { event, data: data ? JSON.parse(data) : {} };
+      }
+    }
+  };
+
   form.addEventListener("submit", async (e) => {
     e.preventDefault();
     const textarea = form.querySelector("textarea");
     const question = textarea.value.trim();
     if (!question) return;
 
-    // show spinner
+    // show spinner until the first token arrives
     spinner.classList.remove("d-none");
     btnText.textContent = "Thinking...";
+    askBtn.disabled = true;
 
     const csrfToken = form.querySelector('input[name="csrfmiddlewaretoken"]').value;
     try {
-      const resp = await fetch("/ask/", {
+      const resp = await fetch("/ask/stream/", {
         method: "POST",
         headers: {
           "X-CSRFToken": csrfToken,
@@ -25,28 +138,34 @@ document.addEventListener("DOMContentLoaded", () => {
         },
         body: new URLSearchParams({ question_text: question }),
       });
-      const data = await resp.json();
-      if (resp.ok) {
-        // prepend new entry
-        const card = document.createElement("div");
-        card.className = "card mb-2";
-        card.innerHTML = `
-          <div class="card-body">
-            <strong>Q:</strong> ${data.question}<br/>
-            <strong>A:</strong> ${data.answer.replace(/\n/g, "<br/>")}<br/>
-            <small class="text-muted">Asked: ${data.created_at} via ${data.plugin}</small>
-          </div>
-        `;
-        historyDiv.prepend(card);
-        textarea.value = "";
-      } else {
+      if (!resp.ok) {
+        const data = await resp.json();
         alert(data.error || "Failed to get answer");
+        return;
+      }
+
+      const placeholder = historyDiv.querySelector("p.text-muted");
+      if (placeholder) placeholder.remove();
+      addBubble("user", "You", question);
+      const answer = addBubble("bot", "VoltieAI", "");
+      textarea.value = "";
+
+      for await (const { event, data } of readEvents(resp)) {
+        if (event === "token") {
+          spinner.classList.add("d-none");
+          answer.textContent += data.text;
+        } else if (event === "done") {
+          answer.textContent = data.answer;
+        } else if (event === "error") {
+          answer.textContent = data.error || "Failed to get answer";
+        }
       }
     } catch (err) {
       alert("Network error");
     } finally {
       spinner.classList.add("d-none");
       btnText.textContent = "Ask";
+      askBtn.disabled = false;
     }
   });
 });
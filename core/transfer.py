@@ -0,0 +1,49 @@
+"""Dashboard history for ``manage.py export_data`` / ``import_data`` (``EXPORT_SOURCES``)."""
+
+from datetime import datetime
+
+from llm.seeding import preserve_timestamps
+from llm.transfer import ExportSource, filter_rows, in_pk_order, user_ids
+
+from .models import QAEntry
+
+USAGE_FIELDS = ["model", "outcome", "latency_ms", "ttft_ms", "prompt_tokens", "completion_tokens"]
+
+
+class QAEntryExport(ExportSource):
+    fields = {
+        "username": str,
+        "question_text": str,
+        "answer_text": str,
+        "plugin_source": str,
+        "model": str,
+        "outcome": str,
+        "latency_ms": int,
+        "ttft_ms": int,
+        "prompt_tokens": int,
+        "completion_tokens": int,
+        "created_at": datetime,
+    }
+
+    def rows(self, since=None, until=None, username=None, chunk_size=2000):
+        entries = filter_rows(QAEntry.objects.all(), since, until, "user", username)
+        columns = [name for name in self.fields if name != "username"]
+        for row in in_pk_order(entries, "user__username", *columns, chunk_size=chunk_size):
+            row["username"] = row.pop("user__username")
+            yield row
+
+    def write(self, rows):
+        users = user_ids(row["username"] for row in rows)
+        with preserve_timestamps(QAEntry):
+            QAEntry.objects.bulk_create([
+                QAEntry(
+                    user_id=users[row["username"]],
+                    question_text=row["question_text"],
+                    answer_text=row["answer_text"],
+                    plugin_source=row["plugin_source"] or "chatgpt",
+                    created_at=row["created_at"],
+                    **{name: row[name] for name in USAGE_FIELDS},
+                )
+                for row in rows
+            ])
+        return {"qa entries": len(rows)}
@@ -3,8 +3,14 @@ from . import views
 
 urlpatterns = [
     path("", views.dashboard_view, name="dashboard"),
+    path("history/", views.history_view, name="history"),
+    path("history/<int:pk>/answer/", views.history_answer_view, name="history_answer"),
     path("register/", views.register_view, name="register"),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
     path("ask/", views.ask_question_ajax, name="ask_question_ajax"),
+    path("ask/stream/", views.ask_question_stream, name="ask_question_stream"),
+    path("ask/batch/", views.ask_batch, name="ask_batch"),
+    path("search/", views.search_view, name="search"),
+    path("analytics/", views.analytics_view, name="analytics"),
 ]
@@ -1,11 +1,29 @@
-from django.shortcuts import render, redirect
+import asyncio
+import json
+import math
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models.functions import Substr
+from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from .forms import RegisterForm, QuestionForm
 from .models import QAEntry
-from .chatgpt_helper import get_answer_from_chatgpt
+from .search import index_created
+from .chatgpt_helper import aget_answer_from_chatgpt, stream_answer_from_chatgpt
+from .jobs import QUEUED_ANSWER, aqueue_entry, queue_entry
+from llm.analytics import latency_percentiles, outcome_counts, tokens_per_day
+from llm.cache import cache_bypassed
+from llm.client import LLMError, LLMThrottled, LLMUnavailable
+from llm.pagination import InvalidCursor, keyset_page
+from llm.search import search
+from llm.streaming import content_for
 from django.contrib.auth.forms import AuthenticationForm
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 
 def register_view(request):
     if request.method == "POST":
@@ -32,27 +50,295 @@ def logout_view(request):
     logout(request)
     return redirect("login")
 
+HISTORY_PER_PAGE = 20
+ANSWER_PREVIEW_CHARS = 280
+
+def history_entries(user_id):
+    """A user's entries with an answer preview instead of the full answer.
+
+    One character more than the preview is read, to tell whether the
+    answer was cut; ``answer_text`` itself is never loaded.
+    """
+    return (
+        QAEntry.objects.filter(user_id=user_id)
+        .only("question_text", "created_at")
+        .annotate(answer_preview=Substr("answer_text", 1, ANSWER_PREVIEW_CHARS + 1))
+    )
+
+def _history_page(user, cursor=None):
+    page = keyset_page(history_entries(user.pk), cursor, HISTORY_PER_PAGE)
+    for entry in page:
+        entry.answer_truncated = len(entry.answer_preview) > ANSWER_PREVIEW_CHARS
+        if entry.answer_truncated:
+            entry.answer_preview = entry.answer_preview[:ANSWER_PREVIEW_CHARS].rstrip() + "…"
+    return page
+
 @login_required
 def dashboard_view(request):
     form = QuestionForm()
-    entries = QAEntry.objects.filter(user=request.user).order_by("-created_at")[:50]
+    entries = _history_page(request.user)
     return render(request, "dashboard.html", {"form": form, "entries": entries})
 
 @login_required
-def ask_question_ajax(request):
+def history_view(request):
+    """JSON page of the dashboard history after ``?cursor=``, newest first."""
+    try:
+        page = _history_page(request.user, request.GET.get("cursor"))
+    except InvalidCursor:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+    return JsonResponse({
+        "entries": [
+            {
+                "id": entry.pk,
+                "question": entry.question_text,
+                "answer_preview": entry.answer_preview,
+                "answer_truncated": entry.answer_truncated,
+                "created_at": entry.created_at.isoformat(),
+            }
+            for entry in page
+        ],
+        "next": page.next_cursor,
+    })
+
+@login_required
+def history_answer_view(request, pk):
+    """The full answer of one of the user's entries, for expanding a preview."""
+    entry = get_object_or_404(
+        QAEntry.objects.only("answer_text"), pk=pk, user=request.user
+    )
+    return JsonResponse({"id": entry.pk, "answer": entry.answer_text})
+
+@login_required
+def search_view(request):
+    query = request.GET.get("q", "").strip()
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 1
+    page = None
+    if query:
+        page = search("qa_entries", query, partition=request.user.pk, page=page_number)
+    return render(request, "search.html", {"query": query, "page": page})
+
+@staff_member_required
+def analytics_view(request):
+    """LLM latency per model and token usage per day, over the last ``days``."""
+    try:
+        days = max(1, int(request.GET.get("days", 30)))
+    except ValueError:
+        days = 30
+    entries = QAEntry.objects.filter(created_at__gte=timezone.now() - timedelta(days=days))
+    return render(request, "analytics.html", {
+        "days": days,
+        "latency": latency_percentiles(entries, ["model"]),
+        "ttft": latency_percentiles(entries, ["model"], field="ttft_ms"),
+        "outcomes": outcome_counts(entries),
+        "daily": tokens_per_day(entries),
+    })
+
+@login_required
+async def ask_question_ajax(request):
     if request.method == "POST":
         question_text = request.POST.get("question_text", "").strip()
         if not question_text:
             return JsonResponse({"error": "Empty question"}, status=400)
-        answer = get_answer_from_chatgpt(question_text)
-        entry = QAEntry.objects.create(
-            user=request.user,
+        try:
+            answer, usage = await aget_answer_from_chatgpt(
+                question_text, use_cache=not cache_bypassed(request)
+            )
+        except LLMUnavailable:
+            # Nothing stored to fall back on: answer it once the LLM is back
+            entry = await aqueue_entry(await request.auser(), question_text)
+            return JsonResponse({
+                "question": entry.question_text,
+                "answer": entry.answer_text,
+                "queued": True,
+            }, status=202)
+        except LLMError as e:
+            return _llm_error_response(e)
+        entry = await QAEntry.objects.acreate(
+            user=await request.auser(),
             question_text=question_text,
             answer_text=answer,
             plugin_source="chatgpt",
+            **usage,
         )
         return JsonResponse({
             "question": entry.question_text,
             "answer": entry.answer_text,
         })
     return JsonResponse({"error": "Invalid method"}, status=405)
+
+@login_required
+async def ask_batch(request):
+    """Answer a JSON list of questions, streaming one JSON line per answer.
+
+    Up to ``BATCH_CONCURRENCY`` questions are answered at once, in the order
+    they finish. A failed question gets an ``error`` line instead of failing
+    the batch; one that can't be answered while the LLM is unavailable is
+    queued for ``run_worker`` (``"queued": true``). The answers are saved
+    with one ``bulk_create`` once all are in, and a final ``done`` line
+    reports how many were saved and queued.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid method"}, status=405)
+    try:
+        questions = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Expected a JSON list of questions"}, status=400)
+    if isinstance(questions, dict):
+        questions = questions.get("questions")
+    if not isinstance(questions, list) or not all(isinstance(q, str) for q in questions):
+        return JsonResponse({"error": "Expected a JSON list of questions"}, status=400)
+    if not questions:
+        return JsonResponse({"error": "Empty batch"}, status=400)
+    if len(questions) > settings.BATCH_MAX_QUESTIONS:
+        return JsonResponse(
+            {"error": f"At most {settings.BATCH_MAX_QUESTIONS} questions per batch"},
+            status=400,
+        )
+
+    results = _batch_results(
+        await request.auser(), [q.strip() for q in questions],
+        use_cache=not cache_bypassed(request),
+    )
+    response = StreamingHttpResponse(results, content_type="application/x-ndjson")
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+async def _batch_results(user, questions, use_cache):
+    slots = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def answer(index):
+        if not questions[index]:
+            return index, None, LLMError("Empty question")
+        async with slots:
+            try:
+                return index, await aget_answer_from_chatgpt(
+                    questions[index], use_cache=use_cache
+                ), None
+            except LLMError as e:
+                return index, None, e
+
+    tasks = [asyncio.ensure_future(answer(index)) for index in range(len(questions))]
+    entries = {}
+    queued = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, result, error = await next_done
+            line = {"index": index, "question": questions[index]}
+            if error is None:
+                answer_text, usage = result
+                entries[index] = QAEntry(
+                    user=user,
+                    question_text=questions[index],
+                    answer_text=answer_text,
+                    plugin_source="chatgpt",
+                    **usage,
+                )
+                line["answer"] = answer_text
+            elif isinstance(error, LLMUnavailable):
+                queued.append(questions[index])
+                line["answer"] = QUEUED_ANSWER
+                line["queued"] = True
+            else:
+                line["error"] = str(error)
+                if isinstance(error, LLMThrottled) and error.retry_after:
+                    line["retry_after"] = error.retry_after
+            yield json.dumps(line) + "\n"
+    finally:
+        # The client went away: stop answering the rest
+        for task in tasks:
+            task.cancel()
+
+    await sync_to_async(_save_batch)([entries[index] for index in sorted(entries)], user, queued)
+    yield json.dumps({
+        "done": True, "saved": len(entries), "queued": len(queued),
+        "failed": len(questions) - len(entries) - len(queued),
+    }) + "\n"
+
+def _save_batch(entries, user, queued):
+    QAEntry.objects.bulk_create(entries)
+    index_created(entries)
+    # One by one: their jobs need the ids, which bulk_create lacks on MySQL
+    for question_text in queued:
+        queue_entry(user, question_text)
+
+def _llm_error_response(error):
+    """503 for a rate limited upstream, 502 for any other LLM failure."""
+    if isinstance(error, LLMThrottled):
+        response = JsonResponse({"error": str(error)}, status=503)
+        if error.retry_after:
+            response["Retry-After"] = str(math.ceil(error.retry_after))
+        return response
+    return JsonResponse({"error": str(error)}, status=502)
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@login_required
+def ask_question_stream(request):
+    """Stream the answer as server-sent events, saving it once complete.
+
+    The events come from the sync LLM client, so under ASGI each one is
+    pulled through ``sync_to_async`` (``content_for``) rather than the
+    whole answer being read before the first is sent.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid method"}, status=405)
+    question_text = request.POST.get("question_text", "").strip()
+    if not question_text:
+        return JsonResponse({"error": "Empty question"}, status=400)
+
+    user = request.user
+    usage = {}
+    tokens = stream_answer_from_chatgpt(
+        question_text, use_cache=not cache_bypassed(request), usage=usage
+    )
+
+    def events():
+        parts = []
+        try:
+            for token in tokens:
+                parts.append(token)
+                yield _sse("token", {"text": token})
+        except LLMUnavailable:
+            entry = queue_entry(user, question_text)
+            yield _sse("done", {
+                "question": entry.question_text,
+                "answer": entry.answer_text,
+                "queued": True,
+            })
+            return
+        except Exception as e:
+            error = {"error": str(e)}
+            if isinstance(e, LLMThrottled) and e.retry_after:
+                error["retry_after"] = e.retry_after
+            yield _sse("error", error)
+            return
+        finally:
+            # Runs on client disconnect too, releasing the upstream socket
+            tokens.close()
+
+        answer = "".join(parts).strip()
+        if not answer:
+            yield _sse("error", {"error": "The model returned an empty answer."})
+            return
+        entry = QAEntry.objects.create(
+            user=user,
+            question_text=question_text,
+            answer_text=answer,
+            plugin_source="chatgpt",
+            **usage,
+        )
+        yield _sse("done", {
+            "question": entry.question_text,
+            "answer": entry.answer_text,
+        })
+
+    response = StreamingHttpResponse(
+        content_for(request, events()), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import Answer, Question
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    """Admin interface for Question model."""
+    list_display = ['question_text', 'user', 'category', 'created_at']
+    list_filter = ['category', 'created_at']
+    search_fields = ['question_text']
+    date_hierarchy = 'created_at'
+
+
+@admin.register(Answer)
+class AnswerAdmin(admin.ModelAdmin):
+    """Admin interface for Answer model."""
+    list_display = ['question', 'source', 'model', 'outcome', 'latency_ms',
+                    'completion_tokens', 'created_at']
+    list_filter = ['source', 'outcome', 'model', 'created_at']
+    date_hierarchy = 'created_at'
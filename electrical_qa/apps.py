@@ -0,0 +1,16 @@
+import logging
+
+from django.apps import AppConfig
+
+
+class ElectricalQAConfig(AppConfig):
+    name = 'electrical_qa'
+    # The app used to be backend.py registered as ``__main__``; existing
+    # databases' migration history and content types use that label
+    label = '__main__'
+    verbose_name = 'Electrical Q&A'
+
+    def ready(self):
+        logging.basicConfig(level=logging.INFO)
+        # Connect the statistics counter and search index signals
+        from . import search, stats  # noqa: F401
@@ -0,0 +1,15 @@
+"""
+ASGI entry point, e.g. ``uvicorn electrical_qa.asgi:application``.
+
+Like ``electrical_qa.wsgi``, it imports the URLconf up front.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'electrical_qa.settings')
+
+application = get_asgi_application()
+get_resolver().url_patterns  # noqa: B018 (imports the URLconf)
@@ -0,0 +1,66 @@
+from django import forms
+from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.models import User
+
+from .models import Question
+
+
+class RegisterForm(UserCreationForm):
+    """User registration form with email and name fields."""
+    email = forms.EmailField(
+        required=True,
+        widget=forms.EmailInput(attrs={'class': 'form-control'})
+    )
+    first_name = forms.CharField(
+        required=True,
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+    last_name = forms.CharField(
+        required=True,
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+
+    class Meta:
+        model = User
+        fields = ['username', 'email', 'first_name', 'last_name',
+                  'password1', 'password2']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['username'].widget.attrs.update(
+            {'class': 'form-control'}
+        )
+        self.fields['password1'].widget.attrs.update(
+            {'class': 'form-control'}
+        )
+        self.fields['password2'].widget.attrs.update(
+            {'class': 'form-control'}
+        )
+
+
+class QuestionForm(forms.ModelForm):
+    """Form for asking questions about electrical machines."""
+    CATEGORIES = [
+        ('General', 'General'),
+        ('DC Machines', 'DC Machines'),
+        ('AC Machines', 'AC Machines'),
+        ('Transformers', 'Transformers'),
+        ('Induction Motors', 'Induction Motors'),
+        ('Synchronous Machines', 'Synchronous Machines'),
+    ]
+
+    category = forms.ChoiceField(
+        choices=CATEGORIES,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+
+    class Meta:
+        model = Question
+        fields = ['question_text', 'category']
+        widgets = {
+            'question_text': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 4,
+                'placeholder': 'Ask your question about electrical machines here...'
+            }),
+        }
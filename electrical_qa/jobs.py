@@ -0,0 +1,34 @@
+"""Background jobs (run by ``python backend.py run_worker``)."""
+
+from llm.jobs import RetryLater
+
+from .models import Answer, Question
+from .services import ai_service
+
+
+def answer_question_job(job):
+    """Generate and store the AI answer for a queued question."""
+    question = Question.objects.filter(pk=job.payload['question_id']).first()
+    if question is None or question.answers.exists():
+        return  # deleted, or answered by an earlier attempt
+
+    result = ai_service.get_answer(
+        question.question_text,
+        use_cache=job.payload.get('use_cache', True),
+        category=question.category
+    )
+    if result.get('queued'):
+        # The LLM is unavailable: wait for it without using up attempts
+        raise RetryLater(result.get('retry_after') or 30, result['error'])
+    if not result['success']:
+        # Never store the error as an answer: the queue retries with backoff
+        # and finally marks the job failed, which the answer page reports
+        raise RuntimeError(result.get('error') or result['answer'])
+
+    Answer.objects.create(
+        question=question,
+        answer_text=result['answer'],
+        source=result.get('source', 'AI'),
+        confidence_score=result.get('confidence'),
+        **result.get('usage', {})
+    )
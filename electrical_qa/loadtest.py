@@ -0,0 +1,20 @@
+"""The ``python backend.py load_test`` scenario (``LOAD_TEST_SCENARIO``)."""
+
+import re
+
+
+def load_test_scenario(vu):
+    """Browse the question list, read an answer, and now and then ask."""
+    if not vu.logged_in and not vu.login():
+        return False
+    page = vu.get('question list', '/questions/')
+    if page is not None and page.status_code == 200:
+        answer_ids = re.findall(r'/answer/(\d+)/', page.text)
+        if answer_ids:
+            vu.get('answer detail', f'/answer/{vu.rng.choice(answer_ids)}/')
+        cursor = re.search(r'\?cursor=([^"]+)"', page.text)
+        if cursor and vu.iteration % 2:
+            vu.get('question list (older)', f'/questions/?cursor={cursor.group(1)}')
+    if vu.iteration % 5 == 0:
+        category, question = vu.question()
+        vu.post('ask', '/ask/', {'question_text': question, 'category': category})
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# (table, index name, column); MySQL only: other databases use the llm
+# inverted index
+FULLTEXT_INDEXES = [
+    ('questions', 'questions_question_text_ft', 'question_text'),
+    ('answers', 'answers_answer_text_ft', 'answer_text'),
+]
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    for table, name, column in FULLTEXT_INDEXES:
+        schema_editor.execute(f'ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({column})')
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    for table, name, column in FULLTEXT_INDEXES:
+        schema_editor.execute(f'ALTER TABLE {table} DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('__main__', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
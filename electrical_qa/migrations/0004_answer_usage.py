@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('__main__', '0003_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='completion_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='latency_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='model',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='outcome',
+            field=models.CharField(blank=True, choices=[('generated', 'Generated'), ('truncated', 'Generated, cut off at max_tokens'), ('cached', 'Answer cache'), ('similar', 'Similar question')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='prompt_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='ttft_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['created_at'], name='answers_created_a5b46e_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+"""Database models (5 columns each as required)."""
+
+from django.contrib.auth.models import User
+from django.db import models
+
+from llm.models import AnswerUsage
+
+
+class Question(models.Model):
+    """
+    Question model - stores user questions about electrical machines.
+    Database columns: id, user_id, question_text, category, created_at
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='questions'
+    )
+    question_text = models.TextField()
+    category = models.CharField(max_length=100, default='General')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'questions'
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['category', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.question_text[:50]}..."
+
+
+class Answer(AnswerUsage, models.Model):
+    """
+    Answer model - stores AI-generated answers.
+    Database columns: id, question_id, answer_text, source, confidence_score,
+    plus the model, latency and token usage of ``AnswerUsage``
+    """
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name='answers'
+    )
+    answer_text = models.TextField()
+    source = models.CharField(max_length=50, default='HuggingFace AI')
+    confidence_score = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'answers'
+        indexes = [
+            models.Index(fields=['question', 'created_at']),
+            models.Index(fields=['created_at']),  # analytics by day
+        ]
+
+    def __str__(self):
+        return f"Answer to: {self.question.question_text[:30]}..."
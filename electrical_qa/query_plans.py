@@ -0,0 +1,21 @@
+"""Hot queries verified by ``python backend.py check_query_plans``."""
+
+from .models import Answer, Question
+from .views import QUESTIONS_PER_PAGE, with_answer_counts
+
+
+def recent_questions():
+    return Question.objects.select_related('user')[:10]
+
+
+def question_list_page():
+    questions = with_answer_counts(Question.objects.select_related('user'))
+    return questions.order_by('-created_at', '-pk')[:QUESTIONS_PER_PAGE + 1]
+
+
+def questions_by_category():
+    return Question.objects.filter(category='General')[:100]
+
+
+def question_answers():
+    return Answer.objects.filter(question_id=1)
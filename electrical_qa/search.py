@@ -0,0 +1,32 @@
+"""Full-text search source (``SEARCH_SOURCES``) and its index signals."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from llm.search import SearchField, SearchSource, reindex
+
+from .models import Answer, Question
+
+
+class QuestionSearch(SearchSource):
+    """Questions, matched on their own text and their answers' text."""
+
+    fields = [
+        SearchField(Question, 'question_text', weight=2.0),
+        SearchField(Answer, 'answer_text', doc='question_id'),
+    ]
+
+    def results(self, doc_ids):
+        return Question.objects.select_related('user').filter(pk__in=doc_ids)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def reindex_question(sender, instance, **kwargs):
+    reindex('questions', instance.pk)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def reindex_answered_question(sender, instance, **kwargs):
+    reindex('questions', instance.question_id)
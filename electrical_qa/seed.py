@@ -0,0 +1,40 @@
+"""Writes ``python backend.py seed_data`` rows (``SEED_DATA_WRITER``)."""
+
+import random
+from datetime import timedelta
+
+from llm.seeding import bulk_create_with_pks, preserve_timestamps
+
+from .models import Answer, Question
+
+
+SEED_ANSWER_SOURCES = [
+    ('Llama 3.1 AI (Groq)', 0.95),
+    ('Stored answer (similar question)', 0.95),
+    ('Fallback', None),
+]
+
+
+def write_seed_batch(entries):
+    """Insert seed questions, most with one answer and a few with two."""
+    questions = [
+        Question(user_id=entry.user_id, question_text=entry.question,
+                 category=entry.category, created_at=entry.created_at,
+                 updated_at=entry.created_at)
+        for entry in entries
+    ]
+    with preserve_timestamps(Question, Answer):
+        bulk_create_with_pks(Question, questions,
+                             ['user_id', 'created_at', 'question_text'])
+        answers = []
+        for question, entry in zip(questions, entries):
+            # ~10% unanswered (failed jobs), ~5% answered twice
+            for _ in range(random.choices([0, 1, 2], [10, 85, 5])[0]):
+                source, confidence = random.choices(SEED_ANSWER_SOURCES, [80, 15, 5])[0]
+                answers.append(Answer(
+                    question_id=question.pk, answer_text=entry.answer,
+                    source=source, confidence_score=confidence,
+                    created_at=entry.created_at + timedelta(seconds=random.uniform(2, 30)),
+                ))
+        Answer.objects.bulk_create(answers)
+    return {'questions': len(questions), 'answers': len(answers)}
@@ -0,0 +1,303 @@
+"""Groq/Hugging Face AI service."""
+
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from llm.analytics import from_completion, from_shared, from_store
+from llm.cache import get_cached_answer, make_key, store_answer
+from llm.client import LLMThrottled, LLMTimeout, LLMUnavailable, get_client
+from llm.hedging import ahedged_chat, hedged_chat
+from llm.models import AnswerUsage
+from llm.routing import plan, route
+from llm.similarity import find_best_answer, find_similar_answer
+from llm.singleflight import acoalesce, coalesce
+
+logger = logging.getLogger(__name__)
+
+
+class HuggingFaceAI:
+    """Service to interact with Groq API for generating answers.
+
+    The model and ``max_tokens`` of each question are picked by
+    ``llm.routing`` from ``LLM_ROUTING``.
+    """
+
+    SYSTEM_PROMPT = (
+        "You are an expert in electrical machines, motors, transformers, "
+        "and power systems. Provide clear, accurate, technical answers with "
+        "examples when helpful."
+    )
+
+    def __init__(self, client=None):
+        self.groq_key = settings.GROQ_API_KEY
+        self.hf_key = settings.HUGGINGFACE_API_KEY
+        self.client = client or get_client()
+
+    def get_answer(self, question_text, use_cache=True, category=None):
+        """Generate answer for electrical machines question using Groq API.
+
+        Answers are served from the shared answer cache, or from a stored
+        answer to a near-duplicate question, when possible;
+        pass ``use_cache=False`` to force a fresh upstream call.
+        ``category`` may cap the answer's ``max_tokens``.
+        """
+        planned = plan(question_text, category)
+        if use_cache:
+            stored = self.stored_result(question_text, planned=planned)
+            if stored is not None:
+                return stored
+
+        if not self.groq_key:
+            return self._missing_key_result()
+
+        routed = route(question_text, category, planned)
+        # Identical questions already in flight share one upstream call
+        return coalesce(
+            make_key(question_text, routed.model, routed.max_tokens, self.SYSTEM_PROMPT),
+            lambda: self._fetch_answer(question_text, routed),
+            shared=self._shared_result,
+        )
+
+    async def aget_answer(self, question_text, use_cache=True, category=None):
+        """Async variant of :meth:`get_answer` using an async HTTP client."""
+        planned = plan(question_text, category)
+        if use_cache:
+            stored = await sync_to_async(self.stored_result)(
+                question_text, planned=planned
+            )
+            if stored is not None:
+                return stored
+
+        if not self.groq_key:
+            return self._missing_key_result()
+
+        routed = route(question_text, category, planned)
+        return await acoalesce(
+            make_key(question_text, routed.model, routed.max_tokens, self.SYSTEM_PROMPT),
+            lambda: self._afetch_answer(question_text, routed),
+            shared=self._shared_result,
+        )
+
+    def _shared_result(self, result):
+        """Result of a call coalesced with an identical question's."""
+        if 'usage' not in result:
+            return result
+        return {**result, 'usage': from_shared(result['usage'])}
+
+    def _fetch_answer(self, question_text, routed):
+        # Use Groq API (fast and reliable)
+        try:
+            logger.info(f"Sending request to Groq API for question: {question_text[:50]}...")
+            started = time.perf_counter()
+            response = hedged_chat(self.client, self._payload(question_text, routed))
+            return self._handle_response(
+                question_text, response, routed,
+                time.perf_counter() - started
+            )
+
+        except LLMUnavailable as e:
+            return self._unavailable_result(question_text, routed, e)
+
+        except LLMThrottled as e:
+            return self._throttled_result(e)
+
+        except LLMTimeout:
+            return self._timeout_result()
+
+        except Exception as e:
+            return self._exception_result(e)
+
+    async def _afetch_answer(self, question_text, routed):
+        try:
+            logger.info(f"Sending request to Groq API for question: {question_text[:50]}...")
+            started = time.perf_counter()
+            response = await ahedged_chat(self.client, self._payload(question_text, routed))
+            return await sync_to_async(self._handle_response)(
+                question_text, response, routed,
+                time.perf_counter() - started
+            )
+
+        except LLMUnavailable as e:
+            return await sync_to_async(self._unavailable_result)(
+                question_text, routed, e
+            )
+
+        except LLMThrottled as e:
+            return self._throttled_result(e)
+
+        except LLMTimeout:
+            return self._timeout_result()
+
+        except Exception as e:
+            return self._exception_result(e)
+
+    def stored_result(self, question_text, category=None, planned=None):
+        """Cached or near-duplicate answer in ``get_answer`` format, if any.
+
+        Cached answers are looked up under the model and ``max_tokens``
+        planned for the question (``planned``, when the caller already has
+        it); the question is not routed.
+        """
+        planned = planned or plan(question_text, category)
+        cached = get_cached_answer(
+            question_text, planned.model, planned.max_tokens, self.SYSTEM_PROMPT
+        )
+        if cached is not None:
+            logger.info("Answer cache hit for question: %s...",
+                        question_text[:50])
+            return {
+                'success': True,
+                'answer': cached.answer_text,
+                'source': cached.source,
+                'confidence': 0.95,
+                'cached': True,
+                'usage': from_store(cached.model, AnswerUsage.CACHED),
+            }
+
+        similar = find_similar_answer('answers', question_text)
+        if similar is not None:
+            logger.info("Similar question match for: %s...",
+                        question_text[:50])
+            return {
+                'success': True,
+                'answer': similar,
+                'source': 'Stored answer (similar question)',
+                'confidence': 0.95,
+                'cached': True,
+                'usage': from_store('', AnswerUsage.SIMILAR),
+            }
+        return None
+
+    def _payload(self, question_text, routed):
+        return {
+            "model": routed.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": question_text
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": routed.max_tokens,
+            "top_p": 0.9
+        }
+
+    def _handle_response(self, question_text, response, routed, seconds=None):
+        """Turn a Groq HTTP response (requests or httpx) into a result.
+
+        ``routed`` is the question's ``Route``; ``seconds`` is the upstream
+        latency, saved with the answer.
+        """
+        logger.info(f"Groq API Response Status: {response.status_code}")
+
+        if response.status_code == 200:
+            result = response.json()
+            answer = result['choices'][0]['message']['content'].strip()
+
+            logger.info(f"Successfully got answer from Groq AI")
+
+            source = 'Llama 3.1 AI (Groq)'
+            usage = from_completion(result, routed.model, seconds)
+            # Under the model that answered, which a hedge may have changed
+            store_answer(question_text, usage['model'], routed.max_tokens,
+                         self.SYSTEM_PROMPT, answer, source=source)
+
+            return {
+                'success': True,
+                'answer': answer,
+                'source': source,
+                'confidence': 0.95,
+                'usage': usage,
+            }
+
+        elif response.status_code == 401:
+            logger.error("Groq API: Invalid API key")
+            return {
+                'success': False,
+                'answer': 'API authentication failed. Please check your Groq API key in .env file.',
+                'error': 'Invalid API key'
+            }
+
+        else:
+            logger.error(f"Groq API Error: {response.status_code} - {response.text}")
+            return {
+                'success': False,
+                'answer': f'API Error (Status {response.status_code}). Please try again.',
+                'error': response.text
+            }
+
+    def _throttled_result(self, e):
+        # The client already queued through Groq's 429s until its deadline
+        logger.error("Groq API: Rate limit exceeded")
+        return {
+            'success': False,
+            'answer': 'Too many requests. Please wait a moment and try again.',
+            'error': 'Rate limit',
+            'retry_after': e.retry_after
+        }
+
+    def _timeout_result(self):
+        logger.error("Groq API: Request timeout")
+        return {
+            'success': False,
+            'answer': 'Request timed out. Please try again.',
+            'error': 'Timeout'
+        }
+
+    def _exception_result(self, e):
+        logger.error(f"Groq API Exception: {str(e)}")
+        return {
+            'success': False,
+            'answer': f'Error: {str(e)}. Please check your API key and internet connection.',
+            'error': str(e)
+        }
+
+    def _unavailable_result(self, question_text, routed, error):
+        """Closest stored answer while the circuit breaker is open, if any.
+
+        Otherwise the result is ``queued``: ``answer_question_job`` tries
+        again after ``retry_after`` seconds.
+        """
+        logger.warning(f"Groq API unavailable: {error}")
+        cached = get_cached_answer(
+            question_text, routed.model, routed.max_tokens, self.SYSTEM_PROMPT
+        )
+        answer = (
+            cached.answer_text if cached is not None
+            else find_best_answer('answers', question_text)
+        )
+        if answer is not None:
+            return {
+                'success': True,
+                'answer': answer,
+                'source': 'Stored answer (AI unavailable)',
+                'confidence': 0.5,
+                'cached': True,
+                'usage': from_store(routed.model, AnswerUsage.DEGRADED),
+            }
+        return {
+            'success': False,
+            'queued': True,
+            'answer': 'The AI service is unavailable right now. Your question is queued and will be answered shortly.',
+            'error': str(error),
+            'retry_after': error.retry_after,
+        }
+
+    def _missing_key_result(self):
+        logger.error("No Groq API key found in environment")
+        return {
+            'success': False,
+            'answer': 'Groq API key is missing. Please add GROQ_API_KEY to your .env file.',
+            'error': 'No API key'
+        }
+
+
+# One instance per process, sharing the pooled LLM client
+ai_service = HuggingFaceAI()
@@ -0,0 +1,218 @@
+"""
+Settings of the Electrical Machines Q&A platform.
+
+Values come from the environment, or from ``electrical_qa/.env``.
+"""
+
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# ============================================================================
+# LOAD ENVIRONMENT VARIABLES FIRST
+# ============================================================================
+
+env_path = BASE_DIR / '.env'
+if env_path.exists():
+    with open(env_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                os.environ[key.strip()] = value.strip()
+
+def config(key, default=None, cast=None):
+    """Simple config function to read environment variables"""
+    value = os.environ.get(key, default)
+    if cast and value is not None:
+        if cast == bool:
+            return value.lower() in ('true', '1', 'yes')
+        return cast(value)
+    return value
+
+# MySQL through the pure-Python driver
+import pymysql
+pymysql.install_as_MySQLdb()
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+DEBUG = config('DEBUG', default=True, cast=bool)
+SECRET_KEY = config('SECRET_KEY', default='dev-secret-key-change-in-production')
+ALLOWED_HOSTS = ['*']
+ROOT_URLCONF = 'electrical_qa.urls'
+# Preloaded by ``electrical_qa.wsgi`` / ``electrical_qa.asgi``
+WSGI_APPLICATION = 'electrical_qa.wsgi.application'
+ASGI_APPLICATION = 'electrical_qa.asgi.application'
+
+MIDDLEWARE = [
+    'llm.middleware.MetricsMiddleware',  # first, to time everything
+    'llm.middleware.ReplicaMiddleware',  # before anything that queries
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+INSTALLED_APPS = [
+    # Registers electrical_qa/admin.py from the URLconf rather than at
+    # startup, so workers and commands don't import the admin's forms
+    'django.contrib.admin.apps.SimpleAdminConfig',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'llm',
+    'electrical_qa.apps.ElectricalQAConfig',
+]
+
+TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [BASE_DIR / 'templates'],
+    'APP_DIRS': True,
+    'OPTIONS': {
+        'context_processors': [
+            'django.template.context_processors.debug',
+            'django.template.context_processors.request',
+            'django.contrib.auth.context_processors.auth',
+            'django.contrib.messages.context_processors.messages',
+        ],
+    },
+}]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.mysql',
+        'NAME': config('DB_NAME', default='electrical_qa_db'),
+        'USER': config('DB_USER', default='root'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='3306'),
+    }
+}
+
+# Read replicas of the default database (llm.replicas), same
+# credentials: GET requests read from those at most
+# REPLICA_MAX_LAG_SECONDS behind. settings_replicas.py tries it on SQLite
+DATABASE_ROUTERS = ['llm.replicas.ReplicaRouter']
+DATABASE_REPLICAS = []
+for number, host in enumerate(filter(None, config('DB_REPLICA_HOSTS', default='').split(',')), 1):
+    DATABASES[f'replica{number}'] = {**DATABASES['default'], 'HOST': host.strip()}
+    DATABASE_REPLICAS.append(f'replica{number}')
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=5, cast=float)
+
+STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+LOGIN_REDIRECT_URL = 'home'
+LOGOUT_REDIRECT_URL = 'home'
+LOGIN_URL = 'login'
+LANGUAGE_CODE = 'en-us'
+TIME_ZONE = 'Asia/Kolkata'
+USE_I18N = True
+USE_TZ = True
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+GROQ_API_KEY = config('GROQ_API_KEY', default='')
+HUGGINGFACE_API_KEY = config('HUGGINGFACE_API_KEY', default='')
+# ``python backend.py run_mock_llm`` serves a local stand-in for it
+LLM_API_URL = config(
+    'LLM_API_URL',
+    default='https://api.groq.com/openai/v1/chat/completions'
+)
+LLM_POOL_SIZE = config('LLM_POOL_SIZE', default=10, cast=int)
+LLM_CONNECT_TIMEOUT = config('LLM_CONNECT_TIMEOUT', default=5, cast=float)
+LLM_READ_TIMEOUT = config('LLM_READ_TIMEOUT', default=30, cast=float)
+LLM_MAX_RETRIES = config('LLM_MAX_RETRIES', default=2, cast=int)
+LLM_RETRY_BACKOFF = config('LLM_RETRY_BACKOFF', default=0.5, cast=float)
+# Fail fast for LLM_BREAKER_RESET_SECONDS after this many timeouts,
+# connection errors or 5xx in a row from a model
+LLM_BREAKER_FAILURES = config('LLM_BREAKER_FAILURES', default=5, cast=int)
+LLM_BREAKER_RESET_SECONDS = config('LLM_BREAKER_RESET_SECONDS', default=30, cast=float)
+# Ask the other LLM_ROUTING model too when a call outlasts its p95
+LLM_HEDGE_ENABLED = config('LLM_HEDGE_ENABLED', default='False', cast=bool)
+LLM_HEDGE_PERCENTILE = config('LLM_HEDGE_PERCENTILE', default=95, cast=float)
+LLM_HEDGE_MIN_SECONDS = config('LLM_HEDGE_MIN_SECONDS', default=2, cast=float)
+LLM_RATE_LIMIT_RPM = config('LLM_RATE_LIMIT_RPM', default=30, cast=int)
+LLM_RATE_LIMIT_BURST = config('LLM_RATE_LIMIT_BURST', default=5, cast=int)
+LLM_MAX_CONCURRENCY = config('LLM_MAX_CONCURRENCY', default=8, cast=int)
+LLM_QUEUE_DEADLINE = config('LLM_QUEUE_DEADLINE', default=30, cast=float)
+LLM_CACHE_ENABLED = config('LLM_CACHE_ENABLED', default='True', cast=bool)
+LLM_CACHE_TTL = config('LLM_CACHE_TTL', default=7 * 24 * 3600, cast=int)
+LLM_CACHE_MAX_ENTRIES = config('LLM_CACHE_MAX_ENTRIES', default=10000, cast=int)
+LLM_SIMILARITY_ENABLED = config('LLM_SIMILARITY_ENABLED', default='True', cast=bool)
+LLM_SIMILARITY_THRESHOLD = config('LLM_SIMILARITY_THRESHOLD', default=0.85, cast=float)
+LLM_SIMILARITY_INDEX_DIR = BASE_DIR / 'var' / 'similarity'
+LLM_SIMILARITY_SOURCES = {
+    'answers': 'electrical_qa.similarity.AnsweredQuestionSource',
+}
+# Served while the LLM is unavailable (circuit breaker open)
+LLM_DEGRADED_SIMILARITY_THRESHOLD = config(
+    'LLM_DEGRADED_SIMILARITY_THRESHOLD', default=0.6, cast=float
+)
+LLM_SINGLEFLIGHT_DIR = BASE_DIR / 'var' / 'singleflight'
+LLM_SINGLEFLIGHT_WAIT = config('LLM_SINGLEFLIGHT_WAIT', default=60, cast=float)
+# Model and max_tokens per question (llm.routing): short definitions
+# go to the small model, and so do complex questions while the large
+# one is slower than slow_seconds or was rate limited recently
+LLM_ROUTING = {
+    'small': config('LLM_SMALL_MODEL', default='llama-3.1-8b-instant'),
+    'large': config('LLM_LARGE_MODEL', default='llama-3.3-70b-versatile'),
+    'max_tokens': {'simple': 250, 'complex': 500},
+    'category_max_tokens': {'General': 350},
+    'slow_seconds': config('LLM_SLOW_SECONDS', default=8, cast=float),
+    'throttle_cooldown': config('LLM_THROTTLE_COOLDOWN', default=60, cast=float),
+}
+LLM_JOB_HANDLERS = {
+    'answer_question': 'electrical_qa.jobs.answer_question_job',
+}
+LLM_JOB_VISIBILITY_TIMEOUT = config('LLM_JOB_VISIBILITY_TIMEOUT', default=120, cast=int)
+LLM_JOB_MAX_ATTEMPTS = config('LLM_JOB_MAX_ATTEMPTS', default=3, cast=int)
+LLM_JOB_RETRY_BACKOFF = config('LLM_JOB_RETRY_BACKOFF', default=5, cast=float)
+# ``python backend.py seed_data`` bulk-inserts its rows with this
+SEED_DATA_WRITER = 'electrical_qa.seed.write_seed_batch'
+# ``python backend.py export_data`` / ``import_data`` and /llm/export/
+EXPORT_SOURCES = {
+    'questions': 'electrical_qa.transfer.QuestionExport',
+}
+# ``python backend.py reconcile_counters`` recounts from here
+COUNTER_RECOUNT = ['electrical_qa.stats.recount_stats', 'llm.search.recount_documents']
+SEARCH_SOURCES = {
+    'questions': 'electrical_qa.search.QuestionSearch',
+}
+# ``python backend.py check_query_counts`` fails pages over budget
+QUERY_COUNT_BUDGETS = {
+    '/': 2,
+    '/questions/': 1,
+}
+# ``python backend.py serve``: pre-forked workers serving the ASGI app
+# (or WSGI, SERVER_THREADS requests at a time per worker), replaced
+# after SERVER_MAX_REQUESTS
+SERVER = {
+    'bind': config('SERVER_BIND', default='127.0.0.1:8000'),
+    'interface': config('SERVER_INTERFACE', default='asgi'),
+    'workers': config('SERVER_WORKERS', default=2, cast=int),
+    'threads': config('SERVER_THREADS', default=8, cast=int),
+    'max_requests': config('SERVER_MAX_REQUESTS', default=1000, cast=int),
+    'graceful_timeout': config('SERVER_GRACEFUL_TIMEOUT', default=60, cast=float),
+}
+# /metrics is open to these addresses (and staff); requests slower
+# than SLOW_REQUEST_SECONDS are logged with their SQL (0: off)
+METRICS_ALLOWED_IPS = config(
+    'METRICS_ALLOWED_IPS', default='127.0.0.1,::1'
+).split(',')
+SLOW_REQUEST_SECONDS = config('SLOW_REQUEST_SECONDS', default=0, cast=float)
+# ``python backend.py load_test`` runs this for each virtual user
+LOAD_TEST_SCENARIO = 'electrical_qa.loadtest.load_test_scenario'
+# ``python backend.py check_query_plans`` EXPLAINs these
+QUERY_PLAN_CHECKS = {
+    'recent questions': 'electrical_qa.query_plans.recent_questions',
+    'question list page': 'electrical_qa.query_plans.question_list_page',
+    'questions by category': 'electrical_qa.query_plans.questions_by_category',
+    'answers to a question': 'electrical_qa.query_plans.question_answers',
+}
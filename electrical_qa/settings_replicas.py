@@ -0,0 +1,29 @@
+"""
+Settings for trying the read replicas (llm.replicas) on one machine.
+
+Two SQLite databases stand in for a MySQL primary and its replica:
+``replicate_sqlite`` copies the primary over the replica every few
+seconds, so the replica lags like an asynchronously replicated one.
+
+    export DJANGO_SETTINGS_MODULE=electrical_qa.settings_replicas
+    python backend.py migrate
+    python backend.py replicate_sqlite --interval 3 &
+    python backend.py serve
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+(BASE_DIR / 'var').mkdir(exist_ok=True)
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'var' / 'primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'var' / 'replica.sqlite3',
+    },
+}
+DATABASE_REPLICAS = ['replica']
@@ -0,0 +1,21 @@
+"""Answered questions for the near-duplicate index (``LLM_SIMILARITY_SOURCES``)."""
+
+from .models import Answer
+
+
+class AnsweredQuestionSource:
+    """Successfully answered questions, indexed by answer id."""
+
+    def rows_after(self, last_id, limit):
+        return (
+            Answer.objects.filter(pk__gt=last_id, confidence_score__isnull=False)
+            .order_by('pk')
+            .values_list('pk', 'question__question_text')[:limit]
+        )
+
+    def answer_for(self, pk):
+        return (
+            Answer.objects.filter(pk=pk)
+            .values_list('answer_text', flat=True)
+            .first()
+        )
@@ -0,0 +1,100 @@
+"""Statistics counters (home page stats without COUNT(*) scans)."""
+
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from llm import counters
+
+from .models import Answer, Question
+
+
+def category_counter(category):
+    return f'questions:category:{category}'
+
+
+def day_counter(day):
+    return f'questions:day:{day.isoformat()}'
+
+
+def _question_deltas(question, delta):
+    return {
+        'questions': delta,
+        category_counter(question.category): delta,
+        day_counter(timezone.localdate(question.created_at)): delta,
+    }
+
+
+@receiver(pre_save, sender=Question)
+def remember_question_category(sender, instance, **kwargs):
+    if instance.pk and not instance._state.adding:
+        instance._saved_category = (
+            Question.objects.filter(pk=instance.pk)
+            .values_list('category', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Question)
+def count_saved_question(sender, instance, created, **kwargs):
+    if created:
+        counters.increment(_question_deltas(instance, 1))
+        return
+    old = getattr(instance, '_saved_category', None)
+    if old is not None and old != instance.category:
+        counters.increment({
+            category_counter(old): -1,
+            category_counter(instance.category): 1,
+        })
+
+
+@receiver(post_delete, sender=Question)
+def count_deleted_question(sender, instance, **kwargs):
+    counters.increment(_question_deltas(instance, -1))
+
+
+@receiver(post_save, sender=Answer)
+def count_saved_answer(sender, instance, created, **kwargs):
+    if created:
+        counters.increment({'answers': 1})
+
+
+@receiver(post_delete, sender=Answer)
+def count_deleted_answer(sender, instance, **kwargs):
+    counters.increment({'answers': -1})
+
+
+@receiver(post_save, sender=User)
+def count_saved_user(sender, instance, created, **kwargs):
+    if created:
+        counters.increment({'users': 1})
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_user(sender, instance, **kwargs):
+    counters.increment({'users': -1})
+
+
+def recount_stats():
+    """Exact values of every counter above, for ``reconcile_counters``."""
+    values = {
+        'questions': Question.objects.count(),
+        'answers': Answer.objects.count(),
+        'users': User.objects.count(),
+    }
+    by_category = (
+        Question.objects.order_by().values('category')
+        .annotate(n=Count('pk')).values_list('category', 'n')
+    )
+    for category, n in by_category:
+        values[category_counter(category)] = n
+    by_day = (
+        Question.objects.order_by()
+        .annotate(day=TruncDate('created_at')).values('day')
+        .annotate(n=Count('pk')).values_list('day', 'n')
+    )
+    for day, n in by_day:
+        values[day_counter(day)] = n
+    return values
@@ -0,0 +1,94 @@
+"""Export / import (``python backend.py export_data`` / ``import_data``)."""
+
+from collections import defaultdict
+from datetime import datetime
+
+from llm.seeding import bulk_create_with_pks, preserve_timestamps
+from llm.transfer import ExportSource, filter_rows, pk_chunks, user_ids
+
+from .models import Answer, Question
+
+
+ANSWER_EXPORT_FIELDS = [
+    'answer_text', 'source', 'confidence_score', 'model', 'outcome',
+    'latency_ms', 'ttft_ms', 'prompt_tokens', 'completion_tokens',
+]
+
+
+class QuestionExport(ExportSource):
+    """Questions with their answers, one row per answer.
+
+    An unanswered question is one row with empty answer columns;
+    ``question_id`` (the exporting database's id) groups the rows.
+    """
+    fields = {
+        'question_id': int,
+        'username': str,
+        'category': str,
+        'question_text': str,
+        'question_created_at': datetime,
+        'answer_text': str,
+        'source': str,
+        'confidence_score': float,
+        'model': str,
+        'outcome': str,
+        'latency_ms': int,
+        'ttft_ms': int,
+        'prompt_tokens': int,
+        'completion_tokens': int,
+        'answer_created_at': datetime,
+    }
+    group_by = 'question_id'
+
+    def rows(self, since=None, until=None, username=None, chunk_size=2000):
+        questions = filter_rows(Question.objects.all(), since, until, 'user', username)
+        no_answer = dict.fromkeys(ANSWER_EXPORT_FIELDS + ['created_at'])
+        for chunk in pk_chunks(questions, 'user__username', 'category',
+                               'question_text', 'created_at', chunk_size=chunk_size):
+            answers = defaultdict(list)
+            for answer in (
+                Answer.objects.filter(question_id__in=[q['pk'] for q in chunk])
+                .order_by('pk')
+                .values('question_id', 'created_at', *ANSWER_EXPORT_FIELDS)
+            ):
+                answers[answer.pop('question_id')].append(answer)
+            for question in chunk:
+                for answer in answers.get(question['pk']) or [no_answer]:
+                    yield {
+                        'question_id': question['pk'],
+                        'username': question['user__username'],
+                        'category': question['category'],
+                        'question_text': question['question_text'],
+                        'question_created_at': question['created_at'],
+                        **{name: answer[name] for name in ANSWER_EXPORT_FIELDS},
+                        'answer_created_at': answer['created_at'],
+                    }
+
+    def write(self, rows):
+        users = user_ids(row['username'] for row in rows)
+        questions = {}
+        answered = []
+        for row in rows:
+            question = questions.get(row['question_id'])
+            if question is None:
+                question = questions[row['question_id']] = Question(
+                    user_id=users[row['username']],
+                    question_text=row['question_text'],
+                    category=row['category'] or 'General',
+                    created_at=row['question_created_at'],
+                    updated_at=row['question_created_at'],
+                )
+            if row['answer_created_at'] is not None:
+                answered.append((question, row))
+        with preserve_timestamps(Question, Answer):
+            bulk_create_with_pks(Question, list(questions.values()),
+                                 ['user_id', 'created_at', 'question_text'])
+            Answer.objects.bulk_create([
+                Answer(
+                    question_id=question.pk,
+                    created_at=row['answer_created_at'],
+                    **{name: row[name] for name in ANSWER_EXPORT_FIELDS},
+                )
+                for question, row in answered
+            ])
+        return {'questions': len(questions), 'answers': len(answered)}
@@ -0,0 +1,26 @@
+from django.contrib import admin
+from django.contrib.auth import views as auth_views
+from django.urls import include, path
+
+from llm.views import prometheus_metrics
+
+from . import admin as _admin  # noqa: F401 (registers the models)
+from . import views
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('llm/', include('llm.urls')),
+    path('metrics', prometheus_metrics, name='metrics'),
+    path('', views.home, name='home'),
+    path('register/', views.register_view, name='register'),
+    path('login/', auth_views.LoginView.as_view(
+        template_name='login.html'
+    ), name='login'),
+    path('logout/', auth_views.LogoutView.as_view(), name='logout'),
+    path('ask/', views.ask_question, name='ask_question'),
+    path('questions/', views.question_list, name='question_list'),
+    path('search/', views.search_view, name='search'),
+    path('answer/<int:pk>/', views.answer_detail, name='answer_detail'),
+    path('answer/<int:pk>/status/', views.answer_status, name='answer_status'),
+    path('analytics/', views.analytics_view, name='analytics'),
+]
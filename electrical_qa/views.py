@@ -0,0 +1,215 @@
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import login
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from llm import counters
+from llm.analytics import latency_percentiles, outcome_counts, tokens_per_day
+from llm.cache import cache_bypassed
+from llm.jobs import aenqueue, latest_job
+from llm.pagination import InvalidCursor, keyset_page
+from llm.search import search
+
+from .forms import QuestionForm, RegisterForm
+from .models import Answer, Question
+from .services import ai_service
+from .stats import category_counter, day_counter
+
+
+QUESTIONS_PER_PAGE = 24
+
+
+def with_answer_counts(questions):
+    """Annotate ``answer_count`` with a correlated subquery.
+
+    Unlike ``Count('answers')`` this needs no join and GROUP BY over the
+    whole table, so it only costs one lookup per row on the page.
+    """
+    counts = (
+        Answer.objects.filter(question=OuterRef('pk'))
+        .order_by()
+        .values('question')
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    return questions.annotate(answer_count=Coalesce(Subquery(counts), 0))
+
+
+def home(request):
+    """Homepage with recent questions and statistics."""
+    recent_questions = Question.objects.select_related('user')[:10]
+    today = day_counter(timezone.localdate())
+    values = counters.read(
+        ['questions', 'users', 'answers', today],
+        prefixes=[category_counter('')]
+    )
+    stats = {
+        'total_questions': values['questions'],
+        'total_users': values['users'],
+        'total_answers': values['answers'],
+        'questions_today': values[today],
+    }
+    categories = sorted(
+        (
+            (name[len(category_counter('')):], n)
+            for name, n in values.items()
+            if name.startswith(category_counter('')) and n > 0
+        ),
+        key=lambda item: -item[1]
+    )
+    return render(request, 'home.html', {
+        'recent_questions': recent_questions,
+        'stats': stats,
+        'categories': categories
+    })
+
+
+def register_view(request):
+    """User registration view."""
+    if request.method == 'POST':
+        form = RegisterForm(request.POST)
+        if form.is_valid():
+            user = form.save()
+            login(request, user)
+            messages.success(
+                request,
+                f'Welcome {user.username}! Your account has been created.'
+            )
+            return redirect('home')
+    else:
+        form = RegisterForm()
+    return render(request, 'register.html', {'form': form})
+
+
+@login_required
+async def ask_question(request):
+    """Ask a new question; the AI answer is generated in the background.
+
+    Cached and near-duplicate answers are stored straight away. Everything
+    else is queued for ``run_worker`` so the redirect does not wait on Groq.
+    """
+    if request.method == 'POST':
+        form = QuestionForm(request.POST)
+        if form.is_valid():
+            question = form.save(commit=False)
+            question.user = await request.auser()
+            await question.asave()
+
+            use_cache = not cache_bypassed(request)
+            stored = None
+            if use_cache:
+                stored = await sync_to_async(ai_service.stored_result)(
+                    question.question_text, question.category
+                )
+
+            if stored is not None:
+                await Answer.objects.acreate(
+                    question=question,
+                    answer_text=stored['answer'],
+                    source=stored.get('source', 'AI'),
+                    confidence_score=stored.get('confidence'),
+                    **stored.get('usage', {})
+                )
+                messages.success(
+                    request,
+                    'Question posted and answered successfully!'
+                )
+            else:
+                await aenqueue(
+                    'answer_question',
+                    {'question_id': question.pk, 'use_cache': use_cache},
+                    key=f'question:{question.pk}'
+                )
+                messages.info(
+                    request,
+                    'Question posted! The AI answer will appear here shortly.'
+                )
+
+            return redirect('answer_detail', pk=question.pk)
+    else:
+        form = QuestionForm()
+    # Templates touch the lazy user/session, which must load synchronously
+    return await sync_to_async(render)(request, 'ask.html', {'form': form})
+
+
+def question_list(request):
+    """List questions newest first, one keyset page at a time."""
+    questions = with_answer_counts(Question.objects.select_related('user'))
+    try:
+        page = keyset_page(
+            questions, request.GET.get('cursor'), QUESTIONS_PER_PAGE
+        )
+    except InvalidCursor:
+        return redirect('question_list')
+    return render(request, 'questions.html', {
+        'questions': page,
+        'page': page,
+        'is_first_page': not request.GET.get('cursor')
+    })
+
+
+def search_view(request):
+    """Ranked search over questions and their answers."""
+    query = request.GET.get('q', '').strip()
+    try:
+        page_number = int(request.GET.get('page', 1))
+    except ValueError:
+        page_number = 1
+    page = search('questions', query, page=page_number) if query else None
+    return render(request, 'search.html', {'query': query, 'page': page})
+
+
+def answer_detail(request, pk):
+    """View question with answer (or the pending state while queued)."""
+    question = get_object_or_404(Question, pk=pk)
+    answers = list(question.answers.all())
+    job = None if answers else latest_job(f'question:{pk}')
+    return render(request, 'answer.html', {
+        'question': question,
+        'answers': answers,
+        'job': job
+    })
+
+
+def answer_status(request, pk):
+    """JSON answer status for a question, polled by the pending page."""
+    question = get_object_or_404(Question, pk=pk)
+    job = latest_job(f'question:{pk}')
+    if question.answers.exists():
+        status = 'done'
+    else:
+        status = job.status if job else 'pending'
+    return JsonResponse({
+        'question_id': question.pk,
+        'status': status,
+        'attempts': job.attempts if job else 0,
+        'error': job.last_error if job and status == 'failed' else '',
+    })
+
+
+@staff_member_required
+def analytics_view(request):
+    """LLM latency per model and category, and token usage per day."""
+    try:
+        days = max(1, int(request.GET.get('days', 30)))
+    except ValueError:
+        days = 30
+    answers = Answer.objects.filter(
+        created_at__gte=timezone.now() - timedelta(days=days)
+    )
+    return render(request, 'analytics.html', {
+        'days': days,
+        'latency': latency_percentiles(
+            answers, ['model', 'question__category']
+        ),
+        'outcomes': outcome_counts(answers),
+        'daily': tokens_per_day(answers),
+    })
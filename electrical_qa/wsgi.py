@@ -0,0 +1,17 @@
+"""
+WSGI entry point, e.g. ``gunicorn --preload electrical_qa.wsgi``.
+
+The URLconf (views, forms, admin and the LLM client) is imported here
+rather than on the first request, so ``--preload`` loads it once in the
+master and forked workers start serving straight away.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'electrical_qa.settings')
+
+application = get_wsgi_application()
+get_resolver().url_patterns  # noqa: B018 (imports the URLconf)
@@ -25,10 +25,14 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "core",  # Your app name
+    "llm",
     'widget_tweaks',
 ]
 
 MIDDLEWARE = [
+    "llm.middleware.MetricsMiddleware",  # first, to time the whole request
+    # Before anything that queries, so GET requests read from replicas
+    "llm.middleware.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -57,6 +61,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "electrical_qna_project.wsgi.application"
+ASGI_APPLICATION = "electrical_qna_project.asgi.application"
 
 # Database
 DATABASES = {
@@ -73,6 +78,17 @@ DATABASES = {
     }
 }
 
+# Read replicas of the default database (llm.replicas): DB_REPLICA_HOSTS
+# is a comma-separated list of hosts, same credentials. GET requests read
+# from those at most REPLICA_MAX_LAG_SECONDS behind; see
+# electrical_qna_project/settings_replicas.py to try it on SQLite
+DATABASE_ROUTERS = ["llm.replicas.ReplicaRouter"]
+DATABASE_REPLICAS = []
+for number, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), 1):
+    DATABASES[f"replica{number}"] = {**DATABASES["default"], "HOST": host.strip()}
+    DATABASE_REPLICAS.append(f"replica{number}")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -105,3 +121,127 @@ LOGIN_URL = '/login/'
 
 LOGIN_REDIRECT_URL = 'dashboard'  # or wherever you want to go after login
 LOGOUT_REDIRECT_URL = 'login'
+
+# Chat completions endpoint; point it at ``manage.py run_mock_llm`` to run
+# offline
+LLM_API_URL = os.getenv("LLM_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+
+# Pooled LLM client (connections / seconds)
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+
+# Circuit breaker per model: fail fast for LLM_BREAKER_RESET_SECONDS after
+# this many timeouts, connection errors or 5xx in a row
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+# Hedged calls: ask the other LLM_ROUTING model too when a call outlasts the
+# model's recent p95 latency (and at least LLM_HEDGE_MIN_SECONDS)
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "False") == "True"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_SECONDS = float(os.getenv("LLM_HEDGE_MIN_SECONDS", "2"))
+
+# Client-side rate limiting per process (requests / calls / seconds)
+LLM_RATE_LIMIT_RPM = int(os.getenv("LLM_RATE_LIMIT_RPM", "30"))
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", "5"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_QUEUE_DEADLINE = float(os.getenv("LLM_QUEUE_DEADLINE", "30"))
+
+# /ask/batch/: questions per request, and how many of them are answered at
+# once (each still waits its turn in the rate limiter above)
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "200"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# LLM answer cache (seconds / rows)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True") == "True"
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Near-duplicate question lookup (cosine similarity, 0..1)
+LLM_SIMILARITY_ENABLED = os.getenv("LLM_SIMILARITY_ENABLED", "True") == "True"
+LLM_SIMILARITY_THRESHOLD = float(os.getenv("LLM_SIMILARITY_THRESHOLD", "0.85"))
+LLM_SIMILARITY_INDEX_DIR = BASE_DIR / "var" / "similarity"
+LLM_SIMILARITY_SOURCES = {
+    "qa_entries": "core.similarity.QAEntrySource",
+}
+# While the LLM is unavailable, stored answers this similar are served
+LLM_DEGRADED_SIMILARITY_THRESHOLD = float(os.getenv("LLM_DEGRADED_SIMILARITY_THRESHOLD", "0.6"))
+
+# Background jobs (``manage.py run_worker``): questions asked while the LLM
+# was unavailable are answered once it is back
+LLM_JOB_HANDLERS = {
+    "answer_entry": "core.jobs.answer_entry_job",
+}
+
+# Coalescing of identical in-flight questions across threads and processes
+LLM_SINGLEFLIGHT_DIR = BASE_DIR / "var" / "singleflight"
+LLM_SINGLEFLIGHT_WAIT = float(os.getenv("LLM_SINGLEFLIGHT_WAIT", "60"))
+
+# Model and max_tokens per question (llm.routing): short definitions go to
+# the small model, and so do complex questions while the large one is slower
+# than slow_seconds or was rate limited within throttle_cooldown seconds
+LLM_ROUTING = {
+    "small": os.getenv("LLM_SMALL_MODEL", "llama3-8b-8192"),
+    "large": os.getenv("LLM_LARGE_MODEL", "llama-3.3-70b-versatile"),
+    "max_tokens": {"simple": 250, "complex": 500},
+    "slow_seconds": float(os.getenv("LLM_SLOW_SECONDS", "8")),
+    "throttle_cooldown": float(os.getenv("LLM_THROTTLE_COOLDOWN", "60")),
+}
+
+# Full-text search (MySQL FULLTEXT; an inverted index on other databases)
+SEARCH_SOURCES = {
+    "qa_entries": "core.search.QAEntrySearch",
+}
+SEARCH_MAX_PAGES = 10
+
+# ``manage.py seed_data`` bulk-inserts its generated Q&A rows with this
+SEED_DATA_WRITER = "core.seed.write_entries"
+
+# ``manage.py export_data`` / ``import_data`` and /llm/export/<name>/
+EXPORT_SOURCES = {
+    "qa_entries": "core.transfer.QAEntryExport",
+}
+
+# ``manage.py reconcile_counters`` recounts these
+COUNTER_RECOUNT = ["llm.search.recount_documents"]
+
+# Max SQL queries per page for ``manage.py check_query_counts`` (logged-in
+# pages need ``--user``: session and user lookups are included)
+QUERY_COUNT_BUDGETS = {
+    "/": 3,
+}
+
+# Request metrics on /metrics (open to these addresses and staff users), and
+# a log of requests slower than SLOW_REQUEST_SECONDS with their SQL (0: off)
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "0"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"llm": {"handlers": ["console"], "level": "INFO"}},
+}
+
+# ``manage.py serve``: pre-forked workers serving ASGI_APPLICATION (or
+# WSGI_APPLICATION, SERVER_THREADS requests at a time per worker),
+# replaced after SERVER_MAX_REQUESTS (see llm.server)
+SERVER = {
+    "bind": os.getenv("SERVER_BIND", "127.0.0.1:8000"),
+    "interface": os.getenv("SERVER_INTERFACE", "asgi"),
+    "workers": int(os.getenv("SERVER_WORKERS", "2")),
+    "threads": int(os.getenv("SERVER_THREADS", "8")),
+    "max_requests": int(os.getenv("SERVER_MAX_REQUESTS", "1000")),
+    "graceful_timeout": float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "60")),
+}
+
+# What each virtual user of ``manage.py load_test`` does
+LOAD_TEST_SCENARIO = "core.loadtest.scenario"
+
+# Hot queries that ``manage.py check_query_plans`` EXPLAINs
+QUERY_PLAN_CHECKS = {
+    "dashboard history": "core.query_plans.dashboard_history",
+}
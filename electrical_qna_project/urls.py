@@ -1,8 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from llm.views import prometheus_metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("llm/", include("llm.urls")),
+    path("metrics", prometheus_metrics, name="metrics"),
     path("", include("core.urls")),
 ]
 
@@ -0,0 +1,132 @@
+"""
+Per-answer latency and token usage, and the aggregates behind the staff
+analytics pages.
+
+``from_completion()``, ``from_store()`` and ``from_shared()`` build the
+``AnswerUsage`` field values saved with each answer. The aggregates run as
+single ``GROUP BY`` queries: latency percentiles come from a histogram of
+fixed buckets, so they are reported as the bucket's upper bound rather
+than computed from every row.
+"""
+
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+
+from .models import AnswerUsage
+
+GENERATED_OUTCOMES = (AnswerUsage.GENERATED, AnswerUsage.TRUNCATED)
+
+# Upper bounds (ms) of the latency histogram; slower answers fall in the last
+LATENCY_BUCKETS_MS = (
+    100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 4000, 5000,
+    7500, 10000, 15000, 20000, 30000, 60000,
+)
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000)
+
+
+def from_completion(body, model, seconds, ttft_seconds=None):
+    """Usage fields for an answer generated from a chat completion ``body``.
+
+    ``body`` is the response JSON, or the final chunk of a stream (Groq
+    reports a stream's usage under ``x_groq``).
+    """
+    usage = body.get("usage") or (body.get("x_groq") or {}).get("usage") or {}
+    choices = body.get("choices") or [{}]
+    truncated = choices[0].get("finish_reason") == "length"
+    return {
+        "model": body.get("model") or model,
+        "outcome": AnswerUsage.TRUNCATED if truncated else AnswerUsage.GENERATED,
+        "latency_ms": _ms(seconds),
+        "ttft_ms": _ms(ttft_seconds),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+    }
+
+
+def from_store(model, outcome):
+    """Usage fields for an answer reused from the cache or a similar question."""
+    return {
+        "model": model,
+        "outcome": outcome,
+        "latency_ms": None,
+        "ttft_ms": None,
+        "prompt_tokens": None,
+        "completion_tokens": None,
+    }
+
+
+def from_shared(usage):
+    """Usage fields for a caller that reused another call's answer.
+
+    The generating call's tokens and latency are only counted once, on the
+    row of the caller that made it.
+    """
+    if usage.get("outcome") not in GENERATED_OUTCOMES:
+        return usage
+    return from_store(usage.get("model"), AnswerUsage.COALESCED)
+
+
+def _bucket(field):
+    return Case(
+        *[When(**{f"{field}__lte": bound}, then=Value(bound)) for bound in LATENCY_BUCKETS_MS],
+        default=Value(LATENCY_BUCKETS_MS[-1] + 1),
+        output_field=IntegerField(),
+    )
+
+
+def _percentile(histogram, total, fraction):
+    seen = 0
+    for bound, count in histogram:
+        seen += count
+        if seen >= fraction * total:
+            return bound
+    return None
+
+
+def latency_percentiles(queryset, group_by, field="latency_ms", percentiles=(50, 95)):
+    """Rows of ``group_by`` values with ``count`` and ``p<N>`` latencies (ms).
+
+    A value above the last bucket is reported as ``LATENCY_BUCKETS_MS[-1] + 1``.
+    """
+    rows = (
+        queryset.filter(**{f"{field}__isnull": False}).order_by()
+        .values(*group_by).annotate(bucket=_bucket(field), n=Count("pk"))
+        .values_list(*group_by, "bucket", "n")
+    )
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[:-2], []).append((row[-2], row[-1]))
+    results = []
+    for key, histogram in sorted(groups.items(), key=lambda item: [str(v) for v in item[0]]):
+        histogram.sort()
+        total = sum(count for _, count in histogram)
+        result = dict(zip(group_by, key), count=total)
+        for p in percentiles:
+            result[f"p{p}"] = _percentile(histogram, total, p / 100)
+        results.append(result)
+    return results
+
+
+def tokens_per_day(queryset, date_field="created_at"):
+    """Answers and prompt/completion tokens per day, newest day first."""
+    return list(
+        queryset.order_by()
+        .annotate(day=TruncDate(date_field)).values("day")
+        .annotate(
+            answers=Count("pk"),
+            generated=Count("pk", filter=Q(outcome__in=GENERATED_OUTCOMES)),
+            prompt_tokens=Sum("prompt_tokens"),
+            completion_tokens=Sum("completion_tokens"),
+        )
+        .order_by("-day")
+    )
+
+
+def outcome_counts(queryset):
+    """``{outcome: answers}``, e.g. to see the cache hit rate."""
+    return dict(
+        queryset.order_by().values("outcome").annotate(n=Count("pk")).values_list("outcome", "n")
+    )
@@ -0,0 +1,148 @@
+"""
+Circuit breakers for LLM API calls, one per model and process.
+
+After ``LLM_BREAKER_FAILURES`` failures in a row (timeouts, connection
+errors and 5xx responses) a model's breaker opens: calls to it raise
+``LLMUnavailable`` straight away for ``LLM_BREAKER_RESET_SECONDS`` instead
+of each waiting out its own timeout. Then it is half open and lets one
+trial call through; success closes it, another failure opens it again.
+
+Any answer from the API, including 4xx and 429 (which the rate limiter
+handles), counts as success. ``llm.routing`` sends complex questions to
+the small model while the large model's breaker is open.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from . import metrics
+from .exceptions import LLMUnavailable
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+OPENED = metrics.Counter(
+    "llm_circuit_breaker_opened_total", "Times a model's circuit breaker opened.", ("model",),
+)
+
+
+class CircuitBreaker:
+    def __init__(self, name, failures=None, reset_seconds=None):
+        self.name = name
+        self.threshold = failures or getattr(settings, "LLM_BREAKER_FAILURES", 5)
+        self.reset_seconds = (
+            getattr(settings, "LLM_BREAKER_RESET_SECONDS", 30)
+            if reset_seconds is None else reset_seconds
+        )
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_at = None
+
+    def _current(self, now):
+        if self._state == OPEN and now - self._opened_at >= self.reset_seconds:
+            self._state = HALF_OPEN
+            self._trial_at = None
+        return self._state
+
+    def is_open(self):
+        """True while calls are refused (a half open trial is let through)."""
+        with self._lock:
+            return self._current(time.monotonic()) == OPEN
+
+    def before(self):
+        """Raise ``LLMUnavailable`` unless a call may go ahead now."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current(now)
+            if state == CLOSED:
+                return
+            # A trial abandoned without an outcome (e.g. a closed stream)
+            # must not keep the breaker half open for good
+            if state == HALF_OPEN and (
+                self._trial_at is None or now - self._trial_at >= self.reset_seconds
+            ):
+                self._trial_at = now
+                return
+            retry_after = max(self._opened_at + self.reset_seconds - now, 1)
+        raise LLMUnavailable(
+            f"{self.name} failed {self.threshold} times in a row; not calling it "
+            f"for {retry_after:.0f}s",
+            retry_after=retry_after,
+        )
+
+    def success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit breaker for %s closed", self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_at = None
+
+    def failure(self):
+        now = time.monotonic()
+        with self._lock:
+            self._failures += 1
+            state = self._current(now)
+            if state == HALF_OPEN or (state == CLOSED and self._failures >= self.threshold):
+                logger.warning("Circuit breaker for %s opened after %s failures",
+                               self.name, self._failures)
+                OPENED.inc(model=self.name)
+                self._state = OPEN
+                self._opened_at = now
+                self._trial_at = None
+
+    def record(self, status_code):
+        """Count a response: 5xx is a failure, anything else a success."""
+        if status_code >= 500:
+            self.failure()
+        else:
+            self.success()
+
+    def state(self):
+        now = time.monotonic()
+        with self._lock:
+            state = self._current(now)
+            return {
+                "state": state,
+                "failures": self._failures,
+                "retry_after": (
+                    round(max(self._opened_at + self.reset_seconds - now, 0), 1)
+                    if state == OPEN else None
+                ),
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(model):
+    """The process' ``CircuitBreaker`` for ``model``."""
+    with _breakers_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker(model)
+        return _breakers[model]
+
+
+def states():
+    """``{model: state()}`` of every breaker used in this process."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state() for breaker in breakers}
+
+
+@metrics.collector
+def _breaker_metrics():
+    return [
+        ("llm_circuit_breaker_open", "gauge",
+         "1 while calls to the model fail fast.",
+         [({"model": model}, int(state["state"] == OPEN)) for model, state in states().items()]),
+    ]
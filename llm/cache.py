@@ -0,0 +1,144 @@
+"""
+DB-backed answer cache in front of the LLM call.
+
+Entries are keyed by the normalized question text plus the model, its
+``max_tokens`` budget and the system prompt, expire after
+``LLM_CACHE_TTL`` seconds and are evicted least recently used first once
+the table grows past ``LLM_CACHE_MAX_ENTRIES`` rows.
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from . import metrics
+from .models import CachedAnswer
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.]+$")
+
+
+def _enabled():
+    return getattr(settings, "LLM_CACHE_ENABLED", True)
+
+
+def _ttl():
+    return timedelta(seconds=getattr(settings, "LLM_CACHE_TTL", 7 * 24 * 3600))
+
+
+def _max_entries():
+    return getattr(settings, "LLM_CACHE_MAX_ENTRIES", 10000)
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def normalize_question(text):
+    """Lower-case, collapse whitespace and drop trailing punctuation."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return _TRAILING_PUNCT_RE.sub("", text)
+
+
+def make_key(question_text, model, max_tokens, system_prompt):
+    raw = "\x00".join(
+        [normalize_question(question_text), model, str(max_tokens), system_prompt]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cache_bypassed(request):
+    """True when the client asked to skip the cache for this request."""
+    if request.POST.get("no_cache") or request.GET.get("no_cache"):
+        return True
+    return "no-cache" in request.headers.get("Cache-Control", "")
+
+
+def get_cached_answer(question_text, model, max_tokens, system_prompt):
+    """Return the live ``CachedAnswer`` for the question, or ``None``."""
+    if not _enabled():
+        return None
+
+    key = make_key(question_text, model, max_tokens, system_prompt)
+    entry = CachedAnswer.objects.filter(key=key).first()
+    if entry is None:
+        _count("misses")
+        metrics.observe_cache_lookup("answer", hit=False)
+        return None
+
+    now = timezone.now()
+    if entry.created_at < now - _ttl():
+        entry.delete()
+        _count("misses")
+        metrics.observe_cache_lookup("answer", hit=False)
+        return None
+
+    CachedAnswer.objects.filter(pk=entry.pk).update(
+        hit_count=F("hit_count") + 1,
+        last_accessed_at=now,
+    )
+    _count("hits")
+    metrics.observe_cache_lookup("answer", hit=True)
+    return entry
+
+
+def store_answer(question_text, model, max_tokens, system_prompt, answer_text, source=""):
+    """Cache a successful answer and evict the least recently used overflow.
+
+    ``model`` is the one that wrote it, which may not be the one asked.
+    """
+    if not _enabled():
+        return None
+
+    now = timezone.now()
+    entry, _ = CachedAnswer.objects.update_or_create(
+        key=make_key(question_text, model, max_tokens, system_prompt),
+        defaults={
+            "question_text": question_text,
+            "answer_text": answer_text,
+            "model": model,
+            "source": source,
+            "hit_count": 0,
+            "created_at": now,
+            "last_accessed_at": now,
+        },
+    )
+    _count("stores")
+    _evict_overflow()
+    return entry
+
+
+def _evict_overflow():
+    max_entries = _max_entries()
+    if not max_entries:
+        return
+    cutoff = (
+        CachedAnswer.objects.order_by("-last_accessed_at")
+        .values_list("last_accessed_at", flat=True)[max_entries:max_entries + 1]
+    )
+    cutoff = list(cutoff)
+    if cutoff:
+        deleted, _ = CachedAnswer.objects.filter(
+            last_accessed_at__lte=cutoff[0]
+        ).delete()
+        _count("evictions", deleted)
+
+
+def stats():
+    """Process-local hit/miss counters plus the derived hit rate."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
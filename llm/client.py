@@ -0,0 +1,342 @@
+"""
+Shared HTTP client for the OpenAI-compatible Groq chat completions API.
+
+One ``LLMClient`` per process keeps a keep-alive connection pool, so repeat
+calls skip the TCP and TLS handshakes. Sync calls go through a
+``requests.Session``; async calls through one ``httpx.AsyncClient`` per
+event loop, closed with the loop. Connect and read timeouts are
+configured separately.
+
+Retries (with exponential backoff) only cover failures where the request
+never reached the model: connection establishment errors and 502/503
+responses from the gateway. Read timeouts and dropped responses are not
+retried, since Groq may already be generating (and billing) the answer.
+
+Every attempt also takes a slot from the process' ``RateLimiter`` (see
+``llm.ratelimit``). A 429 is always safe to repeat, so it is retried once
+the limiter's pause is over, until ``LLM_QUEUE_DEADLINE`` runs out.
+
+Latency and 429s are reported per model to ``llm.routing``, which moves
+complex questions off a slow or rate limited large model. Each model also
+has a circuit breaker (``llm.breaker``): once it has failed repeatedly,
+calls raise ``LLMUnavailable`` at once instead of waiting out timeouts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from . import metrics, routing
+from .breaker import get_breaker
+from .exceptions import (  # noqa: F401 (re-exported)
+    LLMConnectionError,
+    LLMError,
+    LLMStatusError,
+    LLMThrottled,
+    LLMTimeout,
+    LLMUnavailable,
+)
+from .ratelimit import get_limiter, queue_deadline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+RETRYABLE_STATUSES = frozenset({502, 503})
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _is_connect_failure(exc):
+    """True if ``exc`` happened before the request was sent."""
+    if isinstance(exc, (requests.exceptions.ConnectTimeout,
+                        httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def _failure(exc):
+    """Outcome label of a request that got no response."""
+    if isinstance(exc, (requests.exceptions.Timeout, httpx.TimeoutException)):
+        return "timeout"
+    return "connection_error"
+
+
+class LLMClient:
+    """Pooled, retrying client for chat completion requests."""
+
+    def __init__(self, api_url=None, api_key=None, pool_size=None,
+                 connect_timeout=None, read_timeout=None, max_retries=None,
+                 retry_backoff=None, limiter=None):
+        self.api_url = api_url or _setting("LLM_API_URL", DEFAULT_API_URL)
+        self.api_key = api_key
+        self.pool_size = pool_size or _setting("LLM_POOL_SIZE", 10)
+        self.connect_timeout = connect_timeout or _setting("LLM_CONNECT_TIMEOUT", 5)
+        self.read_timeout = read_timeout or _setting("LLM_READ_TIMEOUT", 30)
+        self.max_retries = (
+            _setting("LLM_MAX_RETRIES", 2) if max_retries is None else max_retries
+        )
+        self.retry_backoff = (
+            _setting("LLM_RETRY_BACKOFF", 0.5) if retry_backoff is None else retry_backoff
+        )
+        self.limiter = limiter or get_limiter()
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        # The running loop finalizes these on shutdown, closing the clients
+        self._async_closers = weakref.WeakKeyDictionary()
+
+    def _headers(self):
+        api_key = self.api_key or os.getenv("GROQ_API_KEY", "")
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _backoff(self, attempt):
+        return self.retry_backoff * (2 ** attempt)
+
+    def session(self):
+        """The process' pooled ``requests.Session`` (recreated after fork)."""
+        with self._lock:
+            if self._session is None or self._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_size,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._session_pid = os.getpid()
+            return self._session
+
+    async def async_client(self):
+        """The pooled ``httpx.AsyncClient`` for the running event loop.
+
+        It is closed when the loop shuts down its async generators (as
+        ``asyncio.run`` does), so the throwaway loops ``async_to_sync``
+        runs async views in under WSGI don't leak its connections.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                timeout=httpx.Timeout(
+                    connect=self.connect_timeout,
+                    read=self.read_timeout,
+                    write=self.read_timeout,
+                    pool=self.connect_timeout,
+                ),
+            )
+            self._async_clients[loop] = client
+            closer = self._close_with_loop(client)
+            await closer.__anext__()
+            self._async_closers[loop] = closer
+        return client
+
+    async def _close_with_loop(self, client):
+        try:
+            yield
+        finally:
+            loop = asyncio.get_running_loop()
+            self._async_clients.pop(loop, None)
+            self._async_closers.pop(loop, None)
+            await client.aclose()
+
+    def _send(self, payload, stream=False):
+        """POST ``payload``; a streamed response keeps its limiter slot.
+
+        The caller must ``self.limiter.release()`` once a streamed response
+        is consumed.
+        """
+        deadline = queue_deadline()
+        attempt = 0
+        while True:
+            last = attempt == self.max_retries
+            self.limiter.acquire(deadline)
+            started = time.perf_counter()
+            try:
+                response = self.session().post(
+                    self.api_url,
+                    headers=self._headers(),
+                    json=payload,
+                    timeout=(self.connect_timeout, self.read_timeout),
+                    stream=stream,
+                )
+            except requests.exceptions.RequestException as e:
+                self.limiter.release()
+                metrics.observe_llm_call(_failure(e), time.perf_counter() - started)
+                if _is_connect_failure(e) and not last:
+                    logger.warning("LLM connect failed (%s), retrying", e)
+                    time.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+                if isinstance(e, requests.exceptions.Timeout):
+                    routing.observe(payload.get("model"), time.perf_counter() - started)
+                    raise LLMTimeout(str(e)) from e
+                raise LLMConnectionError(str(e)) from e
+
+            metrics.observe_llm_call(response.status_code, time.perf_counter() - started)
+            self.limiter.observe(response.status_code, response.headers)
+            if response.status_code == 429:
+                routing.observe(payload.get("model"), throttled=True)
+                # acquire() waits out the pause, or raises LLMThrottled
+                self.limiter.release()
+                logger.warning("LLM API rate limited the request, queueing")
+                response.close()
+                continue
+            if response.status_code in RETRYABLE_STATUSES and not last:
+                self.limiter.release()
+                logger.warning("LLM API returned %s, retrying", response.status_code)
+                response.close()
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            if not stream:
+                self.limiter.release()
+            return response
+
+    def chat(self, payload):
+        """POST a chat completion and return the ``requests.Response``."""
+        breaker = get_breaker(payload.get("model"))
+        breaker.before()
+        started = time.perf_counter()
+        try:
+            response = self._send(payload)
+        except (LLMTimeout, LLMConnectionError):
+            breaker.failure()
+            raise
+        breaker.record(response.status_code)
+        if response.status_code == 200:
+            routing.observe(payload.get("model"), time.perf_counter() - started)
+        return response
+
+    def stream_chat(self, payload, stats=None):
+        """Yield parsed SSE chunks of a streamed chat completion.
+
+        Closing the generator early closes the upstream connection. If given,
+        the ``stats`` dict gets ``ttft_seconds`` (until the first content)
+        and ``seconds`` (until the last chunk) since the call.
+        """
+        breaker = get_breaker(payload.get("model"))
+        breaker.before()
+        started = time.perf_counter()
+        try:
+            response = self._send({**payload, "stream": True}, stream=True)
+        except (LLMTimeout, LLMConnectionError):
+            breaker.failure()
+            raise
+        try:
+            with response:
+                if response.status_code != 200:
+                    breaker.record(response.status_code)
+                    raise LLMStatusError(response.status_code, response.text)
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode("utf-8")
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if stats is not None:
+                        stats["seconds"] = time.perf_counter() - started
+                    if data == "[DONE]":
+                        breaker.success()
+                        routing.observe(payload.get("model"), time.perf_counter() - started)
+                        return
+                    chunk = json.loads(data)
+                    if stats is not None and "ttft_seconds" not in stats:
+                        delta = (chunk.get("choices") or [{}])[0].get("delta") or {}
+                        if delta.get("content"):
+                            stats["ttft_seconds"] = stats["seconds"]
+                    yield chunk
+        except requests.exceptions.RequestException:
+            # The connection dropped or stalled mid-answer
+            breaker.failure()
+            raise
+        finally:
+            self.limiter.release()
+
+    async def achat(self, payload):
+        """Async ``chat``; returns the ``httpx.Response``."""
+        breaker = get_breaker(payload.get("model"))
+        breaker.before()
+        try:
+            response = await self._asend(payload)
+        except (LLMTimeout, LLMConnectionError):
+            breaker.failure()
+            raise
+        breaker.record(response.status_code)
+        return response
+
+    async def _asend(self, payload):
+        client = await self.async_client()
+        deadline = queue_deadline()
+        called = time.perf_counter()
+        attempt = 0
+        while True:
+            last = attempt == self.max_retries
+            await self.limiter.aacquire(deadline)
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    self.api_url, headers=self._headers(), json=payload
+                )
+            except httpx.TransportError as e:
+                metrics.observe_llm_call(_failure(e), time.perf_counter() - started)
+                if _is_connect_failure(e) and not last:
+                    logger.warning("LLM connect failed (%s), retrying", e)
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+                if isinstance(e, httpx.TimeoutException):
+                    routing.observe(payload.get("model"), time.perf_counter() - started)
+                    raise LLMTimeout(str(e)) from e
+                raise LLMConnectionError(str(e)) from e
+            finally:
+                self.limiter.release()
+
+            metrics.observe_llm_call(response.status_code, time.perf_counter() - started)
+            self.limiter.observe(response.status_code, response.headers)
+            if response.status_code == 429:
+                routing.observe(payload.get("model"), throttled=True)
+                logger.warning("LLM API rate limited the request, queueing")
+                continue
+            if response.status_code in RETRYABLE_STATUSES and not last:
+                logger.warning("LLM API returned %s, retrying", response.status_code)
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            if response.status_code == 200:
+                routing.observe(payload.get("model"), time.perf_counter() - called)
+            return response
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide ``LLMClient`` configured from settings."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient()
+        return _client
@@ -0,0 +1,100 @@
+"""
+Named counters that replace ``COUNT(*)`` queries on hot pages.
+
+Signal handlers call ``increment()`` as rows are created and deleted; the
+deltas are applied once the surrounding transaction commits, so rolled
+back writes never count. Reading any set of counters is one lookup on the
+unique ``name`` index.
+
+Counters can drift (bulk operations skip signals, and a crash can lose an
+on-commit update), so ``manage.py reconcile_counters`` periodically
+replaces them with the exact totals from ``COUNTER_RECOUNT``.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils.module_loading import import_string
+
+from .models import Counter
+
+logger = logging.getLogger(__name__)
+
+
+def _apply(deltas):
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        if Counter.objects.filter(name=name).update(value=F("value") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                Counter.objects.create(name=name, value=delta)
+        except IntegrityError:  # created concurrently
+            Counter.objects.filter(name=name).update(value=F("value") + delta)
+
+
+def increment(deltas):
+    """Add ``{name: delta}`` to the counters when the transaction commits."""
+    transaction.on_commit(lambda: _apply(deltas))
+
+
+def read(names=(), prefixes=()):
+    """Return ``{name: value}`` for ``names`` and any name under ``prefixes``.
+
+    Counters that don't exist yet read as 0 (``names`` only).
+    """
+    condition = Q(name__in=list(names))
+    for prefix in prefixes:
+        condition |= Q(name__startswith=prefix)
+    values = dict.fromkeys(names, 0)
+    values.update(Counter.objects.filter(condition).values_list("name", "value"))
+    return values
+
+
+def recount():
+    """Exact ``{name: value}`` totals from the ``COUNTER_RECOUNT`` callable(s)."""
+    paths = settings.COUNTER_RECOUNT
+    if isinstance(paths, str):
+        paths = [paths]
+    values = {}
+    for path in paths:
+        values.update(import_string(path)())
+    return values
+
+
+@transaction.atomic
+def reconcile(values, dry_run=False):
+    """Make the counter table equal ``values``; return ``{name: (old, new)}``.
+
+    Counters missing from ``values`` are dropped (silently if already 0).
+    """
+    current = dict(
+        Counter.objects.select_for_update().values_list("name", "value")
+    )
+    emptied = [n for n, v in current.items() if v == 0 and n not in values]
+    if emptied and not dry_run:
+        Counter.objects.filter(name__in=emptied).delete()
+    for name in emptied:
+        del current[name]
+    drift = {
+        name: (current.get(name), values.get(name))
+        for name in current.keys() | values.keys()
+        if current.get(name) != values.get(name)
+    }
+    if dry_run or not drift:
+        return drift
+
+    stale = [name for name, (old, new) in drift.items() if new is None]
+    Counter.objects.filter(name__in=stale).delete()
+    for name, (old, new) in drift.items():
+        if new is None:
+            continue
+        if old is None:
+            Counter.objects.create(name=name, value=new)
+        else:
+            Counter.objects.filter(name=name).update(value=new)
+    logger.info("Reconciled %d drifted counter(s)", len(drift))
+    return drift
@@ -0,0 +1,36 @@
+class LLMError(Exception):
+    """The LLM API could not be reached or returned an unusable reply."""
+
+
+class LLMTimeout(LLMError):
+    pass
+
+
+class LLMConnectionError(LLMError):
+    pass
+
+
+class LLMStatusError(LLMError):
+    """The LLM API answered with a non-200 status."""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"Error: {status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+class LLMThrottled(LLMError):
+    """Rate limited for longer than the caller's queueing deadline."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMUnavailable(LLMError):
+    """The model's circuit breaker is open: it failed repeatedly, so it is
+    not being called until ``retry_after`` seconds have passed."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,131 @@
+"""
+Hedged chat completion calls.
+
+With ``LLM_HEDGE_ENABLED``, a call still unanswered after its model's
+recent ``LLM_HEDGE_PERCENTILE`` latency (at least ``LLM_HEDGE_MIN_SECONDS``)
+gets a second, identical call to the other ``LLM_ROUTING`` model. The first
+successful response wins; the other call is cancelled (async) or its
+response discarded (sync). Only the slowest few percent of calls are
+hedged, so the extra load stays small while tail latency drops.
+
+Calls are not hedged until the model has ``MIN_SAMPLES`` recent latencies,
+and streamed answers are never hedged. The answering model is in the
+response body (``model``), which ``llm.analytics`` records.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout, as_completed
+
+from django.conf import settings
+
+from . import metrics, routing
+from .exceptions import LLMError
+
+logger = logging.getLogger(__name__)
+
+MIN_SAMPLES = 20
+
+HEDGES = metrics.Counter(
+    "llm_hedged_requests_total", "Calls hedged with a second model, by which answered first.",
+    ("model", "alternate", "winner"),
+)
+
+
+def _plan(model):
+    """``(seconds to wait, alternate model)``, or ``(None, None)`` to not hedge."""
+    if not getattr(settings, "LLM_HEDGE_ENABLED", False):
+        return None, None
+    alternate = routing.alternate(model)
+    delay = routing.health.percentile(
+        model, getattr(settings, "LLM_HEDGE_PERCENTILE", 95), MIN_SAMPLES
+    )
+    if alternate is None or delay is None:
+        return None, None
+    return max(delay, getattr(settings, "LLM_HEDGE_MIN_SECONDS", 2)), alternate
+
+
+def _in_thread(call, payload):
+    """Run ``call(payload)`` in a new thread; return its ``Future``.
+
+    Not a pool: a hedged call must never queue behind other callers.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(call(payload))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-hedge", daemon=True).start()
+    return future
+
+
+def _discard(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+def _succeeded(response):
+    return response.status_code == 200
+
+
+def hedged_chat(client, payload):
+    """``client.chat(payload)``, hedged with the alternate model if slow."""
+    model = payload.get("model")
+    delay, alternate = _plan(model)
+    if delay is None:
+        return client.chat(payload)
+
+    primary = _in_thread(client.chat, payload)
+    try:
+        return primary.result(timeout=delay)
+    except FutureTimeout:
+        pass
+    logger.info("No answer from %s after %.1fs, hedging with %s", model, delay, alternate)
+    backup = _in_thread(client.chat, {**payload, "model": alternate})
+    calls = {primary: model, backup: alternate}
+    for future in as_completed(calls):
+        try:
+            response = future.result()
+        except LLMError:
+            continue
+        if _succeeded(response):
+            other = backup if future is primary else primary
+            other.add_done_callback(_discard)
+            HEDGES.inc(model=model, alternate=alternate,
+                       winner="primary" if future is primary else "hedge")
+            return response
+    # Both failed: report the original call's outcome
+    return primary.result()
+
+
+async def ahedged_chat(client, payload):
+    """Async ``hedged_chat``; the losing call is cancelled."""
+    model = payload.get("model")
+    delay, alternate = _plan(model)
+    if delay is None:
+        return await client.achat(payload)
+
+    primary = asyncio.ensure_future(client.achat(payload))
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return primary.result()
+        logger.info("No answer from %s after %.1fs, hedging with %s", model, delay, alternate)
+        backup = asyncio.ensure_future(client.achat({**payload, "model": alternate}))
+        pending.add(backup)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and _succeeded(task.result()):
+                    HEDGES.inc(model=model, alternate=alternate,
+                               winner="primary" if task is primary else "hedge")
+                    return task.result()
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,186 @@
+"""
+DB-backed background job queue.
+
+Jobs are rows in ``llm_job``; ``manage.py run_worker`` claims them and calls
+the handler registered for their ``kind`` in ``LLM_JOB_HANDLERS``.
+
+* Claiming is an optimistic conditional UPDATE, so any number of workers
+  (threads or processes, on any backend) can poll the same table.
+* A claimed job is invisible to other workers until ``locked_until``
+  (``LLM_JOB_VISIBILITY_TIMEOUT``), which its worker keeps pushing back
+  while the handler runs, however long an LLM call takes. If the worker
+  dies, the job becomes claimable again once that passes, which is the
+  crash recovery.
+* A handler that raises is retried with exponential backoff until
+  ``max_attempts`` is reached, then marked failed. A handler that raises
+  ``RetryLater`` (e.g. while the LLM circuit breaker is open) runs again
+  after its delay, and that attempt is not counted.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connections
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class RetryLater(Exception):
+    """Run the job again in ``delay`` seconds, without using up an attempt."""
+
+    def __init__(self, delay, reason=""):
+        super().__init__(reason or f"retry in {delay:.0f}s")
+        self.delay = delay
+
+
+def _visibility_timeout():
+    return timedelta(seconds=getattr(settings, "LLM_JOB_VISIBILITY_TIMEOUT", 120))
+
+
+def _retry_delay(attempts):
+    base = getattr(settings, "LLM_JOB_RETRY_BACKOFF", 5)
+    return timedelta(seconds=base * (2 ** (attempts - 1)))
+
+
+def _handler(kind):
+    return import_string(getattr(settings, "LLM_JOB_HANDLERS", {})[kind])
+
+
+class _Lease:
+    """Extends a running job's ``locked_until`` every third of the
+    visibility timeout, from a thread, until the block exits."""
+
+    def __init__(self, job):
+        self.job = job
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, name=f"llm-job-lease-{job.pk}", daemon=True
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def _run(self):
+        interval = _visibility_timeout().total_seconds() / 3
+        try:
+            while not self.stopped.wait(interval):
+                extended = Job.objects.filter(
+                    pk=self.job.pk, status=Job.RUNNING, locked_by=self.job.locked_by
+                ).update(locked_until=timezone.now() + _visibility_timeout())
+                if not extended:
+                    logger.warning("Job %s lost its lease; another worker may run it", self.job)
+                    return
+        except DatabaseError as e:
+            logger.warning("Can't extend the lease of job %s: %s", self.job, e)
+        finally:
+            connections.close_all()  # this thread's
+
+
+def enqueue(kind, payload, key="", delay=0, max_attempts=None):
+    """Queue a job for the workers and return it."""
+    return Job.objects.create(
+        kind=kind,
+        key=key,
+        payload=payload,
+        max_attempts=max_attempts or getattr(settings, "LLM_JOB_MAX_ATTEMPTS", 3),
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+async def aenqueue(kind, payload, key="", delay=0, max_attempts=None):
+    return await Job.objects.acreate(
+        kind=kind,
+        key=key,
+        payload=payload,
+        max_attempts=max_attempts or getattr(settings, "LLM_JOB_MAX_ATTEMPTS", 3),
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def latest_job(key):
+    return Job.objects.filter(key=key).order_by("-pk").first()
+
+
+def claim(worker_id, limit):
+    """Claim up to ``limit`` runnable jobs for ``worker_id``; return their ids."""
+    now = timezone.now()
+    runnable = (
+        Q(status=Job.PENDING, available_at__lte=now)
+        | Q(status=Job.RUNNING, locked_until__lt=now)  # worker died mid-job
+    )
+    candidates = (
+        Job.objects.filter(runnable)
+        .order_by("available_at")
+        .values_list("pk", "status", "locked_until")[:limit * 2]
+    )
+    claimed = []
+    for pk, status, locked_until in candidates:
+        if len(claimed) >= limit:
+            break
+        updated = Job.objects.filter(
+            pk=pk, status=status, locked_until=locked_until
+        ).update(
+            status=Job.RUNNING,
+            locked_by=worker_id,
+            locked_until=now + _visibility_timeout(),
+            attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def run_job(pk):
+    """Run one claimed job and record the outcome."""
+    close_old_connections()
+    job = Job.objects.get(pk=pk)
+    if job.attempts > job.max_attempts:
+        Job.objects.filter(pk=pk).update(
+            status=Job.FAILED, locked_until=None,
+            last_error=job.last_error or "Worker lost the job too many times",
+        )
+        return Job.FAILED
+
+    try:
+        with _Lease(job):
+            _handler(job.kind)(job)
+    except RetryLater as e:
+        logger.info("Job %s postponed by %.0fs: %s", job, e.delay, e)
+        Job.objects.filter(pk=pk).update(
+            status=Job.PENDING,
+            available_at=timezone.now() + timedelta(seconds=e.delay),
+            attempts=F("attempts") - 1,
+            locked_until=None,
+            last_error=f"Postponed: {e}",
+        )
+        return Job.PENDING
+    except Exception as e:
+        logger.exception("Job %s failed (attempt %s/%s)",
+                         job, job.attempts, job.max_attempts)
+        if job.is_last_attempt:
+            status, available_at = Job.FAILED, job.available_at
+        else:
+            status = Job.PENDING
+            available_at = timezone.now() + _retry_delay(job.attempts)
+        Job.objects.filter(pk=pk).update(
+            status=status,
+            available_at=available_at,
+            locked_until=None,
+            last_error=f"{type(e).__name__}: {e}",
+        )
+        return status
+
+    Job.objects.filter(pk=pk).update(status=Job.DONE, locked_until=None)
+    return Job.DONE
@@ -0,0 +1,281 @@
+"""
+Load-test harness for ``manage.py load_test``.
+
+Virtual users run the project's ``LOAD_TEST_SCENARIO`` in a loop, each
+with its own HTTP session, against either a live server or the project's
+WSGI application served in-process (with the LLM pointed at a local
+``MockLLMServer``). Every request is timed and recorded under a step name;
+in-process runs also count the SQL queries each request makes, which the
+server reports in an ``X-Query-Count`` header.
+
+``summarize()`` turns the records into a JSON-serializable report
+(throughput, p50/p95/p99 latency, queries per request and error rate per
+step) and ``compare()`` checks a report against a stored baseline.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import requests
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+
+from .seeding import CATEGORIES, question_text
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+_CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Recorder:
+    """Thread-safe store of ``(step, seconds, status, queries)`` records."""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, step, seconds, status, queries):
+        with self._lock:
+            self.records.append((step, seconds, status, queries))
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+
+
+class VirtualUser:
+    """One simulated visitor with its own cookies, as scenarios see it."""
+
+    def __init__(self, number, base_url, recorder, username, password, timeout=60):
+        self.number = number
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.iteration = 0
+        self.session = requests.Session()
+        self.rng = random.Random(number)
+
+    @property
+    def logged_in(self):
+        return "sessionid" in self.session.cookies
+
+    def question(self):
+        """``(category, text)`` of a generated question; some repeat."""
+        category, _, subjects = self.rng.choices(
+            CATEGORIES, [weight for _, weight, _ in CATEGORIES]
+        )[0]
+        return category, question_text(self.rng, subjects)
+
+    def request(self, step, method, path, **kwargs):
+        """Send a request and record it under ``step``; returns the response.
+
+        Connection failures are recorded as status 0 and return ``None``.
+        Responses of 400 and up count as errors.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("allow_redirects", False)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, **kwargs)
+        except requests.RequestException:
+            self.recorder.add(step, time.perf_counter() - started, 0, None)
+            return None
+        queries = response.headers.get(QUERY_COUNT_HEADER)
+        self.recorder.add(
+            step, time.perf_counter() - started, response.status_code,
+            int(queries) if queries is not None else None,
+        )
+        return response
+
+    def get(self, step, path, **kwargs):
+        return self.request(step, "GET", path, **kwargs)
+
+    def post(self, step, path, data=None, **kwargs):
+        """POST with the session's CSRF token, as a form or AJAX call would."""
+        token = self.session.cookies.get("csrftoken", "")
+        headers = {"X-CSRFToken": token, "Referer": self.base_url + path}
+        headers.update(kwargs.pop("headers", {}))
+        return self.request(step, "POST", path, data=data, headers=headers, **kwargs)
+
+    def login(self, path="/login/", step="login"):
+        """Log in through the login form; True on success."""
+        page = self.get(f"{step} form", path)
+        if page is None:
+            return False
+        match = _CSRF_RE.search(page.text)
+        response = self.post(step, path, {
+            "username": self.username,
+            "password": self.password,
+            "csrfmiddlewaretoken": match.group(1) if match else "",
+        })
+        return response is not None and response.status_code == 302
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _stats(records, elapsed):
+    seconds = sorted(r[1] for r in records)
+    errors = sum(1 for r in records if r[2] == 0 or r[2] >= 400)
+    queries = [r[3] for r in records if r[3] is not None]
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        "requests": len(records),
+        "throughput": round(len(records) / elapsed, 2),
+        "error_rate": round(errors / len(records), 4),
+        "p50_ms": ms(_percentile(seconds, 0.50)),
+        "p95_ms": ms(_percentile(seconds, 0.95)),
+        "p99_ms": ms(_percentile(seconds, 0.99)),
+        "mean_ms": ms(sum(seconds) / len(seconds)),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+
+
+def summarize(records, elapsed, **meta):
+    """The JSON-serializable report for ``records`` gathered in ``elapsed`` s."""
+    by_step = defaultdict(list)
+    for record in records:
+        by_step[record[0]].append(record)
+    return {
+        **meta,
+        "elapsed_s": round(elapsed, 2),
+        "total": _stats(records, elapsed) if records else None,
+        "steps": {step: _stats(rows, elapsed) for step, rows in sorted(by_step.items())},
+    }
+
+
+def compare(report, baseline, tolerance=0.2):
+    """Regressions of ``report`` against ``baseline``, as messages.
+
+    Latency percentiles may grow and throughput may drop by ``tolerance``
+    (a fraction); error rates may grow by at most one percentage point;
+    a step's most queries per request, being deterministic, may not grow
+    at all.
+    """
+    problems = []
+    pairs = [("total", report.get("total"), baseline.get("total"))]
+    pairs += [
+        (step, stats, baseline.get("steps", {}).get(step))
+        for step, stats in report.get("steps", {}).items()
+    ]
+    for name, current, before in pairs:
+        if not current or not before:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if before[key] and current[key] > before[key] * (1 + tolerance):
+                problems.append(f"{name}: {key} {before[key]} -> {current[key]}")
+        if name == "total" and current["throughput"] < before["throughput"] * (1 - tolerance):
+            problems.append(
+                f"{name}: throughput {before['throughput']} -> {current['throughput']} req/s"
+            )
+        if current["error_rate"] > before["error_rate"] + 0.01:
+            problems.append(f"{name}: error rate {before['error_rate']} -> {current['error_rate']}")
+        if (name != "total" and current["max_queries"] is not None
+                and before["max_queries"] is not None
+                and current["max_queries"] > before["max_queries"]):
+            problems.append(
+                f"{name}: max queries/request {before['max_queries']} -> {current['max_queries']}"
+            )
+    return problems
+
+
+def _counting_queries(application):
+    """Wrap a WSGI app to report each request's query count in a header."""
+
+    def app(environ, start_response):
+        count = [0]
+
+        def counter(execute, sql, params, many, context):
+            count[0] += 1
+            return execute(sql, params, many, context)
+
+        def counted_start_response(status, headers, exc_info=None):
+            return start_response(
+                status, headers + [(QUERY_COUNT_HEADER, str(count[0]))], exc_info
+            )
+
+        # Connections are per thread, and sync code for this request
+        # (including an async view's sync_to_async calls) runs on this thread
+        wrappers = [connections[alias].execute_wrapper(counter) for alias in connections]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            return application(environ, counted_start_response)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+
+    return app
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serve_in_process(host="127.0.0.1"):
+    """Serve the project's WSGI app from a background thread; yields its URL.
+
+    The status line is sent once the view returns, so every query the
+    view makes is counted before the header goes out.
+    """
+    server = ThreadedWSGIServer((host, 0), _QuietHandler, allow_reuse_address=False)
+    server.daemon_threads = True
+    server.set_app(_counting_queries(get_wsgi_application()))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run(scenario, base_url, users, duration, username, password, think_time=0.0,
+        warm_up=0.0):
+    """Run ``scenario(vu)`` in a loop on ``users`` threads for ``duration`` s.
+
+    ``username`` is a format string taking the virtual user's number
+    (``"user{}"``). A scenario returns ``False`` to stop its user, e.g. when
+    it can't log in. Requests in the first ``warm_up`` seconds (cold caches,
+    first logins) aren't recorded. Returns ``(records, elapsed, stopped_users)``.
+    """
+    recorder = Recorder()
+    deadline = time.monotonic() + warm_up + duration
+    stopped = []
+
+    def worker(number):
+        vu = VirtualUser(number, base_url, recorder, username.format(number), password)
+        while time.monotonic() < deadline:
+            if scenario(vu) is False:
+                stopped.append(number)
+                return
+            vu.iteration += 1
+            if think_time:
+                time.sleep(think_time)
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True)
+               for n in range(1, users + 1)]
+    for thread in threads:
+        thread.start()
+    if warm_up:
+        time.sleep(warm_up)
+        recorder.reset()
+    started = time.monotonic()
+    for thread in threads:
+        thread.join()
+    return recorder.records, time.monotonic() - started, len(stopped)
@@ -0,0 +1,76 @@
+import statistics
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+
+from llm.client import LLMClient
+from llm.mockserver import MockLLMServer
+from llm.ratelimit import RateLimiter
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-call overhead of a bare requests.post against the pooled "
+        "LLM client. Uses a local stand-in server unless --url is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--calls", type=int, default=200)
+        parser.add_argument(
+            "--url",
+            help="Chat completions URL to hit instead of the local server "
+                 "(an https URL also measures the TLS handshake)",
+        )
+
+    def _time_calls(self, call, calls):
+        call()  # warm-up
+        timings = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f"{label:<14} mean {statistics.mean(timings):7.2f} ms   "
+            f"p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms"
+        )
+        return statistics.mean(timings)
+
+    def handle(self, *args, **options):
+        server = None
+        url = options["url"]
+        if not url:
+            server = MockLLMServer().start()
+            url = server.url
+
+        payload = {
+            "model": "llama3-8b-8192",
+            "messages": [{"role": "user", "content": "What does a rotor do?"}],
+            "max_tokens": 1,
+        }
+        # Measure connection reuse, not the configured client-side rate limit
+        client = LLMClient(api_url=url, limiter=RateLimiter(0, 1, 0))
+        headers = client._headers()
+
+        try:
+            bare = self._time_calls(
+                lambda: requests.post(url, headers=headers, json=payload, timeout=30),
+                options["calls"],
+            )
+            pooled = self._time_calls(lambda: client.chat(payload), options["calls"])
+        finally:
+            if server is not None:
+                server.shutdown()
+
+        self.stdout.write(f"{options['calls']} calls against {url}")
+        bare_mean = self._report("requests.post", bare)
+        pooled_mean = self._report("LLMClient", pooled)
+        self.stdout.write(self.style.SUCCESS(
+            f"Pooling saves {bare_mean - pooled_mean:.2f} ms per call "
+            f"({(1 - pooled_mean / bare_mean) * 100:.0f}%)."
+        ))
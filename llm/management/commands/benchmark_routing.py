@@ -0,0 +1,131 @@
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from llm import routing
+from llm.client import LLMClient
+from llm.mockserver import MockLLMServer, parse_faults, parse_model_speeds
+from llm.ratelimit import RateLimiter
+from llm.seeding import CATEGORIES, question_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Answer the same generated questions with the large model and a fixed "
+        "max_tokens, then as routed by LLM_ROUTING, against a local mock LLM "
+        "where the small model is faster, and compare latency and tokens."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--questions", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--fixed-max-tokens", type=int, default=500,
+                            help="max_tokens of every call without routing")
+        parser.add_argument("--small-speed", default="lognormal:0.15,0.3@0.0015",
+                            help="Mock latency of the small model, DIST[@SECONDS] "
+                                 "(see run_mock_llm --model-speed)")
+        parser.add_argument("--large-speed", default="lognormal:0.4,0.3@0.004",
+                            help="Mock latency of the large model")
+        parser.add_argument("--fail", action="append", metavar="KIND=P",
+                            help="Mock LLM fault injection (see run_mock_llm)")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def _questions(self, count, seed):
+        rng = random.Random(seed)
+        weights = [weight for _, weight, _ in CATEGORIES]
+        questions = []
+        for _ in range(count):
+            category, _, subjects = rng.choices(CATEGORIES, weights)[0]
+            questions.append((question_text(rng, subjects), category))
+        return questions
+
+    def _run(self, client, questions, choose, concurrency):
+        """``[(model, seconds, completion_tokens)]``, or ``None`` for failures."""
+        def call(item):
+            model, max_tokens = choose(*item)
+            payload = {
+                "model": model,
+                "messages": [{"role": "user", "content": item[0]}],
+                "max_tokens": max_tokens,
+            }
+            started = time.perf_counter()
+            try:
+                response = client.chat(payload)
+            except Exception:
+                return None
+            seconds = time.perf_counter() - started
+            if response.status_code != 200:
+                return None
+            return model, seconds, response.json()["usage"]["completion_tokens"]
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            return list(pool.map(call, questions))
+
+    def _report(self, label, results):
+        done = [result for result in results if result is not None]
+        if not done:
+            raise CommandError(f"Every {label} call failed")
+        timings = sorted(seconds * 1000 for _, seconds, _ in done)
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        models = Counter(model for model, _, _ in done)
+        self.stdout.write(
+            f"{label:<7} mean {statistics.mean(timings):7.1f} ms   "
+            f"p50 {statistics.median(timings):7.1f} ms   p95 {p95:7.1f} ms   "
+            f"tokens {statistics.mean(tokens for _, _, tokens in done):6.1f}   "
+            f"failed {len(results) - len(done)}"
+        )
+        self.stdout.write("        " + ", ".join(
+            f"{model}: {n}" for model, n in models.most_common()
+        ))
+        return statistics.mean(timings)
+
+    def handle(self, *args, **options):
+        config = routing._config()
+        try:
+            server = MockLLMServer(
+                faults=parse_faults(options["fail"]),
+                seed=options["seed"],
+                model_speeds=parse_model_speeds([
+                    f"{config['small']}={options['small_speed']}",
+                    f"{config['large']}={options['large_speed']}",
+                ]),
+            ).start()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Measure the models, not the configured client-side rate limit
+        client = LLMClient(api_url=server.url, limiter=RateLimiter(0, 1, 0))
+        questions = self._questions(options["questions"], options["seed"])
+        tiers = Counter(routing.classify(question)[0] for question, _ in questions)
+        try:
+            fixed = self._run(
+                client, questions,
+                lambda question, category: (config["large"], options["fixed_max_tokens"]),
+                options["concurrency"],
+            )
+            routing.health.reset()
+
+            def routed(question, category):
+                chosen = routing.route(question, category)
+                return chosen.model, chosen.max_tokens
+
+            routed_results = self._run(client, questions, routed, options["concurrency"])
+        finally:
+            routing.health.reset()
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(
+            f"{len(questions)} questions ({tiers[routing.SIMPLE]} simple, "
+            f"{tiers[routing.COMPLEX]} complex), {options['concurrency']} at a time"
+        )
+        fixed_mean = self._report("fixed", fixed)
+        routed_mean = self._report("routed", routed_results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Routing changes mean latency by {routed_mean - fixed_mean:+.1f} ms "
+            f"({(routed_mean / fixed_mean - 1) * 100:+.0f}%)."
+        ))
@@ -0,0 +1,74 @@
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from llm import startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cold start of a fresh process (django.setup(), a job "
+        "worker, a web worker) with python -X importtime: median wall and "
+        "import time, and the packages that take longest to import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", action="append", choices=sorted(startup.SCENARIOS),
+                            help="Scenario to run (repeatable; default: all)")
+        parser.add_argument("--runs", type=int, default=5,
+                            help="Processes per scenario; the median is reported")
+        parser.add_argument("--top", type=int, default=8,
+                            help="Packages to list per scenario")
+        parser.add_argument("--output", help="Write the JSON report here")
+        parser.add_argument("--baseline",
+                            help="JSON report to compare against; fails on regressions")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Allowed relative wall/import time growth")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Can't read baseline {options['baseline']}: {e}")
+
+        report = {
+            "python": sys.version.split()[0],
+            "settings": settings.SETTINGS_MODULE,
+            "runs": options["runs"],
+            "scenarios": {},
+        }
+        for name in options["scenario"] or startup.SCENARIOS:
+            try:
+                report["scenarios"][name] = startup.measure(
+                    startup.SCENARIOS[name], settings.SETTINGS_MODULE,
+                    options["runs"], options["top"],
+                )
+            except RuntimeError as e:
+                raise CommandError(f"Scenario {name} failed: {e}")
+            self._print_scenario(name, report["scenarios"][name])
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(json.dumps(report, indent=2) + "\n")
+
+        if baseline is not None:
+            problems = startup.compare(report, baseline, options["tolerance"])
+            for problem in problems:
+                self.stderr.write(problem)
+            if problems:
+                raise CommandError(f"{len(problems)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+
+    def _print_scenario(self, name, stats):
+        self.stdout.write(
+            f"{name:<8} wall {stats['wall_ms']:7.1f} ms   imports {stats['import_ms']:7.1f} ms   "
+            f"{stats['modules']} modules"
+        )
+        self.stdout.write("         " + ", ".join(
+            f"{package} {ms:.1f}" for package, ms in stats["top_packages"].items()
+        ))
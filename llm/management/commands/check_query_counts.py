@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+
+class Command(BaseCommand):
+    help = (
+        "Render pages and fail if any runs more SQL queries than its budget "
+        "in QUERY_COUNT_BUDGETS. Run it against a seeded database: an N+1 "
+        "loop only shows up once a page has rows to loop over."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--budget", action="append", default=[], metavar="PATH=N",
+            help="Check PATH against N queries (repeatable; overrides the setting)",
+        )
+        parser.add_argument("--user", help="Log in as this username first")
+        parser.add_argument("--show-sql", action="store_true",
+                            help="Print the queries of pages over budget")
+
+    def _budgets(self, options):
+        budgets = dict(getattr(settings, "QUERY_COUNT_BUDGETS", {}))
+        for item in options["budget"]:
+            path, sep, limit = item.rpartition("=")
+            if not sep or not limit.isdigit():
+                raise CommandError(f"Expected PATH=N, got {item!r}")
+            budgets[path] = int(limit)
+        if not budgets:
+            raise CommandError("No pages to check: set QUERY_COUNT_BUDGETS or pass --budget")
+        return budgets
+
+    def _check(self, client, path, budget, options, over):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(path)
+        count = len(queries)
+        ok = count <= budget
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(
+            f"{path:<40} {response.status_code}  {count:>3} queries (budget {budget})"
+        ))
+        if not ok:
+            over.append(path)
+            if options["show_sql"]:
+                for query in queries.captured_queries:
+                    self.stdout.write(f"    {query['sql']}")
+        return response
+
+    def handle(self, *args, **options):
+        budgets = self._budgets(options)
+        setup_test_environment()
+        try:
+            client = Client(raise_request_exception=True)
+            if options["user"]:
+                user = get_user_model().objects.filter(username=options["user"]).first()
+                if user is None:
+                    raise CommandError(f"No user named {options['user']!r}")
+                client.force_login(user)
+
+            over = []
+            for path, budget in budgets.items():
+                response = self._check(client, path, budget, options, over)
+                # A keyset-paginated page must cost the same on the next page
+                page = response.context and response.context.get("page")
+                if getattr(page, "next_cursor", None):
+                    self._check(client, f"{path}?cursor={page.next_cursor}",
+                                budget, options, over)
+        finally:
+            teardown_test_environment()
+
+        if over:
+            raise CommandError(f"{len(over)} page(s) over their query budget")
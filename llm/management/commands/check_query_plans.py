@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.module_loading import import_string
+
+
+def _mysql_problems(cursor, sql, params):
+    cursor.execute(f"EXPLAIN {sql}", params)
+    columns = [col[0].lower() for col in cursor.description]
+    plan, problems = [], []
+    for row in cursor.fetchall():
+        step = dict(zip(columns, row))
+        plan.append(
+            f"{step['table']}: type={step['type']} key={step['key']} {step.get('extra') or ''}"
+        )
+        if step["type"] == "ALL":
+            problems.append(f"full table scan of {step['table']}")
+        if "filesort" in (step.get("extra") or ""):
+            problems.append(f"filesort on {step['table']}")
+    return plan, problems
+
+
+def _sqlite_problems(cursor, sql, params):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    plan, problems = [], []
+    for row in cursor.fetchall():
+        detail = row[-1]
+        plan.append(detail)
+        if detail.startswith("SCAN") and "USING" not in detail:
+            problems.append(f"full table scan ({detail})")
+        if "TEMP B-TREE" in detail:
+            problems.append(f"sort without an index ({detail})")
+    return plan, problems
+
+
+PLANNERS = {
+    "mysql": _mysql_problems,
+    "sqlite": _sqlite_problems,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN each hot query in QUERY_PLAN_CHECKS and fail if any does a "
+        "full table scan or sorts without an index (MySQL and SQLite)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        checks = getattr(settings, "QUERY_PLAN_CHECKS", {})
+        if not checks:
+            raise CommandError("No queries to check: set QUERY_PLAN_CHECKS")
+        connection = connections[options["database"]]
+        planner = PLANNERS.get(connection.vendor)
+        if planner is None:
+            raise CommandError(f"Plans can't be checked on {connection.vendor}")
+
+        failed = []
+        with connection.cursor() as cursor:
+            for label, path in checks.items():
+                queryset = import_string(path)().using(options["database"])
+                sql, params = queryset.query.sql_with_params()
+                plan, problems = planner(cursor, sql, params)
+                style = self.style.ERROR if problems else self.style.SUCCESS
+                self.stdout.write(style(f"{label}: {'; '.join(problems) or 'uses indexes'}"))
+                for line in plan:
+                    self.stdout.write(f"    {line}")
+                if problems:
+                    failed.append(label)
+
+        if failed:
+            raise CommandError(f"{len(failed)} hot query(ies) not served by an index")
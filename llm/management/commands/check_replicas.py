@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from llm import replicas
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how far each of DATABASE_REPLICAS is behind the primary and "
+        "fail if any is unreachable or more than REPLICA_MAX_LAG_SECONDS behind."
+    )
+
+    def handle(self, *args, **options):
+        aliases = replicas.replicas()
+        if not aliases:
+            raise CommandError("No replicas configured: set DATABASE_REPLICAS")
+        max_lag = replicas.max_lag()
+        try:
+            now = replicas.beat()
+        except DatabaseError as e:
+            raise CommandError(f"Can't write the heartbeat on the primary: {e}")
+        unusable = []
+        for alias in aliases:
+            try:
+                lag = replicas.replica_lag(alias, now)
+            except DatabaseError as e:
+                lag, reason = None, str(e)
+            else:
+                reason = "heartbeat not replicated yet"
+            if lag is None:
+                unusable.append(alias)
+                self.stdout.write(f"{alias:<16} unknown lag ({reason}): reads go to the primary")
+            elif lag > max_lag:
+                unusable.append(alias)
+                self.stdout.write(f"{alias:<16} {lag:6.1f}s behind, over {max_lag}s: "
+                                  f"reads go to the primary")
+            else:
+                self.stdout.write(f"{alias:<16} {lag:6.1f}s behind: serving reads")
+        if unusable:
+            raise CommandError(f"{len(unusable)} of {len(aliases)} replica(s) not serving reads")
+        self.stdout.write(self.style.SUCCESS("All replicas are serving reads."))
@@ -0,0 +1,65 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from llm import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream an EXPORT_SOURCES table as CSV or JSON lines, optionally "
+        "gzipped, reading it in primary key order a chunk at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Name in EXPORT_SOURCES")
+        parser.add_argument("--output", default="-",
+                            help="File to write (default: stdout); .gz implies --gzip")
+        parser.add_argument("--format", choices=transfer.FORMATS,
+                            help="Default: from the --output extension, else csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--since", help="First day (YYYY-MM-DD) of created_at")
+        parser.add_argument("--until", help="Last day (YYYY-MM-DD) of created_at")
+        parser.add_argument("--user", help="Only this username's rows")
+        parser.add_argument("--chunk-size", type=int, default=2000,
+                            help="Rows per query")
+
+    def handle(self, *args, **options):
+        try:
+            source = transfer.get_source(options["source"])
+            since, until = transfer.date_range(options["since"], options["until"])
+        except KeyError:
+            raise CommandError(f"Unknown source {options['source']!r}: see EXPORT_SOURCES")
+        except ValueError as e:
+            raise CommandError(str(e))
+        path = options["output"]
+        compress = options["gzip"] or path.endswith(".gz")
+        fmt = options["format"] or transfer.guess_format(path)
+
+        count = 0
+
+        def counted(rows):
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        rows = source.rows(since, until, options["user"], chunk_size=options["chunk_size"])
+        blocks = transfer.buffered(transfer.encode(counted(rows), source.fields, fmt),
+                                   compress=compress)
+        started = time.monotonic()
+        out = sys.stdout.buffer if path == "-" else open(path, "wb")
+        try:
+            for block in blocks:
+                out.write(block)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        elapsed = time.monotonic() - started
+        self.stderr.write(
+            f"Exported {count} rows in {elapsed:.1f}s "
+            f"({count / elapsed if elapsed else 0:,.0f} rows/s).",
+            style_func=self.style.SUCCESS,
+        )
+
@@ -0,0 +1,126 @@
+import json
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from llm import loadtest
+from llm.client import get_client
+from llm.mockserver import Distribution, MockLLMServer, parse_faults
+from llm.ratelimit import RateLimiter
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive concurrent virtual users through LOAD_TEST_SCENARIO and report "
+        "throughput, latency percentiles, queries per request and error rates "
+        "as JSON. Without --url the app is served in-process against a mock LLM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10,
+                            help="Concurrent virtual users")
+        parser.add_argument("--duration", type=float, default=30,
+                            help="Seconds to run")
+        parser.add_argument("--warm-up", type=float, default=0,
+                            help="Seconds to run before recording")
+        parser.add_argument("--think-time", type=float, default=0,
+                            help="Seconds each user pauses between iterations")
+        parser.add_argument("--url",
+                            help="Base URL of a running server (queries aren't counted)")
+        parser.add_argument("--username", default="user{}",
+                            help="Login name pattern; {} is the user number "
+                                 "(see seed_data --users)")
+        parser.add_argument("--password", default="password123")
+        parser.add_argument("--llm-latency", default="lognormal:0.3,0.5",
+                            help="Mock LLM time to first token (see run_mock_llm)")
+        parser.add_argument("--llm-fail", action="append", metavar="KIND=P",
+                            help="Mock LLM fault injection (see run_mock_llm)")
+        parser.add_argument("--keep-rate-limit", action="store_true",
+                            help="Keep the client-side LLM rate limit in-process")
+        parser.add_argument("--output", help="Write the JSON report here")
+        parser.add_argument("--baseline",
+                            help="JSON report to compare against; fails on regressions")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Allowed relative latency/throughput change")
+
+    def handle(self, *args, **options):
+        path = getattr(settings, "LOAD_TEST_SCENARIO", None)
+        if not path:
+            raise CommandError("No scenario to run: set LOAD_TEST_SCENARIO")
+        scenario = import_string(path)
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Can't read baseline {options['baseline']}: {e}")
+
+        with ExitStack() as stack:
+            base_url = options["url"]
+            if not base_url:
+                base_url = stack.enter_context(loadtest.serve_in_process())
+                self._mock_llm(stack, options)
+            records, elapsed, stopped = loadtest.run(
+                scenario, base_url, options["users"], options["duration"],
+                options["username"], options["password"], options["think_time"],
+                options["warm_up"],
+            )
+        if not records:
+            raise CommandError("The scenario made no requests")
+
+        report = loadtest.summarize(
+            records, elapsed, scenario=path, users=options["users"],
+            in_process=not options["url"], stopped_users=stopped,
+        )
+        if stopped:
+            self.stderr.write(f"{stopped} virtual user(s) stopped early (failed to log in?)")
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self._print_table(report)
+        else:
+            self.stdout.write(output)
+
+        if baseline is not None:
+            problems = loadtest.compare(report, baseline, options["tolerance"])
+            for problem in problems:
+                self.stderr.write(problem)
+            if problems:
+                raise CommandError(f"{len(problems)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+
+    def _mock_llm(self, stack, options):
+        try:
+            server = MockLLMServer(
+                first_token_latency=Distribution(options["llm_latency"]),
+                token_interval=0.004,
+                faults=parse_faults(options["llm_fail"]),
+            ).start()
+        except ValueError as e:
+            raise CommandError(str(e))
+        stack.callback(server.server_close)
+        stack.callback(server.shutdown)
+        client = get_client()
+        saved = client.api_url, client.limiter
+        client.api_url = server.url
+        if not options["keep_rate_limit"]:
+            # Load the app, not the per-process Groq quota
+            client.limiter = RateLimiter(0, 1, 0)
+        stack.callback(lambda: setattr(client, "api_url", saved[0]))
+        stack.callback(lambda: setattr(client, "limiter", saved[1]))
+
+    def _print_table(self, report):
+        self.stdout.write(f"{'step':<24} {'req':>7} {'req/s':>8} {'p50':>8} {'p95':>8} "
+                          f"{'p99':>8} {'queries':>8} {'errors':>7}")
+        rows = list(report["steps"].items()) + [("total", report["total"])]
+        for name, stats in rows:
+            queries = stats["queries_per_request"]
+            self.stdout.write(
+                f"{name:<24} {stats['requests']:>7} {stats['throughput']:>8.1f} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+                f"{'-' if queries is None else queries:>8} {stats['error_rate']:>7.2%}"
+            )
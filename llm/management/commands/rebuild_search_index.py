@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from llm.search import get_source, index_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the inverted search index from the source tables. Not needed "
+        "on MySQL, which searches its FULLTEXT indexes directly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", action="append",
+                            help="Source name from SEARCH_SOURCES (default: all)")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for name in options["source"] or list(getattr(settings, "SEARCH_SOURCES", {})):
+            documents = get_source(name).fields[0].model.objects.order_by("pk")
+            last_id, total = 0, 0
+            while True:
+                ids = list(
+                    documents.filter(pk__gt=last_id)
+                    .values_list("pk", flat=True)[:options["batch_size"]]
+                )
+                if not ids:
+                    break
+                index_documents(name, ids)
+                last_id, total = ids[-1], total + len(ids)
+            self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents for {name}."))
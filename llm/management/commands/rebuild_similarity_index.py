@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from llm.similarity import get_source
+
+
+class Command(BaseCommand):
+    help = "Rebuild the near-duplicate question index from the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            action="append",
+            help="Source name from LLM_SIMILARITY_SOURCES (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        configured = getattr(settings, "LLM_SIMILARITY_SOURCES", {})
+        names = options["source"] or list(configured)
+        for name in names:
+            if name not in configured:
+                raise CommandError(f"Unknown similarity source: {name}")
+            indexed = get_source(name).rebuild()
+            self.stdout.write(self.style.SUCCESS(
+                f"Indexed {indexed} questions for '{name}'."
+            ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from llm.counters import reconcile, recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the statistics counters from their source tables and fix any "
+        "drift. Run it periodically (e.g. nightly from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Report drift without changing the counters")
+
+    def handle(self, *args, **options):
+        drift = reconcile(recount(), dry_run=options["dry_run"])
+        for name, (old, new) in sorted(drift.items()):
+            self.stdout.write(f"{name:<50} {old if old is not None else '-':>10} -> "
+                              f"{new if new is not None else '-'}")
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drift)} drifted counter(s)."))
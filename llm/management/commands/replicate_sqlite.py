@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from llm import replicas
+
+
+def _sqlite_path(alias):
+    settings_dict = connections[alias].settings_dict
+    if settings_dict["ENGINE"] != "django.db.backends.sqlite3":
+        raise CommandError(f"Database {alias!r} isn't SQLite")
+    return str(settings_dict["NAME"])
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the default SQLite database over each of DATABASE_REPLICAS every "
+        "--interval seconds: a local stand-in for asynchronous replication, "
+        "with replicas up to the interval behind."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=3.0,
+                            help="Seconds between copies (the replicas' lag)")
+        parser.add_argument("--once", action="store_true", help="Copy once and exit")
+
+    def handle(self, *args, **options):
+        aliases = replicas.replicas()
+        if not aliases:
+            raise CommandError("No replicas to copy to: set DATABASE_REPLICAS")
+        primary = _sqlite_path(DEFAULT_DB_ALIAS)
+        targets = {alias: _sqlite_path(alias) for alias in aliases}
+        self.stdout.write(
+            f"Copying {primary} to {', '.join(targets.values())} every {options['interval']}s"
+        )
+        try:
+            while True:
+                started = time.monotonic()
+                source = sqlite3.connect(primary)
+                try:
+                    for path in targets.values():
+                        target = sqlite3.connect(path)
+                        try:
+                            source.backup(target)
+                        finally:
+                            target.close()
+                finally:
+                    source.close()
+                if options["once"]:
+                    break
+                time.sleep(max(options["interval"] - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from llm.mockserver import (
+    FAULT_KINDS, Distribution, MockLLMServer, parse_faults, parse_model_speeds,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local stand-in for the Groq chat completions API, with "
+        "deterministic answers, configurable latency and injected faults. "
+        "Set LLM_API_URL to the printed URL to run the stack offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8400)
+        parser.add_argument(
+            "--first-token-latency", default="lognormal:0.3,0.5",
+            help="Seconds before the first token: fixed:S, uniform:LOW,HIGH, "
+                 "normal:MEAN,SD or lognormal:MEDIAN,SIGMA",
+        )
+        parser.add_argument("--token-interval", type=float, default=0.004,
+                            help="Seconds per generated token")
+        parser.add_argument(
+            "--model-speed", action="append", metavar="MODEL=DIST[@SECONDS]",
+            help="First token latency (and seconds per token) for one model "
+                 "(repeatable), e.g. llama-3.3-70b-versatile=lognormal:0.5,0.5@0.004",
+        )
+        parser.add_argument(
+            "--fail", action="append", metavar="KIND=P",
+            help=f"Inject a fault with probability P; KIND is one of "
+                 f"{', '.join(FAULT_KINDS)} (repeatable)",
+        )
+        parser.add_argument("--rpm", type=int, default=0,
+                            help="Answer 429 above this many requests per minute")
+        parser.add_argument("--hang-seconds", type=float, default=120,
+                            help="How long a 'timeout' fault keeps the request open")
+        parser.add_argument("--api-key",
+                            help="Answer 401 unless requests use this key")
+        parser.add_argument("--seed", type=int,
+                            help="Random seed for latencies and faults")
+
+    def handle(self, *args, **options):
+        try:
+            server = MockLLMServer(
+                (options["host"], options["port"]),
+                first_token_latency=Distribution(options["first_token_latency"]),
+                token_interval=options["token_interval"],
+                faults=parse_faults(options["fail"]),
+                rpm=options["rpm"],
+                hang_seconds=options["hang_seconds"],
+                api_key=options["api_key"],
+                seed=options["seed"],
+                model_speeds=parse_model_speeds(options["model_speed"]),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        except OSError as e:
+            raise CommandError(f"Can't listen on {options['host']}:{options['port']}: {e}")
+
+        self.stdout.write(f"Mock LLM API listening; set LLM_API_URL={server.url}")
+        self.stdout.write(
+            f"First token after {server.first_token_latency}, then "
+            f"{server.token_interval}s per token; faults: "
+            f"{', '.join(f'{k}={p}' for k, p in server.faults.items()) or 'none'}"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            outcomes = ", ".join(f"{k}: {v}" for k, v in sorted(server.stats.items()))
+            self.stdout.write(f"Served {sum(server.stats.values())} requests ({outcomes or 'none'}).")
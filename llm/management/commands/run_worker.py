@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from llm.jobs import claim, run_job
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the llm_job table with a thread or process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4,
+                            help="Concurrent jobs per worker (default: 4)")
+        parser.add_argument("--processes", action="store_true",
+                            help="Run jobs in forked processes instead of threads")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no runnable jobs are left")
+
+    def handle(self, *args, **options):
+        size = options["threads"]
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        stopping = threading.Event()
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping after running jobs finish...")
+            stopping.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        if options["processes"]:
+            pool = ProcessPoolExecutor(
+                max_workers=size, mp_context=multiprocessing.get_context("fork")
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="llm-job")
+
+        self.stdout.write(f"Worker {worker_id} running {size} jobs at a time")
+        running = set()
+        try:
+            while not stopping.is_set():
+                free = size - len(running)
+                job_ids = claim(worker_id, free) if free else []
+                if options["processes"]:
+                    # Forked children must not share the parent's DB socket
+                    connections.close_all()
+                for pk in job_ids:
+                    running.add(pool.submit(run_job, pk))
+
+                if not running:
+                    if options["once"]:
+                        break
+                    stopping.wait(options["poll_interval"])
+                    continue
+                done, running = wait(
+                    running,
+                    timeout=None if free == len(job_ids) else options["poll_interval"],
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    if future.exception() is not None:
+                        self.stderr.write(f"Job crashed: {future.exception()}")
+        finally:
+            pool.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
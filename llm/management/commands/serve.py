@@ -0,0 +1,45 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from llm.server import WORKERS, Master, check_interface, parse_bind, server_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve ASGI_APPLICATION (or WSGI_APPLICATION) for production: preload "
+        "it, fork worker processes, recycle them after --max-requests and "
+        "reload gracefully on SIGHUP. Defaults come from the SERVER setting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bind", help="HOST:PORT to listen on")
+        parser.add_argument("--interface", choices=sorted(WORKERS),
+                            help="asgi (event loop per worker, needs uvicorn) or wsgi")
+        parser.add_argument("--workers", type=int, help="Worker processes")
+        parser.add_argument("--threads", type=int,
+                            help="Concurrent requests per wsgi worker")
+        parser.add_argument("--max-requests", type=int,
+                            help="Requests before a worker is replaced (0: never)")
+        parser.add_argument("--max-requests-jitter", type=int,
+                            help="Up to this many more, at random, per worker")
+        parser.add_argument("--graceful-timeout", type=float,
+                            help="Seconds workers get to finish in-flight requests")
+
+    def handle(self, *args, **options):
+        config = server_config(**{
+            key: options[key] for key in (
+                "bind", "interface", "workers", "threads", "max_requests",
+                "max_requests_jitter", "graceful_timeout",
+            )
+        })
+        try:
+            parse_bind(config["bind"])
+            check_interface(config["interface"])
+        except (ValueError, ImproperlyConfigured) as e:
+            raise CommandError(str(e))
+        if config["workers"] < 1 or config["threads"] < 1:
+            raise CommandError("--workers and --threads must be at least 1")
+        try:
+            Master(config).run()
+        except OSError as e:
+            raise CommandError(f"Can't listen on {config['bind']}: {e}")
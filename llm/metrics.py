@@ -0,0 +1,189 @@
+"""
+In-process request, database and LLM metrics in the Prometheus text format.
+
+``llm.middleware.MetricsMiddleware`` times every request and, through a
+database execute wrapper, its queries; ``LLMClient`` reports each upstream
+call and the answer/similarity caches their lookups. ``render()`` produces
+the ``/metrics`` page.
+
+Metrics live in the memory of the process serving the request, like the
+rate limiter's state on ``/llm/status/``: with several worker processes,
+scrape each one (or run one process per scrape target).
+"""
+
+import contextvars
+import threading
+import time
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(labels[name] for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        with self._lock:
+            self._values[self._key(labels)] += amount
+
+    def _samples(self):
+        return [
+            f"{self.name}{_labels(self.label_names, key)} {value:g}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # key -> [count per bucket..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def _samples(self):
+        lines = []
+        names = self.label_names + ("le",)
+        for key, counts in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_labels(names, key + (f'{bound:g}',))} {count}")
+            lines.append(f"{self.name}_bucket{_labels(names, key + ('+Inf',))} {counts[-2]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {counts[-1]:g}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {counts[-2]}")
+        return lines
+
+
+def collector(function):
+    """Register ``function()`` -> ``[(name, type, help, [(labels, value)])]``.
+
+    For values read at scrape time, such as the rate limiter's queue.
+    """
+    _collectors.append(function)
+    return function
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for function in _collectors:
+        for name, kind, documentation, samples in function():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = Counter(
+    "http_requests_total", "Requests by view, method and status code.",
+    ("view", "method", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by view.", ("view", "method"),
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request by view.", ("view",),
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_duration_seconds", "Database time per request by view.", ("view",),
+)
+LLM_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "LLM API call latency (until the response headers) by outcome.", ("outcome",),
+)
+CACHE_LOOKUPS = Counter(
+    "llm_cache_lookups_total", "Answer and similarity cache lookups by result.",
+    ("cache", "result"),
+)
+
+
+class RequestStats:
+    """Timings gathered while one request is being served."""
+
+    def __init__(self):
+        self.queries = []  # (sql, seconds)
+        self.llm_calls = []  # (outcome, seconds)
+
+    @property
+    def db_seconds(self):
+        return sum(seconds for _, seconds in self.queries)
+
+
+current_request = contextvars.ContextVar("current_request_stats", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper timing queries of the current request."""
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries.append((sql, time.perf_counter() - started))
+
+
+def observe_llm_call(outcome, seconds):
+    """Record one LLM API attempt; ``outcome`` is a status code or error."""
+    LLM_SECONDS.observe(seconds, outcome=str(outcome))
+    stats = current_request.get()
+    if stats is not None:
+        stats.llm_calls.append((str(outcome), seconds))
+
+
+def observe_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,136 @@
+"""
+Per-request metrics (see ``llm.metrics``) and the slow request log.
+
+Add ``llm.middleware.MetricsMiddleware`` first in ``MIDDLEWARE`` so its
+timings include the other middleware. Requests slower than
+``SLOW_REQUEST_SECONDS`` (off when 0) are logged to ``llm.slow_requests``
+with their slowest SQL statements, without parameters.
+
+``ReplicaMiddleware`` decides which requests may read from replicas (see
+``llm.replicas``); add it before any middleware that reads the database.
+"""
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import metrics, replicas
+
+slow_logger = logging.getLogger("llm.slow_requests")
+
+MAX_LOGGED_QUERIES = 10
+
+
+def _install_wrapper(connection):
+    # First in line, so the ``execute_wrapper()`` context managers, which
+    # pop the last wrapper on exit, never remove it
+    if metrics.record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, metrics.record_query)
+
+
+def _connection_created(sender, connection, **kwargs):
+    _install_wrapper(connection)
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "<unresolved>"
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.slow_seconds = getattr(settings, "SLOW_REQUEST_SECONDS", 0)
+        connection_created.connect(_connection_created, dispatch_uid="llm.metrics")
+        for connection in connections.all(initialized_only=True):
+            _install_wrapper(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def _record(self, request, response, stats, seconds):
+        view = _view_name(request)
+        metrics.REQUESTS.inc(view=view, method=request.method, status=str(response.status_code))
+        metrics.REQUEST_SECONDS.observe(seconds, view=view, method=request.method)
+        metrics.REQUEST_QUERIES.observe(len(stats.queries), view=view)
+        metrics.REQUEST_DB_SECONDS.observe(stats.db_seconds, view=view)
+        if self.slow_seconds and seconds >= self.slow_seconds:
+            self._log_slow(request, response, stats, seconds, view)
+
+    def _log_slow(self, request, response, stats, seconds, view):
+        lines = [
+            f"Slow request: {request.method} {request.path} ({view}) "
+            f"{response.status_code} in {seconds:.3f}s; {len(stats.queries)} queries "
+            f"in {stats.db_seconds:.3f}s; {len(stats.llm_calls)} LLM calls in "
+            f"{sum(s for _, s in stats.llm_calls):.3f}s"
+        ]
+        slowest = sorted(stats.queries, key=lambda query: query[1], reverse=True)
+        for sql, query_seconds in slowest[:MAX_LOGGED_QUERIES]:
+            lines.append(f"  {query_seconds * 1000:8.1f} ms  {sql[:500]}")
+        for outcome, call_seconds in stats.llm_calls:
+            lines.append(f"  {call_seconds * 1000:8.1f} ms  LLM call ({outcome})")
+        slow_logger.warning("\n".join(lines))
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = replicas.begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = replicas.end_request(token)
+        if wrote and replicas.replicas():
+            replicas.pin_to_primary(response)
+        return response
+
+    async def __acall__(self, request):
+        token = replicas.begin_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = replicas.end_request(token)
+        if wrote and replicas.replicas():
+            replicas.pin_to_primary(response)
+        return response
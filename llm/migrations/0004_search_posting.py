@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('llm', '0003_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('partition', models.BigIntegerField(default=0)),
+                ('term', models.CharField(max_length=64)),
+                ('doc_id', models.BigIntegerField()),
+                ('weight', models.FloatField()),
+            ],
+            options={
+                'db_table': 'llm_search_posting',
+                'indexes': [models.Index(fields=['source', 'term', 'partition', 'doc_id', 'weight'], name='llm_search__source_8d160e_idx'), models.Index(fields=['source', 'doc_id'], name='llm_search__source_e7de99_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,331 @@
+"""
+Local stand-in for the OpenAI-compatible Groq chat completions API.
+
+Point ``LLM_API_URL`` at ``MockLLMServer.url`` (``manage.py run_mock_llm``)
+to exercise the whole stack without network access or Groq quota.
+
+* Answers are deterministic: the same model and messages always get the
+  same text, generated from the seed data vocabulary (``llm.seeding``).
+  ``max_tokens`` truncates them; one word counts as one token.
+* Latency is a time to first token drawn from a ``Distribution`` plus a
+  fixed interval per token, so a streamed answer arrives token by token
+  and a plain one after the whole generation time. ``model_speeds`` sets
+  both per model, as bigger models are slower.
+* Faults are injected with given probabilities: ``429``/``5xx`` status
+  codes (429s carry Groq's ``Retry-After`` and ``x-ratelimit-*``
+  headers), ``timeout`` (the request hangs, then the connection drops)
+  and ``disconnect`` (the connection drops halfway through the answer).
+  ``rpm`` additionally enforces a real per-minute request limit.
+"""
+
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .seeding import CATEGORIES, answer_text
+
+FAULT_KINDS = ("429", "500", "502", "503", "timeout", "disconnect")
+
+ERROR_TYPES = {
+    429: ("rate_limit_exceeded", "Rate limit reached for requests. Please try again later."),
+    500: ("internal_server_error", "Internal server error."),
+    502: ("bad_gateway", "Bad gateway."),
+    503: ("service_unavailable", "Service unavailable. Please try again later."),
+}
+
+
+class Distribution:
+    """A latency distribution in seconds, parsed from ``kind:params``.
+
+    ``fixed:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,SD`` or
+    ``lognormal:MEDIAN,SIGMA``. Samples are never negative.
+    """
+
+    def __init__(self, spec):
+        kind, _, params = spec.partition(":")
+        try:
+            values = [float(v) for v in params.split(",")] if params else []
+        except ValueError:
+            raise ValueError(f"Invalid latency distribution {spec!r}") from None
+        arity = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if arity.get(kind) != len(values):
+            raise ValueError(f"Invalid latency distribution {spec!r}")
+        self.spec = spec
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng):
+        if self.kind == "fixed":
+            value = self.values[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(*self.values)
+        elif self.kind == "normal":
+            value = rng.gauss(*self.values)
+        else:
+            median, sigma = self.values
+            value = median * rng.lognormvariate(0, sigma)
+        return max(0.0, value)
+
+    def __str__(self):
+        return self.spec
+
+
+def parse_faults(specs):
+    """``["429=0.05", "timeout=0.01"]`` -> ``{"429": 0.05, "timeout": 0.01}``."""
+    faults = {}
+    for spec in specs or []:
+        kind, _, probability = spec.partition("=")
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"Unknown fault {kind!r}; expected one of {', '.join(FAULT_KINDS)}")
+        try:
+            faults[kind] = float(probability)
+        except ValueError:
+            raise ValueError(f"Invalid fault probability in {spec!r}") from None
+    if sum(faults.values()) > 1:
+        raise ValueError("Fault probabilities add up to more than 1")
+    return faults
+
+
+def parse_model_speeds(specs):
+    """``{model: (Distribution, token_interval)}`` from ``MODEL=DIST[@SECONDS]``."""
+    speeds = {}
+    for spec in specs or []:
+        model, _, rest = spec.partition("=")
+        latency, _, interval = rest.partition("@")
+        if not model or not latency:
+            raise ValueError(f"Invalid model speed {spec!r}: expected MODEL=DIST[@SECONDS]")
+        try:
+            speeds[model] = (Distribution(latency), float(interval) if interval else None)
+        except ValueError:
+            raise ValueError(f"Invalid model speed {spec!r}") from None
+    return speeds
+
+
+def answer_for(payload):
+    """The deterministic answer text for a chat completion payload."""
+    messages = payload.get("messages") or []
+    key = json.dumps([payload.get("model"), messages], sort_keys=True)
+    rng = random.Random(hashlib.sha256(key.encode("utf-8")).digest())
+    question = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+    subjects = [
+        subject for _, _, items in CATEGORIES for subject in items
+        if subject.lower() in question.lower()
+    ] or rng.choice(CATEGORIES)[2]
+    return answer_text(rng, subjects)
+
+
+def _tokens(text, max_tokens):
+    words = text.split(" ")
+    if max_tokens:
+        words = words[:max_tokens]
+    return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once
+    request_queue_size = 128
+
+    def __init__(self, address=("127.0.0.1", 0), first_token_latency="fixed:0",
+                 token_interval=0.0, faults=None, rpm=0, hang_seconds=120,
+                 api_key=None, seed=None, model_speeds=None):
+        super().__init__(address, _Handler)
+        self.first_token_latency = (
+            first_token_latency if isinstance(first_token_latency, Distribution)
+            else Distribution(first_token_latency)
+        )
+        self.token_interval = token_interval
+        self.model_speeds = model_speeds or {}
+        self.faults = faults or {}
+        self.rpm = rpm
+        self.hang_seconds = hang_seconds
+        self.api_key = api_key
+        self.rng = random.Random(seed)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._recent = deque()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def start(self):
+        """Serve from a daemon thread; returns ``self``."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on purpose: closed streams, cancelled hedged calls
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            self.count("client_closed")
+            return
+        super().handle_error(request, client_address)
+
+    def pick_fault(self):
+        with self._lock:
+            roll = self.rng.random()
+        for kind, probability in self.faults.items():
+            if roll < probability:
+                return kind
+            roll -= probability
+        return None
+
+    def rate_limited(self):
+        """Seconds until a request is allowed again under ``rpm``, or 0."""
+        if not self.rpm:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and self._recent[0] <= now - 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.rpm:
+                return self._recent[0] + 60 - now
+            self._recent.append(now)
+            return 0
+
+    def latency(self, model=None):
+        """``(seconds to first token, seconds per token)`` for ``model``."""
+        distribution, interval = self.model_speeds.get(model, (None, None))
+        with self._lock:
+            first = (distribution or self.first_token_latency).sample(self.rng)
+        return first, self.token_interval if interval is None else interval
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, headers=None, message=None):
+        error_type, default = ERROR_TYPES.get(status, ("invalid_request_error", ""))
+        self.server.count(str(status))
+        self._json(status, {"error": {
+            "message": message or default, "type": error_type, "code": error_type,
+        }}, headers)
+
+    def _throttled(self, retry_after):
+        retry_after = max(1, round(retry_after))
+        self._error(429, {
+            "Retry-After": str(retry_after),
+            "x-ratelimit-limit-requests": str(self.server.rpm or 30),
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": f"{retry_after}s",
+        })
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._error(404, message=f"Unknown path {self.path}")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self._error(400, message="Request body is not valid JSON.")
+        if self.server.api_key and self.headers.get("Authorization") != f"Bearer {self.server.api_key}":
+            return self._error(401, message="Invalid API Key")
+
+        fault = self.server.pick_fault()
+        retry_after = self.server.rate_limited()
+        if retry_after or fault == "429":
+            return self._throttled(retry_after or self.server.rng.uniform(1, 5))
+        if fault in ("500", "502", "503"):
+            return self._error(int(fault))
+        if fault == "timeout":
+            self.server.count("timeout")
+            time.sleep(self.server.hang_seconds)
+            self.close_connection = True
+            return
+
+        tokens = _tokens(answer_for(payload), payload.get("max_tokens"))
+        if fault == "disconnect":
+            tokens = tokens[:len(tokens) // 2]
+        first_token, token_interval = self.server.latency(payload.get("model"))
+        time.sleep(first_token)
+        completion = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": payload.get("model", ""),
+        }
+        prompt_tokens = sum(
+            len(str(m.get("content", "")).split()) for m in payload.get("messages") or []
+        )
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        if payload.get("stream"):
+            self._stream(completion, tokens, usage, fault, token_interval)
+        else:
+            time.sleep(token_interval * len(tokens))
+            if fault == "disconnect":
+                self.server.count("disconnect")
+                self.close_connection = True
+                return
+            self.server.count("200")
+            self._json(200, {
+                **completion,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "length" if payload.get("max_tokens") == len(tokens) else "stop",
+                }],
+                "usage": usage,
+            })
+
+    def _chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _event(self, data):
+        self._chunk(f"data: {data}\n\n".encode("utf-8"))
+
+    def _stream(self, completion, tokens, usage, fault, token_interval):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunk = {**completion, "object": "chat.completion.chunk"}
+        self._event(json.dumps({**chunk, "choices": [
+            {"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}
+        ]}))
+        for token in tokens:
+            time.sleep(token_interval)
+            self._event(json.dumps({**chunk, "choices": [
+                {"index": 0, "delta": {"content": token}, "finish_reason": None}
+            ]}))
+        if fault == "disconnect":
+            self.server.count("disconnect")
+            self.close_connection = True
+            return
+        self._event(json.dumps({
+            **chunk,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"usage": usage},
+        }))
+        self._event("[DONE]")
+        self._chunk(b"")
+        self.server.count("200")
@@ -0,0 +1,149 @@
+from django.db import models
+from django.utils import timezone
+
+
+class CachedAnswer(models.Model):
+    """An LLM answer keyed by normalized question text, model, max_tokens and prompt."""
+
+    key = models.CharField(max_length=64, unique=True)
+    question_text = models.TextField()
+    answer_text = models.TextField()
+    model = models.CharField(max_length=100)
+    source = models.CharField(max_length=100, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = "llm_answer_cache"
+
+    def __str__(self):
+        return f"{self.model} - {self.question_text[:50]}"
+
+
+class Job(models.Model):
+    """A unit of background work claimed by ``manage.py run_worker``."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    key = models.CharField(max_length=100, blank=True, db_index=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "llm_job"
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+            models.Index(fields=["status", "locked_until"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def is_last_attempt(self):
+        return self.attempts >= self.max_attempts
+
+
+class Counter(models.Model):
+    """A named running total kept up to date by signals (see ``llm.counters``)."""
+
+    name = models.CharField(max_length=191, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "llm_counter"
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+class SearchPosting(models.Model):
+    """Inverted index entry: ``term`` occurs in document ``doc_id`` of ``source``.
+
+    Only used on databases without FULLTEXT indexes (see ``llm.search``).
+    """
+
+    source = models.CharField(max_length=50)
+    partition = models.BigIntegerField(default=0)
+    term = models.CharField(max_length=64)
+    doc_id = models.BigIntegerField()
+    weight = models.FloatField()
+
+    class Meta:
+        db_table = "llm_search_posting"
+        indexes = [
+            # Covers the scoring query (weight included to skip row lookups)
+            models.Index(fields=["source", "term", "partition", "doc_id", "weight"]),
+            models.Index(fields=["source", "doc_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.term} -> {self.doc_id}"
+
+
+class ReplicaHeartbeat(models.Model):
+    """A beat written on the primary; the first one a replica lacks
+    shows how far behind it is (see ``llm.replicas``)."""
+
+    beat_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "llm_replica_heartbeat"
+
+    def __str__(self):
+        return f"heartbeat at {self.beat_at}"
+
+
+class AnswerUsage(models.Model):
+    """How a stored answer was produced, and what it cost (see ``llm.analytics``).
+
+    Mixed into the apps' answer models. Latencies and token counts are only
+    known for answers the LLM generated.
+    """
+
+    GENERATED = "generated"
+    TRUNCATED = "truncated"
+    CACHED = "cached"
+    SIMILAR = "similar"
+    DEGRADED = "degraded"
+    QUEUED = "queued"
+    COALESCED = "coalesced"
+    OUTCOME_CHOICES = [
+        (GENERATED, "Generated"),
+        (TRUNCATED, "Generated, cut off at max_tokens"),
+        (CACHED, "Answer cache"),
+        (SIMILAR, "Similar question"),
+        (DEGRADED, "Closest stored answer, LLM unavailable"),
+        (QUEUED, "Queued until the LLM is available"),
+        (COALESCED, "Shared an identical question's LLM call"),
+    ]
+
+    model = models.CharField(max_length=100, blank=True)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, blank=True)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    ttft_ms = models.PositiveIntegerField(null=True, blank=True)
+    prompt_tokens = models.PositiveIntegerField(null=True, blank=True)
+    completion_tokens = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,223 @@
+"""
+Client-side rate limiting for LLM API calls.
+
+Every upstream request takes a slot from the process' ``RateLimiter``:
+
+* a token bucket keeps the steady request rate under
+  ``LLM_RATE_LIMIT_RPM`` (bursts of up to ``LLM_RATE_LIMIT_BURST``);
+* an adaptive concurrency cap (at most ``LLM_MAX_CONCURRENCY``) is halved
+  on every 429 and grows back by one slot per window of successes (AIMD);
+* a 429's ``Retry-After``, or ``x-ratelimit-remaining-*: 0`` with its
+  ``x-ratelimit-reset-*`` header, pauses all callers until the reset.
+
+Callers queue for a slot until their deadline (``LLM_QUEUE_DEADLINE``)
+instead of failing straight away; if the wait would outlast it they get
+``LLMThrottled``. ``state()`` reports queue depth and throttle state.
+"""
+
+import asyncio
+import email.utils
+import re
+import threading
+import time
+
+from django.conf import settings
+
+from .exceptions import LLMThrottled
+
+# Re-check interval while waiting on in-flight calls from another event loop
+_POLL_INTERVAL = 0.05
+# Pause after a 429 that carries no usable headers
+_DEFAULT_PAUSE = 1.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+
+def parse_duration(value):
+    """Seconds in a Groq reset header such as ``"7.66s"`` or ``"2m59.56s"``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+def parse_retry_after(value):
+    """Seconds in a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    seconds = parse_duration(value)
+    if seconds is not None:
+        return seconds
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def pause_for(status_code, headers):
+    """How long the API asked us to back off, or None."""
+    pauses = []
+    if status_code == 429:
+        pauses.append(parse_retry_after(headers.get("Retry-After")))
+    for kind in ("requests", "tokens"):
+        if headers.get(f"x-ratelimit-remaining-{kind}", "").strip() == "0":
+            pauses.append(parse_duration(headers.get(f"x-ratelimit-reset-{kind}")))
+    pauses = [p for p in pauses if p is not None]
+    if pauses:
+        return max(pauses)
+    return _DEFAULT_PAUSE if status_code == 429 else None
+
+
+class RateLimiter:
+    """Token bucket plus adaptive concurrency cap shared by one process.
+
+    A ``requests_per_minute`` or ``max_concurrency`` of 0 disables that limit.
+    """
+
+    def __init__(self, requests_per_minute, burst, max_concurrency):
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.tokens = float(self.burst)
+        self.in_flight = 0
+        self.waiting = 0
+        self.paused_until = 0.0
+        self.throttled_count = 0
+        self._refilled_at = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        if self.rate > 0:
+            elapsed = now - self._refilled_at
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self._refilled_at = now
+
+    def _wait_time(self, now):
+        """Take a slot and return 0, or return how long to wait.
+
+        ``None`` means "until a running call finishes".
+        """
+        self._refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.max_concurrency and self.in_flight >= max(1, int(self.concurrency)):
+            return None
+        if self.rate > 0:
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def _check_deadline(self, now, wait, deadline):
+        if now >= deadline or (wait is not None and now + wait > deadline):
+            retry_after = max(wait or 0, self.paused_until - now, 0)
+            raise LLMThrottled(
+                "Too many requests to the LLM API, try again shortly.",
+                retry_after=round(retry_after, 1) or None,
+            )
+
+    def acquire(self, deadline):
+        """Block until a slot is free; raise ``LLMThrottled`` past ``deadline``.
+
+        ``deadline`` is a ``time.monotonic()`` value.
+        """
+        with self._cond:
+            self.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait_time(now)
+                    if wait == 0:
+                        return
+                    self._check_deadline(now, wait, deadline)
+                    self._cond.wait(min(wait or deadline - now, deadline - now))
+            finally:
+                self.waiting -= 1
+
+    async def aacquire(self, deadline):
+        """Async ``acquire``; polls so it works across event loops."""
+        with self._cond:
+            self.waiting += 1
+        try:
+            while True:
+                with self._cond:
+                    now = time.monotonic()
+                    wait = self._wait_time(now)
+                    if wait == 0:
+                        return
+                    self._check_deadline(now, wait, deadline)
+                await asyncio.sleep(min(wait or _POLL_INTERVAL, deadline - now))
+        finally:
+            with self._cond:
+                self.waiting -= 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def observe(self, status_code, headers):
+        """Adapt to the rate limit feedback in an API response."""
+        pause = pause_for(status_code, headers)
+        with self._cond:
+            now = time.monotonic()
+            if pause is not None:
+                self.paused_until = max(self.paused_until, now + pause)
+            if status_code == 429:
+                self.throttled_count += 1
+                self.concurrency = max(1.0, self.concurrency / 2)
+                self.tokens = 0.0
+            elif status_code == 200 and self.max_concurrency:
+                self.concurrency = min(
+                    float(self.max_concurrency),
+                    self.concurrency + 1 / self.concurrency,
+                )
+            self._cond.notify_all()
+
+    def state(self):
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            paused_for = max(0.0, self.paused_until - now)
+            return {
+                "queue_depth": self.waiting,
+                "in_flight": self.in_flight,
+                "concurrency_limit": int(self.concurrency) if self.max_concurrency else None,
+                "tokens": round(self.tokens, 2) if self.rate > 0 else None,
+                "throttled": paused_for > 0,
+                "paused_for": round(paused_for, 2),
+                "throttled_count": self.throttled_count,
+            }
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """The process-wide ``RateLimiter`` configured from settings."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                requests_per_minute=getattr(settings, "LLM_RATE_LIMIT_RPM", 30),
+                burst=getattr(settings, "LLM_RATE_LIMIT_BURST", 5),
+                max_concurrency=getattr(settings, "LLM_MAX_CONCURRENCY", 8),
+            )
+        return _limiter
+
+
+def queue_deadline():
+    """``time.monotonic()`` deadline for a call queued now."""
+    return time.monotonic() + getattr(settings, "LLM_QUEUE_DEADLINE", 30)
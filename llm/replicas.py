@@ -0,0 +1,239 @@
+"""
+Read replicas for the read-heavy pages.
+
+``ReplicaRouter`` (in ``DATABASE_ROUTERS``) sends reads to the
+``DATABASE_REPLICAS`` aliases of ``DATABASES`` and everything else to
+``default``, the primary:
+
+* Only GET and HEAD requests read from replicas (``ReplicaMiddleware``).
+  Other requests, management commands and the job worker, which must see
+  what they just wrote or were queued, use the primary throughout, as do
+  reads inside a transaction.
+* Once a request writes, the rest of it reads from the primary, and a
+  cookie pins the user's next requests to it for
+  ``REPLICA_MAX_LAG_SECONDS`` (plus the lag check interval): after asking
+  a question, the answer page finds it even on a lagging replica.
+* A replica more than ``REPLICA_MAX_LAG_SECONDS`` behind, or unreachable,
+  gets no reads until it catches up. A background thread in each process
+  measures lag every ``LAG_CHECK_SECONDS`` from the heartbeat row it
+  writes on the primary (``ReplicaHeartbeat``), so it works the same on
+  MySQL replication and the ``replicate_sqlite`` test setup.
+
+Migrations only run on the primary; replicas get the schema through
+replication.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+LAG_CHECK_SECONDS = 2
+# Past this, a replica's lag reads as the age of the oldest beat kept
+HEARTBEAT_KEEP_SECONDS = 600
+PRUNE_EVERY = 100
+PIN_COOKIE = "use_primary"
+
+READS = metrics.Counter(
+    "llm_db_reads_routed_total", "Reads routed by ReplicaRouter, by database.", ("database",),
+)
+
+
+class _RequestState:
+    def __init__(self, replica_reads):
+        self.replica_reads = replica_reads
+        self.wrote = False
+
+
+# Set by ReplicaMiddleware for the request being served
+_request = ContextVar("llm_replica_request", default=None)
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def max_lag():
+    return getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5)
+
+
+def pin_seconds():
+    """How long a user's reads stay on the primary after they write."""
+    return max_lag() + LAG_CHECK_SECONDS
+
+
+def beat():
+    """Write a heartbeat on the primary; returns its time.
+
+    Every ``PRUNE_EVERY`` beats, those older than ``HEARTBEAT_KEEP_SECONDS``
+    are deleted.
+    """
+    from .models import ReplicaHeartbeat
+
+    now = timezone.now()
+    primary = ReplicaHeartbeat.objects.using(DEFAULT_DB_ALIAS)
+    if primary.create(beat_at=now).pk % PRUNE_EVERY == 0:
+        primary.filter(beat_at__lt=now - timedelta(seconds=HEARTBEAT_KEEP_SECONDS)).delete()
+    return now
+
+
+def replica_lag(alias, now):
+    """Seconds ``alias`` is behind the primary as of the beat at ``now``;
+    ``None`` if no beat has reached it yet.
+
+    The replica is at least as far behind as the oldest beat it hasn't
+    received, and up to date if the only one is the latest.
+    """
+    from .models import ReplicaHeartbeat
+
+    replicated = (
+        ReplicaHeartbeat.objects.using(alias)
+        .order_by("-pk").values_list("pk", flat=True).first()
+    )
+    if replicated is None:
+        return None
+    oldest_missing = (
+        ReplicaHeartbeat.objects.using(DEFAULT_DB_ALIAS)
+        .filter(pk__gt=replicated).order_by("pk")
+        .values_list("beat_at", flat=True).first()
+    )
+    if oldest_missing is None:
+        return 0.0
+    return max((now - oldest_missing).total_seconds(), 0.0)
+
+
+class _LagMonitor:
+    """Each replica's lag, measured every ``LAG_CHECK_SECONDS`` by a
+    background thread per process, so requests never wait on a slow or
+    unreachable replica. Until its first check, no replica is usable."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lags = {}  # alias: lag or None
+        self._pid = None
+
+    def _start(self):
+        # Once per process: threads don't survive a fork
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._lags = {}
+        threading.Thread(target=self._run, name="replica-lag", daemon=True).start()
+
+    def _run(self):
+        while True:
+            self.check()
+            time.sleep(LAG_CHECK_SECONDS)
+
+    def check(self):
+        """Measure every replica's lag against one new beat."""
+        aliases = replicas()
+        lags = dict.fromkeys(aliases)
+        try:
+            now = beat()
+        except DatabaseError as e:
+            logger.warning("Can't write the replica heartbeat: %s", e)
+            connections[DEFAULT_DB_ALIAS].close()
+        else:
+            for alias in aliases:
+                try:
+                    lags[alias] = replica_lag(alias, now)
+                except DatabaseError as e:
+                    logger.warning("Can't measure the lag of replica %s: %s", alias, e)
+                    connections[alias].close()
+        with self._lock:
+            self._lags = lags
+
+    def lag(self, alias):
+        self._start()
+        return self._lags.get(alias)
+
+    def usable(self, alias):
+        lag = self.lag(alias)
+        return lag is not None and lag <= max_lag()
+
+    def states(self):
+        with self._lock:
+            return dict(self._lags)
+
+
+monitor = _LagMonitor()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request.get()
+        if (
+            state is None or not state.replica_reads or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        usable = [alias for alias in replicas() if monitor.usable(alias)]
+        alias = random.choice(usable) if usable else DEFAULT_DB_ALIAS
+        READS.inc(database=alias)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _request.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replicas()
+
+
+def _pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE) or 0) > time.time()
+    except ValueError:
+        return False
+
+
+def begin_request(request):
+    """Start routing for ``request``; returns the token for ``end_request``."""
+    return _request.set(_RequestState(
+        bool(replicas()) and request.method in ("GET", "HEAD") and not _pinned(request)
+    ))
+
+
+def end_request(token):
+    """Stop routing for the request; returns whether it wrote anything."""
+    state = _request.get()
+    _request.reset(token)
+    return state.wrote
+
+
+def pin_to_primary(response):
+    """Send the user's reads to the primary until replicas have caught up."""
+    seconds = pin_seconds()
+    response.set_cookie(PIN_COOKIE, f"{time.time() + seconds:.0f}", max_age=seconds,
+                        httponly=True, samesite="Lax")
+
+
+@metrics.collector
+def _replica_metrics():
+    return [
+        ("llm_db_replica_lag_seconds", "gauge",
+         "Measured replica lag (-1: unreachable or unknown).",
+         [({"database": alias}, -1 if lag is None else lag)
+          for alias, lag in monitor.states().items()]),
+    ]
@@ -0,0 +1,217 @@
+"""
+Model and ``max_tokens`` routing per question.
+
+``plan(question, category)`` rates the question simple (a definition or
+short factual question) or complex from its length and wording, and
+sets the model meant for it and its token budget; ``route()`` then
+picks the model to call. Both come from
+the project's ``LLM_ROUTING``::
+
+    LLM_ROUTING = {
+        "small": "llama-3.1-8b-instant",      # simple questions, and fallback
+        "large": "llama-3.3-70b-versatile",   # complex questions
+        "max_tokens": {"simple": 250, "complex": 500},
+        # Caps the budget of questions in these categories
+        "category_max_tokens": {"General": 350},
+        "slow_seconds": 8,
+        "throttle_cooldown": 60,
+    }
+
+Complex questions go to the small model instead while the large one is
+unhealthy in this process: its circuit breaker is open (``llm.breaker``),
+its recent latency (a moving average of the calls reported to
+``observe()``) is above ``slow_seconds``, or it was rate limited within
+``throttle_cooldown`` seconds. Health older than the cooldown is
+forgotten, so the large model gets tried again. Decisions are
+logged to ``llm.routing`` and counted in ``/metrics``.
+
+Callers look the answer cache up under the plan's model and only
+``route()`` on a miss, so a cached answer of the large model is served
+while it is unhealthy. Answers are cached under the model that wrote
+them: a fallback answer never stands in for the large model's.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from . import metrics
+from .breaker import get_breaker
+
+logger = logging.getLogger(__name__)
+
+SIMPLE = "simple"
+COMPLEX = "complex"
+
+Plan = namedtuple("Plan", "model max_tokens tier reason")
+Route = namedtuple("Route", "model max_tokens tier reason")
+
+DEFAULT_MAX_TOKENS = {SIMPLE: 250, COMPLEX: 500}
+# Weight of the newest call in the moving average latency
+LATENCY_SMOOTHING = 0.3
+# Latencies kept per model for percentiles (see ``llm.hedging``)
+LATENCY_WINDOW = 200
+
+_DEFINITION = re.compile(
+    r"^\s*(what\s+(is|are)|what's|define|definition\s+of|meaning\s+of|"
+    r"full\s+form\s+of|who\s+(invented|discovered))\b",
+    re.IGNORECASE,
+)
+# Wording that asks for working or reasoning (strong) or for explanation (weak)
+_STRONG_CUES = re.compile(
+    r"\b(derive|derivation|calculate|compute|compare|difference|design|prove|"
+    r"analy[sz]e|troubleshoot)\b",
+    re.IGNORECASE,
+)
+_WEAK_CUES = re.compile(
+    r"\b(why|how|explain|example|affects?|causes?|formula)\b", re.IGNORECASE
+)
+_QUANTITY = re.compile(r"\b\d+(\.\d+)?\s*(v|kv|a|w|kw|mw|hz|rpm|%|ohms?|nm|kva)\b", re.IGNORECASE)
+
+ROUTES = metrics.Counter(
+    "llm_routes_total", "Questions routed to each model, by tier and fallback reason.",
+    ("model", "tier", "fallback"),
+)
+
+
+def classify(question):
+    """``(tier, reason)``: ``simple`` or ``complex``, with the cues behind it.
+
+    A few regular expressions over the text, cheap enough for every request.
+    """
+    words = len(question.split())
+    score = 0
+    reasons = [f"{words} words"]
+    if words > 40:
+        score += 2
+    elif words > 20:
+        score += 1
+    strong = {match.lower() for match in _STRONG_CUES.findall(question)}
+    weak = {match.lower() for match in _WEAK_CUES.findall(question)}
+    score += 2 * min(len(strong), 2) + min(len(weak), 2)
+    if strong or weak:
+        reasons.append("cues: " + ", ".join(sorted(strong | weak)))
+    if _QUANTITY.search(question):
+        score += 1
+        reasons.append("quantities")
+    if question.count("?") > 1:
+        score += 1
+        reasons.append("several questions")
+    if _DEFINITION.match(question) and words <= 15 and not strong:
+        score -= 2
+        reasons.append("definition")
+    return (COMPLEX if score >= 2 else SIMPLE), "; ".join(reasons)
+
+
+class _Health:
+    """Recent latency and rate limiting per model, in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}  # model -> (moving average seconds, updated at)
+        self._recent = {}  # model -> deque of the latest latencies
+        self._throttled_at = {}
+
+    def observe(self, model, seconds=None, throttled=False):
+        now = time.monotonic()
+        with self._lock:
+            if throttled:
+                self._throttled_at[model] = now
+            if seconds is not None:
+                average, _ = self._latency.get(model, (seconds, now))
+                average += LATENCY_SMOOTHING * (seconds - average)
+                self._latency[model] = (average, now)
+                self._recent.setdefault(model, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def percentile(self, model, percent, min_samples=1):
+        """Latency percentile of ``model``'s recent calls, or ``None``."""
+        with self._lock:
+            recent = sorted(self._recent.get(model, ()))
+        if not recent or len(recent) < min_samples:
+            return None
+        return recent[min(int(len(recent) * percent / 100), len(recent) - 1)]
+
+    def problem(self, model, slow_seconds, cooldown):
+        """Why ``model`` should be avoided right now, or ``None``."""
+        if get_breaker(model).is_open():
+            return "circuit open"
+        now = time.monotonic()
+        with self._lock:
+            throttled_at = self._throttled_at.get(model)
+            average, updated_at = self._latency.get(model, (None, None))
+        if throttled_at is not None and now - throttled_at < cooldown:
+            return "throttled"
+        if (slow_seconds and average is not None and now - updated_at < cooldown
+                and average > slow_seconds):
+            return f"slow ({average:.1f}s)"
+        return None
+
+    def reset(self):
+        with self._lock:
+            self._latency.clear()
+            self._recent.clear()
+            self._throttled_at.clear()
+
+
+health = _Health()
+
+
+def _config():
+    config = getattr(settings, "LLM_ROUTING", None)
+    if not config or "small" not in config or "large" not in config:
+        raise ImproperlyConfigured("LLM_ROUTING needs 'small' and 'large' models")
+    return config
+
+
+def alternate(model):
+    """The other ``LLM_ROUTING`` model, or ``None`` if ``model`` is neither."""
+    config = _config()
+    others = {config["small"]: config["large"], config["large"]: config["small"]}
+    other = others.get(model)
+    return other if other != model else None
+
+
+def plan(question, category=None):
+    """The ``Plan`` (model, max_tokens, tier, reason) for a question.
+
+    Neither logged nor counted, so it is cheap to call before the cache.
+    """
+    config = _config()
+    tier, reason = classify(question)
+    max_tokens = {**DEFAULT_MAX_TOKENS, **config.get("max_tokens", {})}[tier]
+    cap = config.get("category_max_tokens", {}).get(category)
+    if cap:
+        max_tokens = min(max_tokens, cap)
+    model = config["small"] if tier == SIMPLE else config["large"]
+    return Plan(model, max_tokens, tier, reason)
+
+
+def route(question, category=None, planned=None):
+    """The ``Route`` (model, max_tokens, tier, reason) for a question.
+
+    Pass the question's ``plan()`` as ``planned`` if already made.
+    """
+    config = _config()
+    model, max_tokens, tier, reason = planned or plan(question, category)
+    fallback = None
+    if tier == COMPLEX:
+        fallback = health.problem(
+            config["large"], config.get("slow_seconds", 0), config.get("throttle_cooldown", 60)
+        )
+        if fallback:
+            model = config["small"]
+            reason += f"; large model {fallback}"
+    ROUTES.inc(model=model, tier=tier, fallback=fallback.split(" (")[0] if fallback else "")
+    logger.info("Routed %s question to %s (max_tokens=%s, category=%s): %s",
+                tier, model, max_tokens, category, reason)
+    return Route(model, max_tokens, tier, reason)
+
+
+def observe(model, seconds=None, throttled=False):
+    """Report a call's latency, or that it was rate limited, for routing."""
+    health.observe(model, seconds, throttled)
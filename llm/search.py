@@ -0,0 +1,288 @@
+"""
+Ranked full-text search over question/answer tables.
+
+A search source (``SEARCH_SOURCES``) lists the text fields that make up a
+result document, each with a weight, e.g. a question's own text plus the
+text of its answers. Searches can be restricted to a partition (such as
+the requesting user) that every field carries.
+
+* On MySQL each field has a ``FULLTEXT`` index (added by the apps'
+  migrations); every field is queried with ``MATCH ... AGAINST`` in
+  natural language mode and the weighted relevances are summed per
+  document.
+* Elsewhere, postings in ``llm_search_posting`` form an inverted index
+  keyed on ``(source, term, partition)``. Apps call ``reindex()`` from
+  their save/delete signals; ``manage.py rebuild_search_index`` backfills.
+  Documents are ranked by the sum of saturated term frequencies times
+  inverse document frequency (BM25 without length normalization).
+
+Results are ranked, so pages are numbered; only the first
+``SEARCH_MAX_PAGES`` pages are reachable. Very common terms only score
+their newest ``SEARCH_MAX_POSTINGS`` documents, which bounds the cost of
+any query.
+"""
+
+import math
+import re
+from collections import Counter as TermCounter
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import BooleanField, Case, F, FloatField, Q, Sum, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from . import counters
+from .models import SearchPosting
+
+STOPWORDS = frozenset("""
+    a about after all also an and any are as at be been but by can could did
+    do does for from had has have how i if in into is it its me my no not of
+    on or our please so such than that the their them then there these they
+    this to was we were what when where which while who why will with would
+    you your explain describe define tell
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Term frequency saturation, as in BM25
+_K1 = 1.2
+_MAX_TERMS = 10
+
+
+def tokenize(text):
+    """Lowercased content words with a light plural stemming."""
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token[:64])
+    return terms
+
+
+class SearchField:
+    """One text column contributing to a document.
+
+    ``doc`` is the lookup from the field's model to the document id and
+    ``partition`` the lookup to its partition (``None``: unpartitioned).
+    """
+
+    def __init__(self, model, field, doc="pk", weight=1.0, partition=None):
+        self.model = model
+        self.field = field
+        self.doc = doc
+        self.weight = weight
+        self.partition = partition
+
+    def column(self):
+        return self.model._meta.get_field(self.field).column
+
+
+class SearchSource:
+    """Base class for ``SEARCH_SOURCES`` entries.
+
+    ``fields[0]`` is the document table itself (``doc="pk"``).
+    """
+
+    fields = []
+
+    def results(self, doc_ids):
+        """Queryset of the result objects for ``doc_ids``."""
+        return self.fields[0].model.objects.filter(pk__in=doc_ids)
+
+
+class SearchPage:
+    def __init__(self, results, number, has_next):
+        self.results = results
+        self.number = number
+        self.has_next = has_next
+
+    @property
+    def has_previous(self):
+        return self.number > 1
+
+    @property
+    def next_page_number(self):
+        return self.number + 1
+
+    @property
+    def previous_page_number(self):
+        return self.number - 1
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+
+def _max_pages():
+    return getattr(settings, "SEARCH_MAX_PAGES", 10)
+
+
+def get_source(name):
+    return import_string(settings.SEARCH_SOURCES[name])()
+
+
+def _uses_fulltext(source):
+    model = source.fields[0].model
+    return connections[router.db_for_read(model)].vendor == "mysql"
+
+
+def _fulltext_scores(source, query, partition, limit):
+    scores = defaultdict(float)
+    for field in source.fields:
+        quote = connections[router.db_for_read(field.model)].ops.quote_name
+        column = f"{quote(field.model._meta.db_table)}.{quote(field.column())}"
+        match = RawSQL(
+            f"MATCH({column}) AGAINST (%s IN NATURAL LANGUAGE MODE)", [query]
+        )
+        rows = field.model.objects.annotate(relevance=match).filter(
+            RawSQL(match.sql, match.params, output_field=BooleanField())
+        )
+        if field.partition is not None and partition is not None:
+            rows = rows.filter(**{field.partition: partition})
+        rows = rows.order_by("-relevance").values_list(field.doc, "relevance")[:limit]
+        for doc_id, relevance in rows:
+            scores[doc_id] += field.weight * relevance
+    return scores
+
+
+def _posting_partition(partition):
+    return 0 if partition is None else partition
+
+
+def _term_window(postings, term):
+    """``(doc_freq, cutoff)`` for one query term.
+
+    Terms in more than ``SEARCH_MAX_POSTINGS`` documents only score their
+    newest postings (``doc_id >= cutoff``), so a very common word costs a
+    bounded index range instead of a scan of most of the table; their
+    document frequency is extrapolated from the doc id span of that window.
+    """
+    cap = getattr(settings, "SEARCH_MAX_POSTINGS", 10000)
+    doc_ids = postings.filter(term=term).order_by("-doc_id").values_list("doc_id", flat=True)
+    doc_freq = doc_ids[:cap + 1].count()
+    if doc_freq <= cap:
+        return doc_freq, None
+    newest, cutoff = doc_ids[0], doc_ids[cap - 1]
+    oldest = doc_ids.last()
+    return cap * (newest - oldest + 1) / (newest - cutoff + 1), cutoff
+
+
+def _inverted_scores(source_name, query, partition, limit):
+    terms = list(dict.fromkeys(tokenize(query)))[:_MAX_TERMS]
+    if not terms:
+        return {}
+    postings = SearchPosting.objects.filter(
+        source=source_name, partition=_posting_partition(partition)
+    )
+    windows = {term: _term_window(postings, term) for term in terms}
+    windows = {term: window for term, window in windows.items() if window[0]}
+    if not windows:
+        return {}
+    total = max(
+        counters.read([f"search:{source_name}:documents"])[f"search:{source_name}:documents"],
+        max(doc_freq for doc_freq, cutoff in windows.values()),
+    )
+    condition = Q()
+    whens = []
+    for term, (doc_freq, cutoff) in windows.items():
+        term_filter = Q(term=term) if cutoff is None else Q(term=term, doc_id__gte=cutoff)
+        condition |= term_filter
+        idf = math.log(1 + total / doc_freq)
+        whens.append(When(term_filter, then=F("weight") * Value(idf)))
+    rows = (
+        postings.filter(condition).order_by().values("doc_id")
+        .annotate(score=Sum(Case(*whens, output_field=FloatField())))
+        .order_by("-score", "-doc_id")
+        .values_list("doc_id", "score")[:limit]
+    )
+    return dict(rows)
+
+
+def search(source_name, query, partition=None, page=1, per_page=20):
+    """Return the ``page``-th ``SearchPage`` of results for ``query``.
+
+    Result objects carry their relevance as ``search_score``.
+    """
+    source = get_source(source_name)
+    page = max(1, min(page, _max_pages()))
+    limit = page * per_page + 1
+    if _uses_fulltext(source):
+        scores = _fulltext_scores(source, query, partition, limit)
+    else:
+        scores = _inverted_scores(source_name, query, partition, limit)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+    window = ranked[(page - 1) * per_page:page * per_page + 1]
+    ids = [doc_id for doc_id, _ in window[:per_page]]
+    objects = source.results(ids).in_bulk(ids)
+    results = []
+    for doc_id, score in window[:per_page]:
+        obj = objects.get(doc_id)
+        if obj is not None:
+            obj.search_score = score
+            results.append(obj)
+    return SearchPage(results, page, len(window) > per_page and page < _max_pages())
+
+
+def _document_postings(source_name, source, doc_id):
+    weights = defaultdict(float)
+    partition = 0
+    for field in source.fields:
+        lookups = [field.field] + ([field.partition] if field.partition else [])
+        for row in field.model.objects.filter(**{field.doc: doc_id}).values_list(*lookups):
+            if field.partition:
+                partition = row[1]
+            for term, tf in TermCounter(tokenize(row[0] or "")).items():
+                weights[term] += field.weight * tf * (_K1 + 1) / (tf + _K1)
+    return [
+        SearchPosting(source=source_name, partition=partition, term=term,
+                      doc_id=doc_id, weight=weight)
+        for term, weight in weights.items()
+    ]
+
+
+def index_documents(source_name, doc_ids):
+    """Replace the postings of ``doc_ids`` (deleted documents lose theirs)."""
+    source = get_source(source_name)
+    if _uses_fulltext(source):
+        return
+    doc_ids = list(doc_ids)
+    with transaction.atomic():
+        existing = set(
+            SearchPosting.objects.filter(source=source_name, doc_id__in=doc_ids)
+            .values_list("doc_id", flat=True).distinct()
+        )
+        SearchPosting.objects.filter(source=source_name, doc_id__in=doc_ids).delete()
+        postings, indexed = [], set()
+        for doc_id in doc_ids:
+            document = _document_postings(source_name, source, doc_id)
+            if document:
+                indexed.add(doc_id)
+            postings.extend(document)
+        SearchPosting.objects.bulk_create(postings, batch_size=1000)
+        counters.increment({
+            f"search:{source_name}:documents": len(indexed - existing) - len(existing - indexed)
+        })
+
+
+def recount_documents():
+    """Exact document counters for ``reconcile_counters`` (``COUNTER_RECOUNT``)."""
+    values = {}
+    for name in getattr(settings, "SEARCH_SOURCES", {}):
+        if _uses_fulltext(get_source(name)):
+            continue
+        values[f"search:{name}:documents"] = (
+            SearchPosting.objects.filter(source=name)
+            .values("doc_id").distinct().count()
+        )
+    return values
+
+
+def reindex(source_name, doc_id):
+    """Re-index one document once the current transaction commits."""
+    transaction.on_commit(lambda: index_documents(source_name, [doc_id]))
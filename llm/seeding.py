@@ -0,0 +1,215 @@
+"""
+Synthetic users, questions and answers for load testing.
+
+``manage.py seed_data`` creates the users and generates ``SeedEntry``
+rows, then hands them in batches to the project's ``SEED_DATA_WRITER``,
+which ``bulk_create``s them into its own tables and returns the number of
+rows written per table.
+
+Categories follow a skewed mix (general questions dominate), question and
+answer lengths are log-normal with a long tail capped at what the model's
+``max_tokens`` allows, and timestamps cluster towards the recent end of
+the requested window, as real traffic grows over time.
+"""
+
+import math
+import random
+from collections import defaultdict, deque, namedtuple
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, router
+from django.db.models import DateTimeField, Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+SeedEntry = namedtuple("SeedEntry", "user_id category question answer created_at")
+
+# (category, relative frequency, subjects)
+CATEGORIES = [
+    ("General", 30, [
+        "electrical machine", "efficiency", "power factor", "insulation class",
+        "cooling system", "losses", "rating plate", "earthing",
+    ]),
+    ("Transformers", 18, [
+        "transformer", "open circuit test", "short circuit test", "tap changer",
+        "core loss", "voltage regulation", "auto transformer", "vector group",
+    ]),
+    ("AC Machines", 16, [
+        "alternator", "armature winding", "rotating magnetic field",
+        "distribution factor", "pitch factor", "AC motor",
+    ]),
+    ("Induction Motors", 14, [
+        "induction motor", "slip", "squirrel cage rotor", "star delta starter",
+        "torque slip curve", "slip ring motor", "locked rotor current",
+    ]),
+    ("DC Machines", 14, [
+        "DC motor", "armature reaction", "commutator", "back emf",
+        "shunt field", "series motor", "interpoles", "speed control",
+    ]),
+    ("Synchronous Machines", 8, [
+        "synchronous motor", "synchronous generator", "V curve", "hunting",
+        "synchronous reactance", "excitation system",
+    ]),
+]
+
+QUESTION_TEMPLATES = [
+    "What is {subject}?",
+    "How does {subject} work?",
+    "Why is {subject} important in practice?",
+    "What are the main causes of problems with {subject}?",
+    "How do you calculate {subject}?",
+    "What is the difference between {subject} and {other}?",
+    "How does {subject} affect {other}?",
+    "Can you explain {subject} with an example?",
+]
+
+QUESTION_CONTEXT = [
+    "I am preparing for my exams.",
+    "Our plant has a 50 kW machine running at full load.",
+    "The textbook explanation is not clear to me.",
+    "We noticed unusual heating during the last test.",
+    "Please include the relevant formula.",
+    "The supply is 415 V, 50 Hz, three phase.",
+    "This came up during commissioning.",
+]
+
+ANSWER_SENTENCES = [
+    "The {subject} is best understood by looking at the flux linking the windings.",
+    "In practice {subject} depends strongly on load and temperature.",
+    "Losses rise with the square of the current, so {subject} matters most at full load.",
+    "A common rule of thumb is to keep {subject} within the manufacturer's rating.",
+    "Compared with {other}, {subject} is simpler to measure on site.",
+    "The equivalent circuit makes the effect of {subject} easy to calculate.",
+    "Standards such as IEC 60034 specify how {subject} should be tested.",
+    "Poor maintenance of {other} is the usual reason {subject} degrades.",
+    "For example, a 10% drop in supply voltage changes {subject} noticeably.",
+    "Modern drives compensate for {subject} automatically.",
+    "The phasor diagram shows how {subject} relates to {other}.",
+    "Engineers usually check {subject} during routine inspections.",
+]
+
+# Log-normal word counts: (median, sigma, min, max)
+QUESTION_WORDS = (12, 0.5, 4, 80)
+ANSWER_WORDS = (170, 0.45, 25, 400)
+
+
+def _words(rng, median, sigma, low, high):
+    return max(low, min(high, int(rng.lognormvariate(math.log(median), sigma))))
+
+
+def _fill(rng, templates, subjects, words):
+    parts, count = [], 0
+    while count < words:
+        text = rng.choice(templates).format(
+            subject=rng.choice(subjects), other=rng.choice(subjects)
+        )
+        parts.append(text)
+        count += len(text.split())
+    return " ".join(parts)
+
+
+def question_text(rng, subjects):
+    question = rng.choice(QUESTION_TEMPLATES).format(
+        subject=rng.choice(subjects), other=rng.choice(subjects)
+    )
+    extra = _words(rng, *QUESTION_WORDS) - len(question.split())
+    if extra > 0:
+        question = f"{_fill(rng, QUESTION_CONTEXT, subjects, extra)} {question}"
+    return question
+
+
+def answer_text(rng, subjects):
+    return _fill(rng, ANSWER_SENTENCES, subjects, _words(rng, *ANSWER_WORDS))
+
+
+def generate(user_ids, entries_per_user, days, seed=None):
+    """Yield ``entries_per_user`` ``SeedEntry`` rows for each user."""
+    rng = random.Random(seed)
+    names = [name for name, _, _ in CATEGORIES]
+    weights = [weight for _, weight, _ in CATEGORIES]
+    subjects = {name: items for name, _, items in CATEGORIES}
+    now = timezone.now()
+    window = days * 86400
+    for user_id in user_ids:
+        for _ in range(entries_per_user):
+            category = rng.choices(names, weights)[0]
+            # Skewed towards the recent end of the window
+            age = window * rng.random() ** 1.5
+            yield SeedEntry(
+                user_id=user_id,
+                category=category,
+                question=question_text(rng, subjects[category]),
+                answer=answer_text(rng, subjects[category]),
+                created_at=now - timedelta(seconds=age),
+            )
+
+
+def ensure_users(count, prefix="user", password="password123", batch_size=1000):
+    """Ids of users ``<prefix>1`` to ``<prefix><count>``, creating missing ones.
+
+    The password is hashed once and shared, since hashing it per user
+    would dominate the run.
+    """
+    hashed = make_password(password)
+    user_ids = []
+    created = 0
+    for start in range(1, count + 1, batch_size):
+        names = [f"{prefix}{n}" for n in range(start, min(start + batch_size, count + 1))]
+        existing = set(User.objects.filter(username__in=names).values_list("username", flat=True))
+        missing = [User(username=name, password=hashed) for name in names if name not in existing]
+        User.objects.bulk_create(missing)
+        created += len(missing)
+        user_ids.extend(
+            User.objects.filter(username__in=names).order_by("pk").values_list("pk", flat=True)
+        )
+    return user_ids, created
+
+
+def bulk_create_with_pks(model, objs, key_fields):
+    """``bulk_create`` ``objs`` and set their primary keys, even on MySQL.
+
+    MySQL doesn't report the ids of a multi-row insert, and inserts from
+    other connections may take ids in between ours, so the rows are read
+    back: those above the previous maximum id, matched to ``objs`` on
+    ``key_fields`` (a multi-row insert numbers its rows in order).
+    """
+    connection = connections[router.db_for_write(model)]
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs)
+    top = model.objects.aggregate(top=Max("pk"))["top"] or 0
+    model.objects.bulk_create(objs)
+    pks = defaultdict(deque)
+    inserted = model.objects.filter(pk__gt=top).order_by("pk").values_list("pk", *key_fields)
+    for pk, *key in inserted:
+        pks[tuple(key)].append(pk)
+    for obj in objs:
+        obj.pk = pks[tuple(getattr(obj, name) for name in key_fields)].popleft()
+    return objs
+
+
+@contextmanager
+def preserve_timestamps(*models):
+    """Let ``bulk_create`` keep the ``created_at`` values it is given.
+
+    ``auto_now``/``auto_now_add`` would overwrite them with the insert time.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if isinstance(field, DateTimeField) and (field.auto_now or field.auto_now_add)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def get_writer():
+    return import_string(settings.SEED_DATA_WRITER)
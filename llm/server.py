@@ -0,0 +1,413 @@
+"""
+Pre-forking server for production (``manage.py serve``).
+
+The master process imports the application and its URLconf, binds the
+listening socket, then forks ``workers`` processes. They share the loaded
+code copy-on-write, so each costs little memory and serves its first
+request without importing anything. Workers serve, by ``interface``:
+
+* ``asgi`` (the default): ``ASGI_APPLICATION`` on one event loop per
+  worker, through uvicorn (``pip install uvicorn``). The async LLM views
+  await Groq without holding a thread, share the loop's pooled HTTP
+  client, and ``ask_batch`` streams its lines as they are answered. Sync
+  views run on threads, as under any ASGI server; their streamed
+  responses (``ask_question_stream``, ``export``) stream too, a chunk at
+  a time through ``llm.streaming``.
+* ``wsgi``: ``WSGI_APPLICATION``, with no dependency beyond Django. A
+  worker accepts connections only while one of its ``threads`` is free,
+  and serves each on a thread. Async views still work, but each request
+  runs them on a throwaway event loop with its own HTTP client, and
+  streamed responses of async views (``ask_batch``) are sent only once
+  complete; those of sync views stream. Responses are HTTP/1.0 without
+  keep-alive (``wsgiref``).
+
+Either way:
+
+* A worker exits after ``max_requests`` requests (plus up to
+  ``max_requests_jitter``, so they don't all restart at once) and the
+  master forks a fresh one, bounding slow memory growth.
+* ``SIGTERM``/``SIGINT`` stop gracefully: workers stop accepting and
+  finish their in-flight requests, for at most ``graceful_timeout``
+  seconds.
+* ``SIGHUP`` reloads gracefully: the master re-executes itself with the
+  same command line, keeping the listening socket open, loads the new
+  code and forks new workers, then stops the old ones as above. No
+  connection is refused meanwhile, and in-flight ``/ask/`` calls finish
+  on the old code.
+
+Configured by the ``SERVER`` setting (see ``DEFAULTS``). Run it behind a
+reverse proxy such as nginx for TLS, slow clients and static files.
+"""
+
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+try:
+    import uvicorn
+except ImportError:  # only needed to serve ASGI
+    uvicorn = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "bind": "127.0.0.1:8000",
+    "interface": "asgi",
+    "workers": 2,
+    # Concurrent requests per wsgi worker
+    "threads": 8,
+    "max_requests": 1000,
+    "max_requests_jitter": 100,
+    "graceful_timeout": 60,
+    # Seconds a connection may stay idle while reading or writing
+    "timeout": 60,
+    "backlog": 2048,
+}
+
+# Passed to the re-executed master on SIGHUP
+LISTEN_FD_ENV = "LLM_SERVER_LISTEN_FD"
+RETIRING_ENV = "LLM_SERVER_RETIRING"
+
+
+def server_config(**overrides):
+    """``DEFAULTS`` updated from ``SERVER`` and the non-``None`` ``overrides``."""
+    config = {**DEFAULTS, **getattr(settings, "SERVER", {})}
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    return config
+
+
+def parse_bind(bind):
+    """``"HOST:PORT"`` (or ``"[V6HOST]:PORT"``) as ``(host, port)``."""
+    host, _, port = bind.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Bind address must be HOST:PORT, not {bind!r}")
+    return host.strip("[]"), int(port)
+
+
+def load_application(interface="wsgi"):
+    """``ASGI_APPLICATION`` or ``WSGI_APPLICATION`` with its URLconf
+    imported, ready to fork."""
+    from django.urls import get_resolver
+
+    if interface == "asgi":
+        from django.core.asgi import get_asgi_application
+        from django.utils.module_loading import import_string
+
+        path = getattr(settings, "ASGI_APPLICATION", None)
+        application = import_string(path) if path else get_asgi_application()
+    else:
+        from django.core.servers.basehttp import get_internal_wsgi_application
+
+        application = get_internal_wsgi_application()
+    get_resolver().url_patterns  # noqa: B018 (imports the views)
+    return application
+
+
+def check_interface(interface):
+    """Raise ``ImproperlyConfigured`` if ``interface`` can't be served here."""
+    if interface not in WORKERS:
+        raise ImproperlyConfigured(
+            f"Interface must be one of {', '.join(WORKERS)}, not {interface!r}"
+        )
+    if interface == "asgi" and uvicorn is None:
+        raise ImproperlyConfigured(
+            "Serving ASGI needs uvicorn: pip install uvicorn, or serve WSGI instead"
+        )
+
+
+class _RequestHandler(WSGIRequestHandler):
+    def log_request(self, code="-", size="-"):
+        pass  # no access log: MetricsMiddleware times every request
+
+    def log_message(self, format, *args):
+        logger.warning("%s - %s", self.address_string(), format % args)
+
+
+class Worker:
+    """A forked process serving WSGI, up to ``threads`` connections at a time."""
+
+    def __init__(self, sock, application, config):
+        self.sock = sock
+        self.application = application
+        self.threads = config["threads"]
+        self.timeout = config["timeout"]
+        self.max_requests = config["max_requests"] and (
+            config["max_requests"] + random.randint(0, config["max_requests_jitter"])
+        )
+        host, port = sock.getsockname()[:2]
+        # What wsgiref's WSGIServer would set up for _RequestHandler
+        self.base_environ = {
+            "SERVER_NAME": host,
+            "GATEWAY_INTERFACE": "CGI/1.1",
+            "SERVER_PORT": str(port),
+            "REMOTE_HOST": "",
+            "CONTENT_LENGTH": "",
+            "SCRIPT_NAME": "",
+        }
+        self.stopping = threading.Event()
+
+    def get_app(self):
+        return self.application
+
+    def run(self):
+        """Serve until stopped or recycled; return the requests served."""
+        def stop(signum, frame):
+            self.stopping.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)  # Ctrl+C reaches every process
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        slots = threading.Semaphore(self.threads)
+        served = 0
+        with ThreadPoolExecutor(self.threads, thread_name_prefix="wsgi") as pool:
+            while not self.stopping.is_set():
+                if self.max_requests and served >= self.max_requests:
+                    break
+                # Leave connections to other workers while every thread is busy
+                if not slots.acquire(timeout=0.5):
+                    continue
+                accepted = self._accept()
+                if accepted is None:
+                    slots.release()
+                    continue
+                served += 1
+                pool.submit(self._serve, *accepted, slots)
+            self.sock.close()
+            # Leaving the block waits for the in-flight requests
+        return served
+
+    def _accept(self):
+        ready, _, _ = select.select([self.sock], [], [], 0.5)
+        if not ready:
+            return None
+        try:
+            return self.sock.accept()
+        except BlockingIOError:
+            return None  # another worker got it
+
+    def _serve(self, conn, address, slots):
+        try:
+            conn.setblocking(True)
+            conn.settimeout(self.timeout)
+            _RequestHandler(conn, address, self)
+        except (TimeoutError, ConnectionError):
+            pass  # the client went away
+        except Exception:
+            logger.exception("Error serving %s", address[0])
+        finally:
+            try:
+                conn.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            conn.close()
+            slots.release()
+
+
+class AsgiWorker:
+    """A forked process serving ASGI on one event loop (uvicorn)."""
+
+    def __init__(self, sock, application, config):
+        self.sock = sock
+        max_requests = config["max_requests"]
+        if max_requests:
+            max_requests += random.randint(0, config["max_requests_jitter"])
+        self.server = uvicorn.Server(uvicorn.Config(
+            application,
+            lifespan="off",
+            log_config=None,
+            access_log=False,  # MetricsMiddleware times every request
+            limit_max_requests=max_requests or None,
+            timeout_graceful_shutdown=config["graceful_timeout"],
+        ))
+
+    def run(self):
+        """Serve until stopped or recycled; return the requests served."""
+        # uvicorn handles SIGTERM/SIGINT while serving, and raises them
+        # again once it has stopped: they must not kill us then
+        signal.signal(signal.SIGTERM, lambda signum, frame: None)
+        signal.signal(signal.SIGINT, lambda signum, frame: None)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        self.server.run(sockets=[self.sock])
+        self.sock.close()
+        return self.server.server_state.total_requests
+
+
+WORKERS = {"asgi": AsgiWorker, "wsgi": Worker}
+
+
+class Master:
+    """Forks and supervises the workers; see the module docstring."""
+
+    def __init__(self, config):
+        self.config = config
+        self.workers = set()
+        self.retiring = {}  # pid: SIGKILL deadline
+        self.stopping = False
+        self.reloading = False
+        self._wake = threading.Event()
+
+    def run(self):
+        self.sock = self._listen()
+        inherited = [int(pid) for pid in os.environ.pop(RETIRING_ENV, "").split(",") if pid]
+        self.application = load_application(self.config["interface"])
+        # Forked workers must not share a DB connection opened by the checks
+        connections.close_all()
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._stop)
+        signal.signal(signal.SIGHUP, self._reload)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: self._wake.set())
+
+        host, port = self.sock.getsockname()[:2]
+        if self.config["interface"] == "asgi":
+            logger.info("Serving ASGI on http://%s:%s (pid %s): %s workers",
+                        host, port, os.getpid(), self.config["workers"])
+        else:
+            logger.info("Serving WSGI on http://%s:%s (pid %s): %s workers x %s threads",
+                        host, port, os.getpid(), self.config["workers"], self.config["threads"])
+        while len(self.workers) < self.config["workers"]:
+            self._spawn()
+        self._retire(inherited)
+
+        while self.workers or self.retiring:
+            self._wake.wait(1)
+            self._wake.clear()
+            self._reap()
+            self._kill_overdue()
+            if self.reloading:
+                self._reexec()
+            if self.stopping and self.workers:
+                self._retire(list(self.workers))
+                self.workers = set()
+                # Refuse new connections rather than leave them waiting
+                self.sock.close()
+        self.sock.close()
+        logger.info("Server stopped")
+
+    def _listen(self):
+        fd = os.environ.pop(LISTEN_FD_ENV, None)
+        if fd is not None:
+            sock = socket.socket(fileno=int(fd))
+        else:
+            host, port = parse_bind(self.config["bind"])
+            family = socket.AF_INET6 if ":" in host else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host, port))
+            sock.listen(self.config["backlog"])
+        sock.setblocking(False)
+        return sock
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid:
+            self.workers.add(pid)
+            return
+        code = 1
+        try:
+            worker = WORKERS[self.config["interface"]]
+            served = worker(self.sock, self.application, self.config).run()
+            logger.info("Worker %s exiting after %s requests", os.getpid(), served)
+            code = 0
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+        finally:
+            logging.shutdown()
+            os._exit(code)
+
+    def _retire(self, pids):
+        """Stop ``pids`` after their in-flight requests (SIGTERM)."""
+        deadline = time.monotonic() + self.config["graceful_timeout"]
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                continue
+            self.retiring[pid] = deadline
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            self.retiring.pop(pid, None)
+            if pid not in self.workers:
+                continue
+            self.workers.discard(pid)
+            if self.stopping:
+                continue
+            if os.waitstatus_to_exitcode(status) != 0:
+                logger.error("Worker %s died (status %s)", pid, status)
+            self._spawn()
+
+    def _kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now >= deadline:
+                logger.warning("Worker %s still busy after %ss; killing it",
+                               pid, self.config["graceful_timeout"])
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.retiring[pid] = now + 5  # reaped on its exit
+
+    def _reexec(self):
+        """Replace this master with a fresh one, inheriting socket and workers.
+
+        The new code is loaded in a throwaway process first: if it fails,
+        this master and its workers carry on.
+        """
+        self.reloading = False
+        logger.info("Reloading: checking that the current code loads")
+        check = subprocess.run(
+            [sys.executable, "-c", "import django; django.setup(); "
+             "from llm.server import load_application; "
+             f"load_application({self.config['interface']!r})"],
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+                "PYTHONPATH": os.pathsep.join(path for path in sys.path if path),
+            },
+            capture_output=True, text=True,
+        )
+        if check.returncode != 0:
+            logger.error("Not reloading, the code fails to load:\n%s", check.stderr.strip())
+            return
+        logger.info("Reloading: restarting the master with the current code")
+        os.set_inheritable(self.sock.fileno(), True)
+        env = {
+            **os.environ,
+            LISTEN_FD_ENV: str(self.sock.fileno()),
+            RETIRING_ENV: ",".join(str(pid) for pid in [*self.workers, *self.retiring]),
+        }
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execve(sys.executable, [sys.executable, *sys.orig_argv[1:]], env)
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+        self._wake.set()
+
+    def _reload(self, signum, frame):
+        self.reloading = not self.stopping
+        self._wake.set()
@@ -0,0 +1,214 @@
+"""
+Near-duplicate question lookup over previously answered questions.
+
+Questions are embedded as L2-normalized hashed character n-gram vectors
+and kept in a NumPy matrix, so a lookup is a single matrix-vector product.
+Each configured source (``LLM_SIMILARITY_SOURCES``) gets its own index.
+Indexes are loaded from disk when a snapshot exists and then caught up
+incrementally with rows whose id is greater than the last one indexed, so
+new entries become searchable without a full rebuild.
+"""
+
+import logging
+import re
+import threading
+import zlib
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import metrics
+from .cache import normalize_question
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = frozenset("""
+    a an and are as at be by can could do does for from how in is it its of
+    on or please purpose role the to use used what when which why with would
+    explain describe define tell me about
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _threshold():
+    return getattr(settings, "LLM_SIMILARITY_THRESHOLD", 0.85)
+
+
+def _dimensions():
+    return getattr(settings, "LLM_SIMILARITY_DIMENSIONS", 1024)
+
+
+def _index_dir():
+    return Path(getattr(settings, "LLM_SIMILARITY_INDEX_DIR", "similarity_index"))
+
+
+def vectorize(text, dimensions, ngram_range=(3, 5)):
+    """Hash the character n-grams of the content words in ``text``.
+
+    Each word contributes a unit-length vector so long words do not drown
+    out short but meaningful ones (``slip`` vs ``induction``).
+    """
+    tokens = [
+        token for token in _TOKEN_RE.findall(normalize_question(text))
+        if token not in STOPWORDS
+    ]
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for token in tokens:
+        token_vector = np.zeros(dimensions, dtype=np.float32)
+        padded = f" {token} "
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            for i in range(max(len(padded) - n + 1, 1)):
+                digest = zlib.crc32(padded[i:i + n].encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                token_vector[digest % dimensions] += sign
+        norm = np.linalg.norm(token_vector)
+        if norm:
+            vector += token_vector / norm
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+
+class SimilarityIndex:
+    """Growable matrix of question vectors keyed by source row id."""
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+        self.matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.size = 0
+        self.last_id = 0
+
+    def add(self, row_id, text):
+        if self.size == len(self.ids):
+            capacity = max(64, len(self.ids) * 2)
+            matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            matrix[:self.size] = self.matrix[:self.size]
+            ids = np.zeros(capacity, dtype=np.int64)
+            ids[:self.size] = self.ids[:self.size]
+            self.matrix, self.ids = matrix, ids
+        self.matrix[self.size] = vectorize(text, self.dimensions)
+        self.ids[self.size] = row_id
+        self.size += 1
+        self.last_id = max(self.last_id, row_id)
+
+    def nearest(self, text):
+        """Return ``(row_id, score)`` of the closest question, or ``None``."""
+        if not self.size:
+            return None
+        scores = self.matrix[:self.size] @ vectorize(text, self.dimensions)
+        best = int(np.argmax(scores))
+        return int(self.ids[best]), float(scores[best])
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            matrix=self.matrix[:self.size],
+            ids=self.ids[:self.size],
+            last_id=np.int64(self.last_id),
+        )
+
+    @classmethod
+    def load(cls, path, dimensions):
+        with np.load(path) as data:
+            index = cls(dimensions)
+            if data["matrix"].shape[1] != dimensions:
+                raise ValueError("Index dimensions do not match settings")
+            index.matrix = data["matrix"].copy()
+            index.ids = data["ids"].copy()
+            index.size = len(index.ids)
+            index.last_id = int(data["last_id"])
+        return index
+
+
+class IndexedSource:
+    """Binds an index to a source of answered questions."""
+
+    batch_size = 5000
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.lock = threading.Lock()
+        self.index = None
+
+    @property
+    def path(self):
+        return _index_dir() / f"{self.name}.npz"
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                return SimilarityIndex.load(self.path, _dimensions())
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("Ignoring similarity index %s: %s", self.path, exc)
+        return SimilarityIndex(_dimensions())
+
+    def _catch_up(self):
+        while True:
+            rows = list(self.source.rows_after(self.index.last_id, self.batch_size))
+            for row_id, text in rows:
+                self.index.add(row_id, text)
+            if len(rows) < self.batch_size:
+                return
+
+    def rebuild(self):
+        with self.lock:
+            self.index = SimilarityIndex(_dimensions())
+            self._catch_up()
+            self.index.save(self.path)
+            return self.index.size
+
+    def lookup(self, question_text, threshold=None):
+        """Return the stored answer for the closest question above threshold."""
+        threshold = _threshold() if threshold is None else threshold
+        with self.lock:
+            if self.index is None:
+                self.index = self._load()
+            self._catch_up()
+            match = self.index.nearest(question_text)
+        if match is None or match[1] < threshold:
+            return None
+        row_id, score = match
+        logger.info("Similar question match in %s: id=%s score=%.3f",
+                    self.name, row_id, score)
+        return self.source.answer_for(row_id)
+
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def get_source(name):
+    with _sources_lock:
+        if name not in _sources:
+            path = getattr(settings, "LLM_SIMILARITY_SOURCES", {})[name]
+            _sources[name] = IndexedSource(name, import_string(path)())
+        return _sources[name]
+
+
+def find_similar_answer(source_name, question_text):
+    """Stored answer text for a near-duplicate question, or ``None``."""
+    if not getattr(settings, "LLM_SIMILARITY_ENABLED", True):
+        return None
+    answer = get_source(source_name).lookup(question_text)
+    metrics.observe_cache_lookup("similarity", hit=answer is not None)
+    return answer
+
+
+def find_best_answer(source_name, question_text):
+    """Closest stored answer above ``LLM_DEGRADED_SIMILARITY_THRESHOLD``.
+
+    Served while the LLM is unavailable, where a loosely related answer
+    beats none, so the bar is lower than for ``find_similar_answer``.
+    """
+    if not getattr(settings, "LLM_SIMILARITY_ENABLED", True):
+        return None
+    return get_source(source_name).lookup(
+        question_text, getattr(settings, "LLM_DEGRADED_SIMILARITY_THRESHOLD", 0.6)
+    )
@@ -0,0 +1,231 @@
+"""
+Single-flight coalescing of identical in-flight LLM calls.
+
+Concurrent calls with the same key share one upstream request:
+
+* threads in one process wait on the leader's result;
+* coroutines on one event loop await the leader's (shielded) task;
+* across processes, leaders serialize on a per-key ``flock`` in
+  ``LLM_SINGLEFLIGHT_DIR`` and hand the result over through a small JSON
+  file next to it, so a process that waited for the lock reuses the answer
+  instead of asking again.
+
+Results must be JSON-serializable. Callers still create their own rows
+from the shared result; every caller but the one whose ``fn`` ran gets
+``shared(result)``, e.g. so one upstream call's tokens aren't counted
+once per caller.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process coalescing only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_POLL_INTERVAL = 0.05
+_PRUNE_EVERY = 100
+_PRUNE_AGE = 600
+
+_writes = 0
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+_async_inflight = weakref.WeakKeyDictionary()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _lock_dir():
+    directory = getattr(settings, "LLM_SINGLEFLIGHT_DIR", None)
+    if not directory or fcntl is None:
+        return None
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def _max_wait():
+    return getattr(settings, "LLM_SINGLEFLIGHT_WAIT", 60)
+
+
+def _try_lock(path):
+    handle = open(path, "a+")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return None
+    return handle
+
+
+def _release(handle):
+    if handle is not None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+
+def _read_shared(path, since):
+    """Result another process stored after ``since``, or ``_MISSING``."""
+    try:
+        if path.stat().st_mtime < since:
+            return _MISSING
+        with open(path) as f:
+            return json.load(f)["result"]
+    except (OSError, ValueError, KeyError):
+        return _MISSING
+
+
+def _write_shared(path, result):
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump({"result": result}, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Could not share single-flight result: %s", e)
+
+    global _writes
+    _writes += 1
+    if _writes % _PRUNE_EVERY == 0:
+        _prune(path.parent)
+
+
+def _prune(directory):
+    """Remove lock and result files nobody has touched for a while."""
+    cutoff = time.time() - _PRUNE_AGE
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            if path.suffix == ".lock":
+                handle = _try_lock(path)
+                if handle is None:
+                    continue
+                path.unlink()
+                _release(handle)
+            else:
+                path.unlink()
+        except OSError:
+            continue
+
+
+def _paths(directory, key):
+    return directory / f"{key}.lock", directory / f"{key}.json"
+
+
+def _coordinate(key, fn):
+    """Run ``fn`` unless another process just produced the same result.
+
+    Returns ``(result, whether fn ran)``.
+    """
+    directory = _lock_dir()
+    if directory is None:
+        return fn(), True
+
+    lock_path, result_path = _paths(directory, key)
+    started = time.time()
+    deadline = time.monotonic() + _max_wait()
+    handle = _try_lock(lock_path)
+    while handle is None and time.monotonic() < deadline:
+        time.sleep(_POLL_INTERVAL)
+        handle = _try_lock(lock_path)
+    try:
+        shared = _read_shared(result_path, started)
+        if shared is not _MISSING:
+            return shared, False
+        result = fn()
+        _write_shared(result_path, result)
+        return result, True
+    finally:
+        _release(handle)
+
+
+async def _acoordinate(key, fn):
+    directory = _lock_dir()
+    if directory is None:
+        return await fn(), True
+
+    lock_path, result_path = _paths(directory, key)
+    started = time.time()
+    deadline = time.monotonic() + _max_wait()
+    handle = _try_lock(lock_path)
+    while handle is None and time.monotonic() < deadline:
+        await asyncio.sleep(_POLL_INTERVAL)
+        handle = _try_lock(lock_path)
+    try:
+        shared = _read_shared(result_path, started)
+        if shared is not _MISSING:
+            return shared, False
+        result = await fn()
+        _write_shared(result_path, result)
+        return result, True
+    finally:
+        _release(handle)
+
+
+def _identity(result):
+    return result
+
+
+def coalesce(key, fn, shared=_identity):
+    """Call ``fn()`` once for all concurrent callers with the same key.
+
+    Callers that didn't run ``fn`` themselves get ``shared(result)``.
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return shared(call.result)
+
+    try:
+        call.result, ran = _coordinate(key, fn)
+        return call.result if ran else shared(call.result)
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
+
+
+async def acoalesce(key, fn, shared=_identity):
+    """Async ``coalesce``; ``fn`` returns an awaitable.
+
+    The upstream call runs in its own task, so it keeps going for the other
+    waiters if the request that started it is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = _async_inflight.setdefault(loop, {})
+    task = tasks.get(key)
+    leader = task is None
+    if leader:
+        task = tasks[key] = loop.create_task(_acoordinate(key, fn))
+        task.add_done_callback(lambda _: tasks.pop(key, None))
+    result, ran = await asyncio.shield(task)
+    return result if leader and ran else shared(result)
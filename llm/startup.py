@@ -0,0 +1,111 @@
+"""
+Cold start time of a worker process, for ``manage.py benchmark_startup``.
+
+Each scenario runs in a fresh ``python -X importtime`` process, so nothing
+is cached from the current one. Wall time is the whole process, including
+interpreter start-up; import time is the top-level imports as reported by
+``-X importtime``. Packages are ranked by their modules' own import time
+(not counting the modules they import).
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+SCENARIOS = {
+    # What every process, including management commands, pays
+    "setup": "import django; django.setup()",
+    # ``run_worker``: plus the LLM_JOB_HANDLERS it may run
+    "worker": (
+        "import django; django.setup()\n"
+        "from django.conf import settings\n"
+        "from django.utils.module_loading import import_string\n"
+        "for path in getattr(settings, 'LLM_JOB_HANDLERS', {}).values():\n"
+        "    import_string(path)"
+    ),
+    # A web worker ready for its first request: WSGI_APPLICATION and the
+    # URLconf (views, forms, admin)
+    "web": (
+        "import django; django.setup()\n"
+        "from django.core.servers.basehttp import get_internal_wsgi_application\n"
+        "from django.urls import get_resolver\n"
+        "get_internal_wsgi_application()\n"
+        "get_resolver().url_patterns"
+    ),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(output):
+    """``[(module, self_us, cumulative_us, depth)]`` from ``-X importtime``."""
+    imports = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            imports.append((
+                match.group(4), int(match.group(1)), int(match.group(2)),
+                (len(match.group(3)) - 1) // 2,
+            ))
+    return imports
+
+
+def run_once(code, settings_module):
+    """``(wall_ms, imports)`` of one fresh process running ``code``."""
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings_module,
+        "PYTHONPATH": os.pathsep.join(path for path in sys.path if path),
+    }
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return wall_ms, parse_importtime(result.stderr)
+
+
+def measure(code, settings_module, runs=5, top=8):
+    """Median wall and import time of ``runs`` processes, and top packages."""
+    walls, totals = [], []
+    packages = Counter()
+    modules = 0
+    for _ in range(runs):
+        wall_ms, imports = run_once(code, settings_module)
+        walls.append(wall_ms)
+        totals.append(sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000)
+        for module, self_us, _, _ in imports:
+            packages[module.split(".")[0]] += self_us / 1000 / runs
+        modules = len(imports)
+    return {
+        "wall_ms": round(statistics.median(walls), 1),
+        "import_ms": round(statistics.median(totals), 1),
+        "modules": modules,
+        "top_packages": {name: round(ms, 1) for name, ms in packages.most_common(top)},
+    }
+
+
+def compare(report, baseline, tolerance=0.2):
+    """Regressions of ``report`` against ``baseline``, as messages.
+
+    A scenario's wall and import time may grow by ``tolerance`` (a
+    fraction); it may not import more modules.
+    """
+    problems = []
+    for name, current in report.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for key in ("wall_ms", "import_ms"):
+            if current[key] > before[key] * (1 + tolerance):
+                problems.append(f"{name}: {key} {before[key]} -> {current[key]}")
+        if current["modules"] > before["modules"]:
+            problems.append(f"{name}: modules {before['modules']} -> {current['modules']}")
+    return problems
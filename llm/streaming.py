@@ -0,0 +1,41 @@
+"""
+Streamed response bodies that stream under both WSGI and ASGI.
+
+``StreamingHttpResponse`` only streams the kind of iterator its handler
+expects: under ASGI it reads a sync iterator to the end (``sync_to_async
+(list)``) before sending any of it, and under WSGI it does the same to an
+async one. Views whose body is produced by sync code (the ORM, the sync
+LLM client) pass it through ``content_for()``, which leaves it as is
+under WSGI and pulls it one chunk at a time under ASGI.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+_DONE = object()
+
+
+def content_for(request, chunks):
+    """``chunks`` (a sync iterable) as the streaming content for ``request``."""
+    if isinstance(request, ASGIRequest):
+        return pulled(chunks)
+    return chunks
+
+
+async def pulled(chunks):
+    """Yield ``chunks``, fetching each one on the request's sync thread.
+
+    Every ``next()`` runs through ``sync_to_async``, so the event loop
+    sends a chunk as soon as it is made and only one chunk is held at a
+    time. ``chunks`` is closed when this is, e.g. when the client goes
+    away.
+    """
+    iterator = iter(chunks)
+    step = sync_to_async(next)
+    try:
+        while (chunk := await step(iterator, _DONE)) is not _DONE:
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
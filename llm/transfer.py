@@ -0,0 +1,230 @@
+"""
+Streaming export and batched import of Q&A history.
+
+Each project lists its exportable tables in ``EXPORT_SOURCES`` (name ->
+dotted path of an ``ExportSource`` subclass). ``manage.py export_data``
+and the staff ``/llm/export/<name>/`` view stream a source's rows as CSV
+or JSON lines, optionally gzipped; ``manage.py import_data`` reads such a
+file back and hands it to the source in ``bulk_create`` batches.
+
+Rows are read in primary key order, ``chunk_size`` rows per query, each
+query starting after the last key seen. Memory stays flat however large
+the table is, even on MySQL, whose driver buffers a whole result set
+(``QuerySet.iterator()`` alone would hold every row). Users travel by
+username; importing creates the ones the target database lacks, without
+a usable password.
+"""
+
+import abc
+import csv
+import gzip
+import io
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.module_loading import import_string
+
+FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class ExportSource(abc.ABC):
+    """One exportable table.
+
+    ``fields`` maps column names to their type (``str``, ``int``,
+    ``float`` or ``datetime``), in file order. ``rows()`` yields dicts with
+    those keys; ``write(rows)`` inserts a batch of them and returns the
+    number of rows written per table. Import batches never split rows with
+    the same ``group_by`` value, e.g. the answers of one question.
+    Subclasses must define both, or ``get_source()`` fails.
+    """
+
+    fields = {}
+    group_by = None
+
+    @abc.abstractmethod
+    def rows(self, since=None, until=None, username=None, chunk_size=2000):
+        """Yield the rows created in ``[since, until)`` by ``username``."""
+
+    @abc.abstractmethod
+    def write(self, rows):
+        """Insert a batch of ``rows``; return ``{table: rows written}``."""
+
+
+def get_source(name):
+    sources = getattr(settings, "EXPORT_SOURCES", {})
+    if name not in sources:
+        raise KeyError(name)
+    return import_string(sources[name])()
+
+
+def date_range(since=None, until=None):
+    """Aware datetimes bounding the days ``since`` to ``until`` (inclusive).
+
+    Takes ``YYYY-MM-DD`` strings; the upper bound is exclusive, so
+    ``created_at`` comparisons can use its index.
+    """
+    def start_of(value, days=0):
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Expected a YYYY-MM-DD date, got {value!r}")
+        return timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+
+    return start_of(since), start_of(until, days=1)
+
+
+def filter_rows(queryset, since=None, until=None, user_field=None, username=None):
+    """``queryset`` limited to ``created_at`` in ``[since, until)`` and a user."""
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=until)
+    if username:
+        queryset = queryset.filter(**{f"{user_field}__username": username})
+    return queryset
+
+
+def pk_chunks(queryset, *fields, chunk_size=2000):
+    """Yield lists of ``queryset.values("pk", *fields)`` dicts, one query each."""
+    last = None
+    while True:
+        chunk = queryset.order_by("pk")
+        if last is not None:
+            chunk = chunk.filter(pk__gt=last)
+        rows = list(chunk.values("pk", *fields)[:chunk_size])
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1]["pk"]
+
+
+def in_pk_order(queryset, *fields, chunk_size=2000):
+    """Yield the rows of ``pk_chunks()`` one by one."""
+    for rows in pk_chunks(queryset, *fields, chunk_size=chunk_size):
+        yield from rows
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode(rows, fields, fmt):
+    """Yield ``rows`` as lines of CSV (with a header) or JSON."""
+    names = list(fields)
+    if fmt == "jsonl":
+        for row in rows:
+            yield json.dumps({name: _text(row[name]) for name in names}) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for row in rows:
+        writer.writerow(["" if row[name] is None else _text(row[name]) for name in names])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _parse(value, kind):
+    if value is None or value == "":
+        return "" if kind is str else None
+    if kind is datetime:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"Expected a datetime, got {value!r}")
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+    return kind(value)
+
+
+def decode(lines, fields, fmt):
+    """Yield typed row dicts from CSV or JSON ``lines`` written by ``encode()``."""
+    if fmt == "jsonl":
+        records = (json.loads(line) for line in lines if line.strip())
+    else:
+        records = csv.DictReader(lines)
+    for number, record in enumerate(records, start=1):
+        try:
+            yield {name: _parse(record.get(name), kind) for name, kind in fields.items()}
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Row {number}: {e}") from e
+
+
+def buffered(chunks, size=STREAM_CHUNK_BYTES, compress=False):
+    """Join text ``chunks`` into encoded blocks of about ``size`` bytes.
+
+    With ``compress``, the blocks form one gzip stream.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    pending = []
+    pending_bytes = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        pending.append(data)
+        pending_bytes += len(data)
+        if pending_bytes >= size:
+            block = b"".join(pending)
+            pending, pending_bytes = [], 0
+            block = compressor.compress(block) if compressor else block
+            if block:
+                yield block
+    block = b"".join(pending)
+    if compressor:
+        block = compressor.compress(block) + compressor.flush()
+    if block:
+        yield block
+
+
+def guess_format(path):
+    """``jsonl`` for ``*.jsonl``/``*.ndjson`` (optionally ``.gz``), else ``csv``."""
+    name = path.removesuffix(".gz")
+    return "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def open_text(path):
+    """Text stream of the file at ``path``, transparently gunzipped."""
+    with open(path, "rb") as f:
+        gzipped = f.read(2) == b"\x1f\x8b"
+    if gzipped:
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def batches(rows, size, group_by=None):
+    """Lists of up to ``size`` rows (more, rather than split a ``group_by`` group)."""
+    batch = []
+    for row in rows:
+        if len(batch) >= size and (
+            group_by is None or row[group_by] != batch[-1][group_by]
+        ):
+            yield batch
+            batch = []
+        batch.append(row)
+    if batch:
+        yield batch
+
+
+def user_ids(usernames):
+    """``{username: id}``, creating users missing from this database."""
+    usernames = set(usernames)
+    ids = dict(User.objects.filter(username__in=usernames).values_list("username", "pk"))
+    missing = usernames - ids.keys()
+    if missing:
+        unusable = make_password(None)
+        User.objects.bulk_create([User(username=name, password=unusable) for name in missing])
+        ids.update(User.objects.filter(username__in=missing).values_list("username", "pk"))
+    return ids
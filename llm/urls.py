@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("status/", views.status, name="llm_status"),
+    path("export/<str:name>/", views.export, name="llm_export"),
+]
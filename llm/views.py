@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import (
+    Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
+from django.utils import timezone
+
+from . import breaker, cache, metrics, replicas, transfer
+from .ratelimit import get_limiter
+from .streaming import content_for
+
+
+@staff_member_required
+def status(request):
+    """Rate limiter, circuit breaker, answer cache and replica lag state of
+    the process serving this request."""
+    return JsonResponse({
+        "rate_limiter": get_limiter().state(),
+        "circuit_breakers": breaker.states(),
+        "cache": cache.stats(),
+        "replica_lag_seconds": replicas.monitor.states(),
+    })
+
+
+@staff_member_required
+def export(request, name):
+    """Stream an ``EXPORT_SOURCES`` table as a CSV or JSON lines download.
+
+    Query parameters: ``format`` (csv, jsonl), ``gzip=1``, ``since`` and
+    ``until`` (YYYY-MM-DD) and ``user`` (a username). Under ASGI each
+    block is read and encoded through ``sync_to_async`` as it is sent, so
+    only one chunk of rows is held at a time.
+    """
+    try:
+        source = transfer.get_source(name)
+    except KeyError:
+        raise Http404(f"No export named {name!r}")
+    fmt = request.GET.get("format", "csv")
+    if fmt not in transfer.FORMATS:
+        return JsonResponse({"error": f"format must be one of {', '.join(transfer.FORMATS)}"},
+                            status=400)
+    try:
+        since, until = transfer.date_range(request.GET.get("since"), request.GET.get("until"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    compress = request.GET.get("gzip") == "1"
+
+    rows = source.rows(since, until, request.GET.get("user") or None)
+    blocks = transfer.buffered(transfer.encode(rows, source.fields, fmt), compress=compress)
+    response = StreamingHttpResponse(
+        content_for(request, blocks),
+        content_type="application/gzip" if compress else transfer.CONTENT_TYPES[fmt],
+    )
+    filename = f"{name}-{timezone.localdate():%Y%m%d}.{fmt}" + (".gz" if compress else "")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@metrics.collector
+def _rate_limiter_metrics():
+    state = get_limiter().state()
+    return [
+        ("llm_rate_limiter_queue_depth", "gauge",
+         "LLM calls waiting for a rate limiter slot.", [({}, state["queue_depth"])]),
+        ("llm_rate_limiter_in_flight", "gauge",
+         "LLM calls holding a rate limiter slot.", [({}, state["in_flight"])]),
+        ("llm_rate_limiter_throttled_total", "counter",
+         "429 responses from the LLM API.", [({}, state["throttled_count"])]),
+    ]
+
+
+def prometheus_metrics(request):
+    """Prometheus text exposition of this process' metrics.
+
+    Open to ``METRICS_ALLOWED_IPS`` (the scraper) and to staff users.
+    """
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1", "::1"])
+    if request.META.get("REMOTE_ADDR") not in allowed and not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")